@@ -0,0 +1,191 @@
+"""
+Burst Coalescer - Merges SL/TP fragments that follow an entry
+
+Providers often split one signal over several messages sent seconds apart:
+
+    BUY NOW
+    SL 4500
+    TP 4550/4600
+
+The entry is executed at once. Level-only follow-ups are held for a short
+window instead of being interpreted one by one; every fragment that arrives
+within the window is merged, and the burst is applied to the entry's trade as
+a single SL/TP modification (one MT5 round trip).
+"""
+
+import time
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Optional, Dict, Any, List, Callable, Hashable
+
+
+@dataclass
+class Burst:
+    """
+    SL/TP fragments of one provider waiting to be applied together
+    """
+    key: Hashable
+    context: Any  # Opaque to the coalescer (e.g. provider and target trade)
+    stop_loss: Optional[float] = None
+    tp_levels: List[float] = field(default_factory=list)
+    message_ids: List[Optional[int]] = field(default_factory=list)
+    texts: List[str] = field(default_factory=list)
+    started_at: float = field(default_factory=time.monotonic)
+
+    def merge(self, levels: Dict[str, Any], message_id: Optional[int], text: str):
+        """
+        Add a fragment (a later SL replaces an earlier one, TPs accumulate)
+
+        Args:
+            levels: Fragment levels (stop_loss, tp_levels)
+            message_id: Telegram message ID of the fragment
+            text: Fragment text
+        """
+        if levels.get('stop_loss') is not None:
+            self.stop_loss = levels['stop_loss']
+        for level in levels.get('tp_levels') or []:
+            if level not in self.tp_levels:
+                self.tp_levels.append(level)
+        self.message_ids.append(message_id)
+        self.texts.append(text)
+
+
+class BurstCoalescer:
+    """
+    Debounce stage holding level fragments until their burst is complete
+
+    A burst is flushed once no fragment arrived for `window_seconds`, but at
+    most `max_wait_seconds` after its first fragment. Callers flush a burst
+    early when any other message of the same key arrives, so fragments are
+    never applied after a message that was sent later.
+    """
+
+    def __init__(self, on_flush: Callable[[Burst], None], window_seconds: float = 3.0,
+                 max_wait_seconds: float = 10.0):
+        """
+        Initialize coalescer
+
+        Args:
+            on_flush: Called with each completed burst (timer thread or caller's thread)
+            window_seconds: Quiet time after the last fragment before the burst is applied
+            max_wait_seconds: Longest a fragment is held
+        """
+        self.on_flush = on_flush
+        self.window_seconds = window_seconds
+        self.max_wait_seconds = max_wait_seconds
+
+        self._bursts: Dict[Hashable, Burst] = {}
+        self._timers: Dict[Hashable, threading.Timer] = {}
+        self._lock = threading.Lock()
+
+        self.stats = {
+            'fragments': 0,
+            'bursts': 0,
+            'early_flushes': 0,
+        }
+
+        self.logger = logging.getLogger('TradingBot.Coalescer')
+
+    def add(self, key: Hashable, levels: Dict[str, Any], message_id: Optional[int], text: str,
+            context: Any = None) -> Burst:
+        """
+        Hold a fragment, starting or extending its key's burst
+
+        Args:
+            key: Burst key (one burst per provider)
+            levels: Fragment levels (stop_loss, tp_levels)
+            message_id: Telegram message ID of the fragment
+            text: Fragment text
+            context: Stored on a new burst for the flush callback
+
+        Returns:
+            The burst the fragment was merged into
+        """
+        with self._lock:
+            burst = self._bursts.get(key)
+            if burst is None:
+                burst = self._bursts[key] = Burst(key=key, context=context)
+            burst.merge(levels, message_id, text)
+            self.stats['fragments'] += 1
+
+            timer = self._timers.pop(key, None)
+            if timer is not None:
+                timer.cancel()
+
+            remaining = self.max_wait_seconds - (time.monotonic() - burst.started_at)
+            timer = self._timers[key] = threading.Timer(max(0.0, min(self.window_seconds, remaining)),
+                                                       self._expire, args=(key, burst))
+            timer.daemon = True
+            timer.start()
+
+        self.logger.debug(f"Fragment {message_id} held ({len(burst.texts)} in burst {key})")
+        return burst
+
+    def pending(self, key: Hashable) -> bool:
+        """Check whether a burst is waiting for a key"""
+        return key in self._bursts
+
+    def _take(self, key: Hashable, burst: Optional[Burst] = None) -> Optional[Burst]:
+        """Remove a key's burst (only if it is still `burst`, when given)"""
+        with self._lock:
+            current = self._bursts.get(key)
+            if current is None or (burst is not None and current is not burst):
+                return None
+            del self._bursts[key]
+            timer = self._timers.pop(key, None)
+            if timer is not None:
+                timer.cancel()
+            self.stats['bursts'] += 1
+            return current
+
+    def _expire(self, key: Hashable, burst: Burst):
+        """Timer callback: the burst's window passed without a new fragment"""
+        burst = self._take(key, burst)
+        if burst is not None:
+            self._apply(burst)
+
+    def flush(self, key: Hashable) -> bool:
+        """
+        Apply a key's burst now (a non-fragment message arrived)
+
+        Args:
+            key: Burst key
+
+        Returns:
+            True if a burst was applied
+        """
+        burst = self._take(key)
+        if burst is None:
+            return False
+        self.stats['early_flushes'] += 1
+        self._apply(burst)
+        return True
+
+    def flush_all(self):
+        """Apply every waiting burst (shutdown)"""
+        for key in list(self._bursts):
+            self.flush(key)
+
+    def _apply(self, burst: Burst):
+        """Hand a burst to the flush callback"""
+        try:
+            self.on_flush(burst)
+        except Exception as e:
+            self.logger.error(f"Applying burst {burst.message_ids} failed: {e}", exc_info=True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get coalescing statistics
+
+        Returns:
+            Dictionary with fragments held, bursts applied, early flushes,
+            bursts waiting and MT5 modifications saved
+        """
+        waiting = list(self._bursts.values())
+        applied_fragments = self.stats['fragments'] - sum(len(burst.texts) for burst in waiting)
+        return {
+            **self.stats,
+            'waiting': len(waiting),
+            'modifications_saved': max(0, applied_fragments - self.stats['bursts']),
+        }
@@ -0,0 +1,242 @@
+"""
+Context Builder - Token-budgeted, incrementally rendered LLM context
+
+The user message sent with every interpretation carries the active trades,
+the recent conversation and the most recent trade pair. Rendered lines are
+cached per trade / per message so only what changed is re-rendered, and the
+assembled context is kept under a token budget by shedding the lowest-value
+lines first:
+
+    1. the oldest recent-conversation messages
+    2. the oldest active trades (summarised into one line)
+
+Active trades and the most recent trade pair are what follow-up messages are
+resolved against, so they are dropped last.
+"""
+
+import math
+import logging
+import threading
+from collections import OrderedDict
+from typing import Optional, Dict, Any, List, Tuple
+
+
+# Rough tokens-per-character ratio for Claude models on short English/number text
+CHARS_PER_TOKEN = 4.0
+
+LAST_TRADE_HINT = ("(If current message refers to 'the trade' or 'it' without specifying pair, "
+                   "it likely means this one)")
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the token count of a string without a network round trip
+
+    Args:
+        text: Text to measure
+
+    Returns:
+        Estimated number of tokens
+    """
+    return math.ceil(len(text) / CHARS_PER_TOKEN) if text else 0
+
+
+class ContextBuilder:
+    """
+    Builds the per-call context block within a token budget
+    """
+
+    def __init__(self, token_budget: Optional[int] = None, max_cached_messages: int = 64):
+        """
+        Initialize context builder
+
+        Args:
+            token_budget: Maximum estimated tokens for the context (None = unlimited)
+            max_cached_messages: Rendered conversation lines kept in the cache
+        """
+        self.logger = logging.getLogger('TradingBot.Context')
+        self.token_budget = token_budget
+        self.max_cached_messages = max_cached_messages
+
+        self._lock = threading.Lock()
+        # trade_id -> (signature, (line, tokens))
+        self._trade_lines: Dict[str, Tuple[Tuple, Tuple[str, int]]] = {}
+        # message text -> (line, tokens)
+        self._message_lines: OrderedDict = OrderedDict()
+
+        self.stats = {
+            'calls': 0,
+            'last_tokens': 0,
+            'total_tokens': 0,
+            'max_tokens': 0,
+            'trimmed_calls': 0,
+            'lines_dropped': 0,
+            'lines_rendered': 0,
+        }
+
+    def fork(self) -> 'ContextBuilder':
+        """
+        Builder for another conversation (e.g. another signal provider)
+
+        Returns:
+            ContextBuilder with the same budget and its own line caches,
+            sharing this builder's statistics
+        """
+        builder = ContextBuilder(token_budget=self.token_budget,
+                                 max_cached_messages=self.max_cached_messages)
+        builder._lock = self._lock
+        builder.stats = self.stats
+        return builder
+
+    # ------------------------------------------------------------------
+    # Incremental rendering
+    # ------------------------------------------------------------------
+
+    def _render_trade(self, trade: Dict[str, Any]) -> Tuple[str, int]:
+        """Rendered line for a trade, re-rendered only when it changed"""
+        signature = (trade['action'], trade['pair'], trade['entry_price'], trade['stop_loss'],
+                     trade['take_profit'], trade['lot_size'])
+        trade_id = trade.get('trade_id') or str(signature)
+
+        cached = self._trade_lines.get(trade_id)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+        line = (f"{trade['action']} {trade['pair']} @ {trade['entry_price']} "
+                f"(SL: {trade['stop_loss']}, TP: {trade['take_profit']}, "
+                f"Lot: {trade['lot_size']})")
+
+        rendered = (line, estimate_tokens(line) + 1)
+        self._trade_lines[trade_id] = (signature, rendered)
+        self.stats['lines_rendered'] += 1
+        return rendered
+
+    def _render_message(self, message: str) -> Tuple[str, int]:
+        """Rendered conversation line, cached by message text"""
+        cached = self._message_lines.get(message)
+        if cached is not None:
+            self._message_lines.move_to_end(message)
+            return cached
+
+        line = f"- {message}"
+        cached = (line, estimate_tokens(line))
+        self._message_lines[message] = cached
+        self.stats['lines_rendered'] += 1
+        while len(self._message_lines) > self.max_cached_messages:
+            self._message_lines.popitem(last=False)
+        return cached
+
+    def _forget_closed_trades(self, active_trades: List[Dict[str, Any]]):
+        """Drop cached lines of trades that are no longer active"""
+        active_ids = {trade.get('trade_id') for trade in active_trades}
+        for trade_id in [t for t in self._trade_lines if t not in active_ids]:
+            del self._trade_lines[trade_id]
+
+    # ------------------------------------------------------------------
+    # Assembly
+    # ------------------------------------------------------------------
+
+    def build(self, active_trades: List[Dict[str, Any]],
+              recent_messages: Optional[List[str]] = None,
+              last_trade_pair: Optional[str] = None) -> Tuple[str, int]:
+        """
+        Assemble the context block for one interpretation call
+
+        Args:
+            active_trades: Active trades (TradeManager.get_context_for_llm)
+            recent_messages: Recent conversation lines, oldest first
+            last_trade_pair: Most recently executed trade pair
+
+        Returns:
+            Tuple of (context text, estimated token count)
+        """
+        recent_messages = recent_messages or []
+
+        with self._lock:
+            self._forget_closed_trades(active_trades)
+            trades = [self._render_trade(trade) for trade in active_trades]
+            messages = [self._render_message(message) for message in recent_messages]
+
+            header = "Active trades:" if trades else "No active trades."
+            fixed_tokens = estimate_tokens(header)
+            if messages:
+                fixed_tokens += estimate_tokens("RECENT CONVERSATION FOR CONTEXT:") + 1
+            if last_trade_pair:
+                fixed_tokens += estimate_tokens(f"MOST RECENT TRADE: {last_trade_pair}\n{LAST_TRADE_HINT}") + 1
+
+            first_message = 0
+            first_trade = 0
+            dropped = 0
+
+            def total() -> int:
+                tokens = fixed_tokens
+                tokens += sum(line[1] for line in trades[first_trade:])
+                tokens += sum(line[1] for line in messages[first_message:])
+                if first_message:
+                    tokens += 8  # "(N earlier messages omitted)"
+                if first_trade:
+                    tokens += 16  # summary of older trades
+                return tokens
+
+            tokens = total()
+            if self.token_budget is not None and tokens > self.token_budget:
+                # 1. oldest conversation lines
+                while tokens > self.token_budget and first_message < len(messages):
+                    first_message += 1
+                    dropped += 1
+                    tokens = total()
+
+                # 2. oldest trades, keeping at least the newest one
+                while tokens > self.token_budget and first_trade < len(trades) - 1:
+                    first_trade += 1
+                    dropped += 1
+                    tokens = total()
+
+            parts = [header]
+            if first_trade:
+                older = active_trades[:first_trade]
+                pairs = ', '.join(sorted({f"{t['action']} {t['pair']}" for t in older}))
+                parts.append(f"({first_trade} older trades not shown: {pairs})")
+            for i, line in enumerate(trades[first_trade:], first_trade + 1):
+                parts.append(f"{i}. {line[0]}")
+
+            if messages:
+                parts.append("")
+                parts.append("RECENT CONVERSATION FOR CONTEXT:")
+                if first_message:
+                    parts.append(f"({first_message} earlier messages omitted)")
+                parts.extend(line[0] for line in messages[first_message:])
+
+            if last_trade_pair:
+                parts.append("")
+                parts.append(f"MOST RECENT TRADE: {last_trade_pair}")
+                parts.append(LAST_TRADE_HINT)
+
+            text = '\n'.join(parts)
+
+            self.stats['calls'] += 1
+            self.stats['last_tokens'] = tokens
+            self.stats['total_tokens'] += tokens
+            self.stats['max_tokens'] = max(self.stats['max_tokens'], tokens)
+            if dropped:
+                self.stats['trimmed_calls'] += 1
+                self.stats['lines_dropped'] += dropped
+
+        if dropped:
+            self.logger.info(f"Context trimmed to ~{tokens} tokens (budget {self.token_budget}, "
+                             f"{dropped} lines dropped)")
+
+        return text, tokens
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get context size statistics
+
+        Returns:
+            Dictionary with token counts (last/mean/max), trimming and cache counters
+        """
+        with self._lock:
+            stats = dict(self.stats)
+        stats['mean_tokens'] = stats['total_tokens'] / stats['calls'] if stats['calls'] else 0.0
+        stats['token_budget'] = self.token_budget
+        return stats
@@ -0,0 +1,161 @@
+"""
+Few-Shot Selector - Retrieval of the most relevant llm.examples per message
+
+Sending every configured example with every call would bloat the prompt, so
+the example inputs are indexed locally (TF-IDF over character n-grams, no
+network) and only the k most similar ones are added to each request.
+
+Digits are masked before indexing, so examples are matched on the *format*
+of a message ("SELL RANGE: ####-####, SL ####") rather than on its prices.
+"""
+
+import re
+import json
+import math
+import logging
+from typing import Dict, Any, List, Tuple
+
+
+DIGIT_PATTERN = re.compile(r'\d')
+
+
+class FewShotSelector:
+    """
+    Picks the configured examples closest to an incoming message
+    """
+
+    def __init__(self, examples: List[Dict[str, Any]], k: int = 2,
+                 min_similarity: float = 0.1, ngram_range: Tuple[int, int] = (3, 5)):
+        """
+        Initialize selector and build the index
+
+        Args:
+            examples: List of {'input': str, 'output': str} from llm.examples
+            k: Maximum examples added per message
+            min_similarity: Examples less similar than this (cosine) are never added
+            ngram_range: Character n-gram sizes
+        """
+        self.logger = logging.getLogger('TradingBot.FewShot')
+        self.k = k
+        self.min_similarity = min_similarity
+        self.ngram_range = ngram_range
+
+        self.examples = [e for e in examples or [] if e.get('input') and e.get('output')]
+        self._rendered = [self._render(e) for e in self.examples]
+
+        # Inverse document frequency over example inputs
+        documents = [self._ngram_counts(e['input']) for e in self.examples]
+        doc_freq: Dict[str, int] = {}
+        for counts in documents:
+            for gram in counts:
+                doc_freq[gram] = doc_freq.get(gram, 0) + 1
+        n = len(documents)
+        self.idf = {gram: math.log((1 + n) / (1 + df)) + 1 for gram, df in doc_freq.items()}
+
+        self._vectors = [self._vectorize(counts) for counts in documents]
+
+        self.stats = {
+            'queries': 0,
+            'examples_added': 0,
+        }
+
+        self.logger.info(f"Indexed {len(self.examples)} few-shot examples")
+
+    def _normalize(self, text: str) -> str:
+        """Uppercase, collapse whitespace and mask digits"""
+        return f" {DIGIT_PATTERN.sub('#', ' '.join(text.upper().split()))} "
+
+    def _ngram_counts(self, text: str) -> Dict[str, int]:
+        """Character n-gram counts of the normalized text"""
+        text = self._normalize(text)
+        counts: Dict[str, int] = {}
+        low, high = self.ngram_range
+        for size in range(low, high + 1):
+            for i in range(len(text) - size + 1):
+                gram = text[i:i + size]
+                counts[gram] = counts.get(gram, 0) + 1
+        return counts
+
+    def _vectorize(self, counts: Dict[str, int]) -> Dict[str, float]:
+        """L2-normalized TF-IDF vector (n-grams unknown to the index are ignored)"""
+        vector = {gram: (1 + math.log(count)) * self.idf[gram]
+                  for gram, count in counts.items() if gram in self.idf}
+        norm = math.sqrt(sum(w * w for w in vector.values()))
+        if norm == 0:
+            return {}
+        return {gram: w / norm for gram, w in vector.items()}
+
+    @staticmethod
+    def _render(example: Dict[str, Any]) -> str:
+        """Compact prompt text for one example"""
+        output = example['output']
+        try:
+            output = json.dumps(json.loads(output), separators=(', ', ': '))
+        except (TypeError, ValueError):
+            output = ' '.join(str(output).split())
+        return f"Message: {example['input']}\nInterpretation: {output}"
+
+    def select(self, message: str) -> List[Tuple[float, int]]:
+        """
+        Rank examples by similarity to a message
+
+        Args:
+            message: Incoming message text
+
+        Returns:
+            Up to k (similarity, example index) tuples, most similar first
+        """
+        if not self.examples or self.k <= 0:
+            return []
+
+        query = self._vectorize(self._ngram_counts(message))
+        if not query:
+            return []
+
+        scores = []
+        for index, vector in enumerate(self._vectors):
+            # Iterate over the smaller vector
+            small, large = (query, vector) if len(query) < len(vector) else (vector, query)
+            similarity = sum(w * large.get(gram, 0.0) for gram, w in small.items())
+            if similarity >= self.min_similarity:
+                scores.append((similarity, index))
+
+        scores.sort(reverse=True)
+        return scores[:self.k]
+
+    def render(self, message: str) -> str:
+        """
+        Build the few-shot block for a message
+
+        Args:
+            message: Incoming message text
+
+        Returns:
+            Prompt text with the selected examples, or "" if none are similar enough
+        """
+        selected = self.select(message)
+        self.stats['queries'] += 1
+        self.stats['examples_added'] += len(selected)
+
+        if not selected:
+            return ""
+
+        self.logger.debug(f"Few-shot examples: {[round(s, 2) for s, _ in selected]}")
+        blocks = [self._rendered[index] for _, index in selected]
+        return "SIMILAR EXAMPLES (for reference):\n" + "\n\n".join(blocks)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get selection statistics
+
+        Returns:
+            Dictionary with example count, queries and average examples added
+        """
+        queries = self.stats['queries']
+        return {
+            'indexed': len(self.examples),
+            'k': self.k,
+            'queries': queries,
+            'examples_added': self.stats['examples_added'],
+            'avg_examples': self.stats['examples_added'] / queries if queries else 0.0,
+        }
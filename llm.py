@@ -2,11 +2,21 @@
 LLM Interpreter - Uses Anthropic Claude to interpret trading signals from messages
 """
 
+import asyncio
+import copy
+import hashlib
 import json
 import logging
-from typing import Optional, Dict, Any, List, Union
-from anthropic import Anthropic
-from pydantic import BaseModel, Field
+import re
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future, wait, FIRST_COMPLETED
+from typing import Optional, Dict, Any, List, Union, Tuple, Callable, Type, Annotated
+from anthropic import Anthropic, AsyncAnthropic
+from pydantic import BaseModel, Field, Discriminator, Tag, ValidationError, model_validator
+
+from context_builder import ContextBuilder, estimate_tokens
 
 
 # ============================================================================
@@ -41,15 +51,6 @@ class NewTradeAction(BaseModel):
     execution_type: str = Field("immediate", description="immediate or pending")
 
 
-# Multi-action signal (NEW)
-class MultiActionSignal(BaseModel):
-    """Signal with multiple actions to execute sequentially"""
-    signal_type: str = Field(default="multi_action", description="Type of signal")
-    actions: List[Dict[str, Any]] = Field(description="List of actions to execute in order")
-    reasoning: str = Field(description="Explanation of all actions")
-    confidence: float = Field(description="Confidence score 0-1")
-
-
 # Original single-action schemas (for backwards compatibility)
 class NewSignal(BaseModel):
     """Schema for a new trading signal"""
@@ -73,6 +74,7 @@ class ModifySignal(BaseModel):
     trade_reference: Optional[str] = Field(None, description="Reference to which trade (pair name or description)")
     new_stop_loss: Optional[float] = Field(None, description="New stop loss price")
     new_take_profit: Optional[float] = Field(None, description="New take profit price")
+    is_breakeven: bool = Field(False, description="True if moving SL to breakeven")
     confidence: float = Field(..., description="Confidence score 0-1")
     reasoning: str = Field(..., description="Explanation of interpretation")
 
@@ -94,206 +96,1164 @@ class NoSignal(BaseModel):
     reasoning: str = Field(..., description="Explanation why this is not a signal")
 
 
+# Multi-action step type -> (signal_type of the step's signal, defaults its details may omit)
+STEP_TYPES: Dict[str, Tuple[str, Dict[str, Any]]] = {
+    "modify": ("modify", {"action_type": "modify_sl"}),
+    "close": ("close", {"action_type": "partial_close"}),
+    "new_trade": ("new_signal", {"entry_price": 0.0}),
+}
+
+
+def _step_signal_type(step: Any) -> Optional[str]:
+    """Discriminator of a multi-action step (validated signal or flattened dict)"""
+    return step.get("signal_type") if isinstance(step, dict) else getattr(step, "signal_type", None)
+
+
+# Multi-action signal (NEW)
+class MultiActionSignal(BaseModel):
+    """
+    Signal with multiple actions to execute sequentially
+    
+    The tool sends steps as {type, details}; each step is validated once,
+    straight into the signal its handler executes (ModifySignal, CloseSignal
+    or NewSignal, sharing the multi-action's confidence and reasoning).
+    """
+    signal_type: str = Field(default="multi_action", description="Type of signal")
+    actions: List[Annotated[
+        Union[Annotated[ModifySignal, Tag("modify")],
+              Annotated[CloseSignal, Tag("close")],
+              Annotated[NewSignal, Tag("new_signal")]],
+        Discriminator(_step_signal_type)
+    ]] = Field(description="List of actions to execute in order")
+    reasoning: str = Field(description="Explanation of all actions")
+    confidence: float = Field(description="Confidence score 0-1")
+    
+    @model_validator(mode="before")
+    @classmethod
+    def _flatten_steps(cls, data: Any) -> Any:
+        """Turn {type, details} steps into the fields of their signals"""
+        if not isinstance(data, dict) or not isinstance(data.get("actions"), list):
+            return data
+        shared = {"confidence": data.get("confidence"), "reasoning": data.get("reasoning")}
+        actions = []
+        for step in data["actions"]:
+            if isinstance(step, dict) and "type" in step:
+                signal_type, defaults = STEP_TYPES.get(step["type"], (None, {}))
+                step = {**defaults, **(step.get("details") or {}), **shared, "signal_type": signal_type}
+            actions.append(step)
+        return {**data, "actions": actions}
+
+
 # Union type for all possible signal types
 SignalResponse = Union[NewSignal, ModifySignal, CloseSignal, NoSignal, MultiActionSignal]
 
 
-class LLMInterpreter:
+# Tool name -> (signal model, signal_type, log line). Tool inputs decode straight
+# into fully typed models (including the multi-action steps) through the
+# model's compiled core validator, skipping model_validate's Python wrapper.
+TOOL_DISPATCH: Dict[str, Tuple[Type[BaseModel], str, Callable[[Any], str]]] = {
+    "report_new_signal": (
+        NewSignal, "new_signal",
+        lambda r: f"Detected NEW signal: {r.pair} {r.action}"
+    ),
+    "report_modify_signal": (
+        ModifySignal, "modify",
+        lambda r: f"Detected MODIFY signal: {r.action_type}"
+    ),
+    "report_close_signal": (
+        CloseSignal, "close",
+        lambda r: f"Detected CLOSE signal: {r.action_type}"
+    ),
+    "report_no_signal": (
+        NoSignal, "none",
+        lambda r: "No trading signal detected"
+    ),
+    "report_multiple_actions": (
+        MultiActionSignal, "multi_action",
+        lambda r: f"Detected MULTI-ACTION signal: {[step.signal_type for step in r.actions]}"
+    ),
+}
+
+
+def decode_tool_call(tool_name: str, tool_input: Dict[str, Any]) -> Optional[SignalResponse]:
     """
-    Interprets trading signals from Telegram messages using Anthropic Claude
+    Decode a tool call into its signal model
+    
+    Args:
+        tool_name: Name of the tool the model called
+        tool_input: Tool input arguments
+        
+    Returns:
+        Typed signal, or None for an unknown tool
+        
+    Raises:
+        ValidationError: Tool input does not match the schema
     """
+    entry = TOOL_DISPATCH.get(tool_name)
+    if entry is None:
+        return None
     
-    def __init__(self, api_key: str, model: str = "claude-sonnet-4-20250514", 
-                 temperature: float = 0.1, max_tokens: int = 2000):
+    model, signal_type, _ = entry
+    result = model.__pydantic_validator__.validate_python(tool_input)
+    # The tool decides the type, whatever the model wrote into signal_type
+    if result.signal_type != signal_type:
+        result.signal_type = signal_type
+    return result
+
+
+# Fallback system prompt when config.yaml does not provide one
+DEFAULT_SYSTEM_PROMPT = """You are an expert trading signal interpreter. Your job is to analyze messages from a Telegram trading group and determine if they contain valid trading signals.
+
+A valid NEW trading signal must include:
+- Currency pair (e.g., EURUSD, GBPUSD, XAUUSD)
+- Direction (BUY/SELL or LONG/SHORT)
+- Entry price or range
+- Stop Loss (SL)
+- Take Profit (TP)
+
+A MODIFY signal includes instructions like:
+- "Move SL to breakeven"
+- "Close 50% at current price"
+- "Adjust TP to X.XXXX"
+
+A CLOSE signal includes instructions like:
+- "Close all positions"
+- "Exit the EUR trade"
+- "Take profit now"
+
+Use the provided tools to report your findings. Always provide your confidence level and reasoning."""
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """
+    Nearest-rank percentile of a list of samples
+    
+    Args:
+        values: Samples (any order)
+        pct: Percentile between 0 and 100
+        
+    Returns:
+        Percentile value, or 0.0 if there are no samples
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+# Output tokens reserved per message in a batch request (one tool call each)
+BATCH_TOKENS_PER_MESSAGE = 300
+
+# Completed top-level string fields in a partially streamed tool input
+PARTIAL_STRING_FIELD = re.compile(r'"(pair|action)"\s*:\s*"((?:[^"\\]|\\.)*)"')
+
+
+class InterpretationCache:
+    """
+    LRU + TTL cache of interpretation results
+    
+    Keyed by the normalized message text and a hash of the system prompt,
+    plus a fingerprint of the trade context (each active trade's ID,
+    direction and SL/TP, and the last traded pair). The whole cache is
+    dropped whenever that fingerprint changes, so a cached answer is never
+    reused against a different set of open trades.
+    """
+    
+    def __init__(self, max_size: int = 256, ttl_seconds: float = 600.0):
         """
-        Initialize LLM interpreter
+        Initialize interpretation cache
         
         Args:
-            api_key: Anthropic API key
-            model: Model name to use
-            temperature: Temperature for generation (lower = more consistent)
-            max_tokens: Maximum tokens to generate
+            max_size: Maximum number of cached results (least recently used are evicted)
+            ttl_seconds: Seconds before a cached result expires
         """
-        self.client = Anthropic(api_key=api_key)
-        self.model = model
-        self.temperature = temperature
-        self.max_tokens = max_tokens
-        self.logger = logging.getLogger('TradingBot.LLM')
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, SignalResponse]]" = OrderedDict()
+        self._context_fingerprint: Optional[Tuple] = None
+        self._lock = threading.Lock()
+        self.logger = logging.getLogger('TradingBot.LLMCache')
+        
+        self.stats: Dict[str, int] = {
+            'hits': 0,
+            'misses': 0,
+            'evictions': 0,
+            'expirations': 0,
+            'invalidations': 0,
+        }
     
-    def _create_tools(self) -> List[Dict[str, Any]]:
+    @staticmethod
+    def normalize_message(message: str) -> str:
+        """Casefold, drop emojis/punctuation and collapse whitespace"""
+        text = re.sub(r'[^\w\s.%/-]', ' ', message.casefold())
+        return ' '.join(text.split())
+    
+    @staticmethod
+    def context_fingerprint(active_trades: List[Dict[str, Any]],
+                            last_trade_pair: Optional[str]) -> Tuple:
+        """Fingerprint of the trade context that affects interpretation"""
+        trades = tuple(sorted(
+            (str(trade.get('trade_id', '')), str(trade.get('pair', '')).upper(),
+             str(trade.get('action', '')).upper(), str(trade.get('stop_loss')), str(trade.get('take_profit')))
+            for trade in active_trades
+        ))
+        return trades, (last_trade_pair or '').upper()
+    
+    @staticmethod
+    def cache_key(message: str, system_prompt: Optional[str] = None) -> str:
+        """Normalized message, qualified by the system prompt it is interpreted with"""
+        prompt_hash = hashlib.sha1((system_prompt or '').encode('utf-8')).hexdigest()[:16]
+        return f"{prompt_hash}:{InterpretationCache.normalize_message(message)}"
+    
+    def _sync_context(self, fingerprint: Tuple):
+        """Drop all entries if the trade context changed (lock must be held)"""
+        if fingerprint == self._context_fingerprint:
+            return
+        
+        if self._entries:
+            self.stats['invalidations'] += 1
+            self.logger.debug(f"Trade context changed - dropping {len(self._entries)} cached results")
+            self._entries.clear()
+        self._context_fingerprint = fingerprint
+    
+    def get(self, message: str, active_trades: List[Dict[str, Any]],
+            last_trade_pair: Optional[str], system_prompt: Optional[str] = None) -> Optional[SignalResponse]:
         """
-        Create tool definitions for structured output
+        Look up a cached interpretation
         
+        Args:
+            message: Raw message text
+            active_trades: Active trades context
+            last_trade_pair: Most recently executed trade pair
+            system_prompt: System prompt the message is interpreted with (None = default)
+            
         Returns:
-            List of tool definitions
+            Copy of the cached signal, or None on a miss
         """
-        return [
-            {
-                "name": "report_new_signal",
-                "description": "Report a new trading signal found in the message",
-                "input_schema": {
-                    "type": "object",
-                    "properties": {
-                        "pair": {
-                            "type": "string",
-                            "description": "Trading pair (defaults to XAUUSD if not specified)"
-                        },
-                        "action": {
-                            "type": "string",
-                            "enum": ["BUY", "SELL"],
-                            "description": "Trading direction"
-                        },
-                        "entry_price": {
-                            "type": "number",
-                            "description": "Entry price for the trade"
-                        },
-                        "stop_loss": {
-                            "type": "number",
-                            "description": "Stop loss price (optional - can be added in follow-up message)"
-                        },
-                        "take_profit": {
-                            "type": "number",
-                            "description": "Primary take profit price (use first TP if multiple)"
-                        },
-                        "tp_levels": {
-                            "type": "array",
-                            "items": {"type": "number"},
-                            "description": "Multiple TP levels if signal has them (e.g., 'TP: 4450/4470/4500' → [4450, 4470, 4500])"
-                        },
-                        "lot_size": {
-                            "type": "number",
-                            "description": "Position size in lots (if specified)"
-                        },
-                        "execution_type": {
-                            "type": "string",
-                            "enum": ["immediate", "pending", "conditional"],
-                            "description": "When to execute the trade"
-                        },
-                        "confidence": {
-                            "type": "number",
-                            "description": "Confidence score between 0 and 1"
-                        },
-                        "reasoning": {
-                            "type": "string",
-                            "description": "Explanation of the interpretation"
-                        }
-                    },
-                    "required": ["action", "entry_price", "confidence", "reasoning"]
-                }
-            },
-            {
-                "name": "report_modify_signal",
-                "description": "Report an instruction to modify an existing trade",
-                "input_schema": {
-                    "type": "object",
-                    "properties": {
-                        "action_type": {
-                            "type": "string",
-                            "enum": ["modify_sl", "modify_tp", "modify_both"],
-                            "description": "What to modify"
-                        },
-                        "trade_reference": {
-                            "type": "string",
-                            "description": "Reference to which trade (e.g., 'EURUSD', 'EUR trade', 'the gold position')"
-                        },
-                        "new_stop_loss": {
-                            "type": "number",
-                            "description": "New stop loss price (if modifying SL)"
-                        },
-                        "new_take_profit": {
-                            "type": "number",
-                            "description": "New take profit price (if modifying TP)"
-                        },
-                        "confidence": {
-                            "type": "number",
-                            "description": "Confidence score between 0 and 1"
-                        },
-                        "reasoning": {
-                            "type": "string",
-                            "description": "Explanation of the interpretation"
-                        }
-                    },
-                    "required": ["action_type", "confidence", "reasoning"]
-                }
-            },
-            {
-                "name": "report_close_signal",
-                "description": "Report an instruction to close an existing trade",
-                "input_schema": {
-                    "type": "object",
-                    "properties": {
-                        "action_type": {
-                            "type": "string",
-                            "enum": ["close", "partial_close"],
-                            "description": "Full or partial close"
-                        },
-                        "trade_reference": {
-                            "type": "string",
-                            "description": "Reference to which trade"
-                        },
-                        "close_percent": {
-                            "type": "number",
-                            "description": "Percentage to close (100 for full close)"
-                        },
-                        "confidence": {
-                            "type": "number",
-                            "description": "Confidence score between 0 and 1"
-                        },
-                        "reasoning": {
-                            "type": "string",
-                            "description": "Explanation of the interpretation"
-                        }
-                    },
-                    "required": ["action_type", "confidence", "reasoning"]
-                }
-            },
-            {
-                "name": "report_no_signal",
-                "description": "Report that the message does not contain a trading signal",
-                "input_schema": {
-                    "type": "object",
-                    "properties": {
-                        "confidence": {
-                            "type": "number",
-                            "description": "Confidence score between 0 and 1"
-                        },
-                        "reasoning": {
-                            "type": "string",
-                            "description": "Explanation why this is not a signal"
-                        }
-                    },
-                    "required": ["confidence", "reasoning"]
-                }
-            },
-            {
-                "name": "report_multiple_actions",
-                "description": "Report when message contains MULTIPLE trading instructions (e.g., 'SET BE & TAKE PARTIALS'). Use this for compound signals that need multiple actions executed sequentially.",
-                "input_schema": {
-                    "type": "object",
-                    "properties": {
-                        "actions": {
-                            "type": "array",
-                            "description": "List of actions to execute in order",
-                            "items": {
-                                "type": "object",
-                                "properties": {
-                                    "type": {
-                                        "type": "string",
-                                        "enum": ["modify", "close", "new_trade"],
-                                        "description": "Type of action"
-                                    },
-                                    "details": {
-                                        "type": "object",
-                                        "description": "Action-specific details"
-                                    }
-                                },
-                                "required": ["type", "details"]
-                            }
-                        },
-                        "reasoning": {
-                            "type": "string",
-                            "description": "Explanation of all actions identified"
-                        },
+        key = self.cache_key(message, system_prompt)
+        fingerprint = self.context_fingerprint(active_trades, last_trade_pair)
+        
+        with self._lock:
+            self._sync_context(fingerprint)
+            
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats['misses'] += 1
+                return None
+            
+            stored_at, result = entry
+            if time.monotonic() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                self.stats['expirations'] += 1
+                self.stats['misses'] += 1
+                return None
+            
+            self._entries.move_to_end(key)
+            self.stats['hits'] += 1
+        
+        # Callers mutate signals (e.g. filling in market entry), so never share the instance
+        return result.model_copy(deep=True)
+    
+    def put(self, message: str, active_trades: List[Dict[str, Any]],
+            last_trade_pair: Optional[str], result: SignalResponse, system_prompt: Optional[str] = None):
+        """
+        Store an interpretation
+        
+        Args:
+            message: Raw message text
+            active_trades: Active trades context
+            last_trade_pair: Most recently executed trade pair
+            result: Signal returned by the LLM
+            system_prompt: System prompt the message was interpreted with (None = default)
+        """
+        key = self.cache_key(message, system_prompt)
+        fingerprint = self.context_fingerprint(active_trades, last_trade_pair)
+        
+        with self._lock:
+            self._sync_context(fingerprint)
+            
+            self._entries[key] = (time.monotonic(), result.model_copy(deep=True))
+            self._entries.move_to_end(key)
+            
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.stats['evictions'] += 1
+    
+    def clear(self):
+        """Drop all cached results"""
+        with self._lock:
+            self._entries.clear()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics
+        
+        Returns:
+            Dictionary with hit/miss/eviction counters, size and hit rate
+        """
+        with self._lock:
+            stats = dict(self.stats)
+            stats['size'] = len(self._entries)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+        return stats
+
+
+class _LeaderCancelled(Exception):
+    """Set on a shared flight whose leader was cancelled (followers retry)"""
+    pass
+
+
+class SingleFlight:
+    """
+    Collapses concurrent identical interpretations into one LLM request
+    
+    The first caller for a key makes the request; callers arriving with the
+    same key while it is in flight wait for it and share its result (or
+    exception). If the caller making the request is cancelled, one of the
+    waiting callers makes it instead. Nothing is kept after the request
+    completes - reuse of finished results is the InterpretationCache's job.
+    """
+    
+    def __init__(self):
+        """Initialize single-flight group"""
+        self._lock = threading.Lock()
+        self._calls: Dict[Tuple, Future] = {}
+        self._async_calls: Dict[Tuple, asyncio.Future] = {}
+        self.logger = logging.getLogger('TradingBot.SingleFlight')
+        
+        self.stats: Dict[str, int] = {
+            'requests': 0,
+            'shared': 0,
+        }
+    
+    @staticmethod
+    def key(message: str, active_trades: List[Dict[str, Any]],
+            last_trade_pair: Optional[str], system_prompt: Optional[str] = None) -> Tuple:
+        """Cache key plus trade-context fingerprint (same as the result cache)"""
+        return (InterpretationCache.cache_key(message, system_prompt),
+                InterpretationCache.context_fingerprint(active_trades, last_trade_pair))
+    
+    def do(self, key: Tuple, fn: Callable[[], Any]) -> Any:
+        """
+        Run fn once per in-flight key
+        
+        Args:
+            key: Flight key (see key())
+            fn: Function making the request
+            
+        Returns:
+            fn's result (shared with every concurrent caller of the same key)
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._calls[key] = future
+                self.stats['requests'] += 1
+            else:
+                self.stats['shared'] += 1
+        
+        if not leader:
+            self.logger.info("Identical message already being interpreted - sharing its result")
+            return future.result()
+        
+        try:
+            result = fn()
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+    
+    async def do_async(self, key: Tuple, fn: Callable[[], Any]) -> Any:
+        """
+        Async variant of do() (all callers must share one event loop)
+        
+        Args:
+            key: Flight key (see key())
+            fn: Coroutine function making the request
+            
+        Returns:
+            fn's result (shared with every concurrent caller of the same key)
+        """
+        future = self._async_calls.get(key)
+        while future is not None:
+            self.stats['shared'] += 1
+            self.logger.info("Identical message already being interpreted - sharing its result")
+            try:
+                # A cancelled follower must not cancel the leader's request
+                return await asyncio.shield(future)
+            except _LeaderCancelled:
+                # The leader's caller went away - take over (or join whoever did)
+                self.stats['shared'] -= 1
+                future = self._async_calls.get(key)
+        
+        future = asyncio.get_running_loop().create_future()
+        self._async_calls[key] = future
+        self.stats['requests'] += 1
+        try:
+            result = await fn()
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            future.set_exception(_LeaderCancelled())
+            future.exception()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # retrieved - no "never retrieved" warning without followers
+            raise
+        finally:
+            del self._async_calls[key]
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get deduplication statistics
+        
+        Returns:
+            Dictionary with requests made, callers that shared one, and requests in flight
+        """
+        with self._lock:
+            stats = dict(self.stats)
+            stats['in_flight'] = len(self._calls) + len(self._async_calls)
+        return stats
+
+
+class LLMUnavailableError(Exception):
+    """
+    Raised when a message could not be interpreted because the LLM is down
+    or too slow and the local fallback could not handle it
+    
+    Callers should keep the message and retry it once the LLM recovers.
+    """
+    pass
+
+
+class CircuitBreaker:
+    """
+    Stops calling the LLM after repeated failures or timeouts
+    
+    closed    -> calls go through; failure_threshold consecutive failures open it
+    open      -> calls are short-circuited for cooldown_seconds
+    half_open -> one probe call is let through; success closes, failure re-opens
+    """
+    
+    def __init__(self, failure_threshold: int = 3, cooldown_seconds: float = 30.0):
+        """
+        Initialize circuit breaker
+        
+        Args:
+            failure_threshold: Consecutive failures that open the breaker
+            cooldown_seconds: Time the breaker stays open before probing
+        """
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self.logger = logging.getLogger('TradingBot.CircuitBreaker')
+        
+        self._lock = threading.Lock()
+        self.state = 'closed'
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        
+        self.stats = {
+            'failures': 0,
+            'timeouts': 0,
+            'opened': 0,
+            'short_circuited': 0,
+        }
+    
+    def allow_request(self) -> bool:
+        """
+        Check whether a call may be made now
+        
+        Returns:
+            True if the call should go to the LLM
+        """
+        with self._lock:
+            if self.state == 'closed':
+                return True
+            
+            if self.state == 'open' and time.monotonic() - self._opened_at >= self.cooldown_seconds:
+                self.state = 'half_open'
+                self._probe_in_flight = False
+                self.logger.info("Circuit half-open - probing LLM")
+            
+            if self.state == 'half_open' and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            
+            self.stats['short_circuited'] += 1
+            return False
+    
+    def record_success(self):
+        """Record a successful call"""
+        with self._lock:
+            if self.state != 'closed':
+                self.logger.info("Circuit closed - LLM recovered")
+            self.state = 'closed'
+            self._consecutive_failures = 0
+            self._probe_in_flight = False
+    
+    def record_failure(self, error: Exception):
+        """
+        Record a failed or timed out call
+        
+        Args:
+            error: Exception raised by the call
+        """
+        with self._lock:
+            self.stats['failures'] += 1
+            if 'timeout' in type(error).__name__.lower() or isinstance(error, TimeoutError):
+                self.stats['timeouts'] += 1
+            self._consecutive_failures += 1
+            self._probe_in_flight = False
+            
+            if self.state == 'half_open' or self._consecutive_failures >= self.failure_threshold:
+                if self.state != 'open':
+                    self.stats['opened'] += 1
+                    self.logger.warning(f"Circuit OPEN after {self._consecutive_failures} failures "
+                                        f"({type(error).__name__}) - using local fallback for "
+                                        f"{self.cooldown_seconds:.0f}s")
+                self.state = 'open'
+                self._opened_at = time.monotonic()
+    
+    @property
+    def is_closed(self) -> bool:
+        """True while calls go to the LLM normally"""
+        return self.state == 'closed'
+    
+    @property
+    def available(self) -> bool:
+        """True if allow_request() would let a call through (without consuming the probe)"""
+        with self._lock:
+            if self.state == 'closed':
+                return True
+            if self.state == 'open':
+                return time.monotonic() - self._opened_at >= self.cooldown_seconds
+            return not self._probe_in_flight
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get breaker statistics
+        
+        Returns:
+            Dictionary with state, consecutive failures and counters
+        """
+        with self._lock:
+            return {
+                'state': self.state,
+                'consecutive_failures': self._consecutive_failures,
+                **self.stats,
+            }
+
+
+class HedgingPolicy:
+    """
+    Decides when to fire a duplicate ("hedged") LLM request
+    
+    A hedge is sent when the first request has not answered within the given
+    percentile of recent latencies for that model. Two budgets cap how often
+    this may happen: a fraction of all calls and an absolute rate per minute.
+    """
+    
+    def __init__(self, percentile: float = 95.0, min_samples: int = 20,
+                 min_delay: float = 0.5, max_ratio: float = 0.1,
+                 max_per_minute: int = 6, history_size: int = 200):
+        """
+        Initialize hedging policy
+        
+        Args:
+            percentile: Latency percentile after which to hedge
+            min_samples: Latency samples required before hedging starts
+            min_delay: Never hedge earlier than this many seconds
+            max_ratio: Maximum fraction of calls that may be hedged
+            max_per_minute: Maximum hedges in any 60 second window
+            history_size: Latency samples kept per model
+        """
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        self.max_ratio = max_ratio
+        self.max_per_minute = max_per_minute
+        self.history_size = history_size
+        
+        self._lock = threading.Lock()
+        self._latencies: Dict[str, deque] = {}
+        self._recent_hedges: deque = deque()
+        
+        self.stats = {
+            'calls': 0,
+            'hedges': 0,
+            'hedge_wins': 0,
+            'budget_denied': 0,
+        }
+    
+    def delay(self, model: str) -> Optional[float]:
+        """
+        Seconds to wait before hedging a call to a model
+        
+        Args:
+            model: Model name
+            
+        Returns:
+            Delay in seconds, or None while there is too little latency history
+        """
+        with self._lock:
+            self.stats['calls'] += 1
+            latencies = list(self._latencies.get(model, ()))
+        
+        if len(latencies) < self.min_samples:
+            return None
+        return max(self.min_delay, percentile(latencies, self.percentile))
+    
+    def try_acquire(self) -> bool:
+        """
+        Consume hedging budget
+        
+        Returns:
+            True if a hedge may be fired now
+        """
+        with self._lock:
+            now = time.monotonic()
+            while self._recent_hedges and now - self._recent_hedges[0] > 60:
+                self._recent_hedges.popleft()
+            
+            if (len(self._recent_hedges) >= self.max_per_minute or
+                    self.stats['hedges'] + 1 > self.max_ratio * self.stats['calls']):
+                self.stats['budget_denied'] += 1
+                return False
+            
+            self._recent_hedges.append(now)
+            self.stats['hedges'] += 1
+            return True
+    
+    def record(self, model: str, latency: float, hedge_won: bool = False):
+        """
+        Record the observed latency of a completed call
+        
+        Args:
+            model: Model name
+            latency: Seconds from first request until an answer arrived
+            hedge_won: True if the duplicate request answered first
+        """
+        with self._lock:
+            history = self._latencies.get(model)
+            if history is None:
+                history = self._latencies[model] = deque(maxlen=self.history_size)
+            history.append(latency)
+            if hedge_won:
+                self.stats['hedge_wins'] += 1
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get hedging statistics
+        
+        Returns:
+            Dictionary with call/hedge/win counters and hedge rate
+        """
+        with self._lock:
+            stats = dict(self.stats)
+        stats['hedge_rate'] = stats['hedges'] / stats['calls'] if stats['calls'] else 0.0
+        return stats
+
+
+# Built-in prices in USD per million tokens, matched by model-name prefix
+# (override or extend with llm.metrics.pricing)
+DEFAULT_PRICING: Dict[str, Dict[str, float]] = {
+    'claude-haiku-4-5': {'input': 1.0, 'output': 5.0, 'cache_read': 0.10, 'cache_write': 1.25},
+    'claude-3-5-haiku': {'input': 0.8, 'output': 4.0, 'cache_read': 0.08, 'cache_write': 1.0},
+    'claude-sonnet-4': {'input': 3.0, 'output': 15.0, 'cache_read': 0.30, 'cache_write': 3.75},
+    'claude-opus-4': {'input': 15.0, 'output': 75.0, 'cache_read': 1.50, 'cache_write': 18.75},
+}
+
+
+class CallMetrics:
+    """
+    Per-call instrumentation of LLM requests
+    
+    Every answered call is recorded with its latency, token counts, cost,
+    retries, chosen tool and confidence. Percentiles and histograms are
+    computed over a rolling window of recent calls; counters and cost are
+    also kept since startup.
+    """
+    
+    # Upper bounds of the latency histogram buckets (the last bucket is open)
+    LATENCY_BUCKETS_MS = (250, 500, 1000, 2000, 4000, 8000)
+    # Lower bounds of the confidence histogram buckets
+    CONFIDENCE_BUCKETS = (0.0, 0.5, 0.7, 0.85, 0.95)
+    
+    def __init__(self, window: int = 1000, pricing: Optional[Dict[str, Dict[str, float]]] = None):
+        """
+        Initialize call metrics
+        
+        Args:
+            window: Number of recent calls the rolling statistics cover
+            pricing: Per-model prices in USD per million tokens (input, output,
+                cache_read, cache_write), merged over DEFAULT_PRICING
+        """
+        self.window = window
+        self.pricing = dict(DEFAULT_PRICING)
+        self.pricing.update(pricing or {})
+        self.started = time.time()
+        
+        self._lock = threading.Lock()
+        self._calls: deque = deque(maxlen=window)
+        self.errors: Dict[str, int] = {}
+        self.totals = {
+            'calls': 0,
+            'messages': 0,
+            'retries': 0,
+            'errors': 0,
+            'input_tokens': 0,
+            'output_tokens': 0,
+            'cache_read_tokens': 0,
+            'cache_write_tokens': 0,
+            'cost': 0.0,
+        }
+    
+    def price(self, model: str) -> Optional[Dict[str, float]]:
+        """
+        Prices for a model (exact name first, then the longest matching prefix)
+        
+        Args:
+            model: Model name
+        
+        Returns:
+            Price dictionary, or None if the model is unknown
+        """
+        if model in self.pricing:
+            return self.pricing[model]
+        matches = [prefix for prefix in self.pricing if model.startswith(prefix)]
+        return self.pricing[max(matches, key=len)] if matches else None
+    
+    def cost(self, model: str, usage: Dict[str, int]) -> float:
+        """
+        Cost of one call in USD
+        
+        Args:
+            model: Model name
+            usage: Token counts (input_tokens, output_tokens, cache_read_tokens, cache_write_tokens)
+        
+        Returns:
+            Cost in USD (0.0 for models without a price)
+        """
+        prices = self.price(model)
+        if prices is None:
+            return 0.0
+        return (usage['input_tokens'] * prices.get('input', 0.0) +
+                usage['output_tokens'] * prices.get('output', 0.0) +
+                usage['cache_read_tokens'] * prices.get('cache_read', 0.0) +
+                usage['cache_write_tokens'] * prices.get('cache_write', 0.0)) / 1_000_000
+    
+    def record_call(self, model: str, latency: float, response: Any,
+                    result: Optional[SignalResponse], retries: int = 0, messages: int = 1):
+        """
+        Record one answered call
+        
+        Args:
+            model: Model that answered
+            latency: Wall-clock seconds the call took
+            response: Anthropic messages response
+            result: Signal parsed from the response (None if unusable)
+            retries: Earlier calls made for the same message (tier escalations)
+            messages: Messages the call interpreted (a batched call covers several)
+        """
+        usage = getattr(response, 'usage', None)
+        tokens = {
+            'input_tokens': getattr(usage, 'input_tokens', 0) or 0,
+            'output_tokens': getattr(usage, 'output_tokens', 0) or 0,
+            'cache_read_tokens': getattr(usage, 'cache_read_input_tokens', 0) or 0,
+            'cache_write_tokens': getattr(usage, 'cache_creation_input_tokens', 0) or 0,
+        }
+        tool = next((block.name for block in getattr(response, 'content', [])
+                     if block.type == "tool_use"), None)
+        call = dict(tokens,
+                    time=time.time(),
+                    model=model,
+                    latency=latency,
+                    retries=retries,
+                    tool=tool,
+                    confidence=result.confidence if result is not None else None,
+                    cost=self.cost(model, tokens))
+        
+        with self._lock:
+            self._calls.append(call)
+            self.totals['calls'] += 1
+            if retries == 0:
+                self.totals['messages'] += messages
+            else:
+                self.totals['retries'] += 1
+            for key, value in tokens.items():
+                self.totals[key] += value
+            self.totals['cost'] += call['cost']
+    
+    def record_error(self, error: Exception):
+        """
+        Record a call that failed (API error, timeout, ...)
+        
+        Args:
+            error: Exception raised by the call
+        """
+        with self._lock:
+            self.totals['errors'] += 1
+            name = type(error).__name__
+            self.errors[name] = self.errors.get(name, 0) + 1
+    
+    def _histogram(self, values: List[float], bounds: Tuple, upper: bool) -> List[Tuple[str, int]]:
+        """Bucket counts, labelled by their bounds"""
+        counts = [0] * (len(bounds) + (1 if upper else 0))
+        for value in values:
+            if upper:
+                index = next((i for i, bound in enumerate(bounds) if value <= bound), len(bounds))
+            else:
+                index = max(i for i, bound in enumerate(bounds) if value >= bound)
+            counts[index] += 1
+        
+        if upper:
+            labels = [f"≤{bound}" for bound in bounds] + [f">{bounds[-1]}"]
+        else:
+            labels = [f"{bound:.2f}-{bounds[i + 1]:.2f}" if i + 1 < len(bounds) else f"≥{bound:.2f}"
+                      for i, bound in enumerate(bounds)]
+        return list(zip(labels, counts))
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get rolling and lifetime call statistics
+        
+        Returns:
+            Dictionary with lifetime totals, window percentiles/histograms,
+            per-model and per-tool breakdowns and the hourly cost rate
+        """
+        with self._lock:
+            calls = list(self._calls)
+            totals = dict(self.totals)
+            errors = dict(self.errors)
+        
+        now = time.time()
+        latencies_ms = [call['latency'] * 1000 for call in calls]
+        confidences = [call['confidence'] for call in calls if call['confidence'] is not None]
+        
+        # Cost per hour: the last hour's spend over the time it covers
+        last_hour_cost = sum(call['cost'] for call in calls if now - call['time'] <= 3600)
+        if len(calls) == self.window and now - calls[0]['time'] < 3600:
+            # Window holds less than an hour of calls - extrapolate from its span
+            span = max(60.0, now - calls[0]['time'])
+        else:
+            span = max(60.0, min(3600.0, now - self.started))
+        cost_per_hour = last_hour_cost * 3600 / span
+        
+        by_model: Dict[str, Dict[str, Any]] = {}
+        for call in calls:
+            model_stats = by_model.setdefault(call['model'], {'calls': 0, 'latencies': [], 'cost': 0.0})
+            model_stats['calls'] += 1
+            model_stats['latencies'].append(call['latency'] * 1000)
+            model_stats['cost'] += call['cost']
+        for model_stats in by_model.values():
+            latencies = model_stats.pop('latencies')
+            model_stats['p50_ms'] = percentile(latencies, 50)
+            model_stats['p95_ms'] = percentile(latencies, 95)
+        
+        by_tool: Dict[str, int] = {}
+        for call in calls:
+            tool = call['tool'] or 'none'
+            by_tool[tool] = by_tool.get(tool, 0) + 1
+        
+        return {
+            'totals': totals,
+            'errors': errors,
+            'window_calls': len(calls),
+            'latency_p50_ms': percentile(latencies_ms, 50),
+            'latency_p95_ms': percentile(latencies_ms, 95),
+            'latency_p99_ms': percentile(latencies_ms, 99),
+            'latency_max_ms': max(latencies_ms) if latencies_ms else 0.0,
+            'latency_histogram': self._histogram(latencies_ms, self.LATENCY_BUCKETS_MS, upper=True),
+            'confidence_histogram': self._histogram(confidences, self.CONFIDENCE_BUCKETS, upper=False),
+            'mean_input_tokens': sum(call['input_tokens'] for call in calls) / len(calls) if calls else 0.0,
+            'mean_output_tokens': sum(call['output_tokens'] for call in calls) / len(calls) if calls else 0.0,
+            'mean_cache_read_tokens': sum(call['cache_read_tokens'] for call in calls) / len(calls) if calls else 0.0,
+            'cost_per_message': totals['cost'] / totals['messages'] if totals['messages'] else 0.0,
+            'cost_per_hour': cost_per_hour,
+            'by_model': by_model,
+            'by_tool': by_tool,
+        }
+
+
+class LLMInterpreter:
+    """
+    Interprets trading signals from Telegram messages using Anthropic Claude
+    """
+    
+    def __init__(self, api_key: str, model: str = "claude-sonnet-4-20250514", 
+                 temperature: float = 0.1, max_tokens: int = 2000,
+                 fast_parser: Optional[Any] = None, prompt_caching: bool = True,
+                 result_cache: Optional[InterpretationCache] = None,
+                 model_tiers: Optional[List[str]] = None,
+                 escalation_confidence: float = 0.7,
+                 hedging: Optional[HedgingPolicy] = None,
+                 context_builder: Optional[ContextBuilder] = None,
+                 example_selector: Optional[Any] = None,
+                 request_timeout: Optional[float] = 15.0,
+                 max_retries: int = 0,
+                 circuit_breaker: Optional[CircuitBreaker] = None,
+                 template_library: Optional[Any] = None,
+                 single_flight: Optional[SingleFlight] = None,
+                 transport: Optional[Any] = None,
+                 metrics: Optional[CallMetrics] = None):
+        """
+        Initialize LLM interpreter
+        
+        Args:
+            api_key: Anthropic API key
+            model: Model name to use
+            temperature: Temperature for generation (lower = more consistent)
+            max_tokens: Maximum tokens to generate
+            fast_parser: Optional FastSignalParser tried before calling the LLM
+            prompt_caching: Mark system prompt and tools as a cacheable prefix
+            result_cache: Optional cache of previous interpretations
+            model_tiers: Models to try in order, fastest first (defaults to [model])
+            escalation_confidence: Escalate to the next tier below this confidence
+            hedging: Optional policy for duplicating slow requests
+            context_builder: Builder for the per-call context (unlimited budget if None)
+            example_selector: Optional FewShotSelector adding similar llm.examples
+            request_timeout: Deadline in seconds for each API call (None = SDK default)
+            max_retries: SDK-level retries per call (each retry re-spends the deadline)
+            circuit_breaker: Breaker switching to the local fallback (default breaker if None)
+            template_library: Optional TemplateLibrary of mined provider formats
+            single_flight: Group sharing one request between identical concurrent messages
+            transport: Optional llm_replay transport recording or replaying API calls
+            metrics: Per-call latency/token/cost instrumentation (default window if None)
+        """
+        client_kwargs: Dict[str, Any] = {'api_key': api_key, 'max_retries': max_retries}
+        if request_timeout is not None:
+            client_kwargs['timeout'] = request_timeout
+        self._client_kwargs = client_kwargs
+        self.client = Anthropic(**client_kwargs)
+        self.transport = transport
+        if transport is not None:
+            self.client = transport.wrap(self.client)
+        self.request_timeout = request_timeout
+        self.model_tiers = list(model_tiers) if model_tiers else [model]
+        self.model = self.model_tiers[0]
+        self.escalation_confidence = escalation_confidence
+        self.hedging = hedging
+        self.context_builder = context_builder or ContextBuilder()
+        self.example_selector = example_selector
+        self.circuit_breaker = circuit_breaker or CircuitBreaker()
+        self.single_flight = single_flight or SingleFlight()
+        self.metrics = metrics or CallMetrics()
+        self._batch_tools: Optional[List[Dict[str, Any]]] = None
+        self.temperature = temperature
+        self.max_tokens = max_tokens
+        self.fast_parser = fast_parser
+        self.template_library = template_library
+        self.prompt_caching = prompt_caching
+        self.result_cache = result_cache
+        self.logger = logging.getLogger('TradingBot.LLM')
+        
+        # Tool schemas are static - build them once and reuse on every call
+        self.tools = self._create_tools()
+        if self.prompt_caching:
+            # Breakpoint on the last tool caches the whole tool list
+            self.tools[-1]["cache_control"] = {"type": "ephemeral"}
+        
+        # System prompt blocks, rebuilt only when the prompt text changes
+        self._system_prompt_text: Optional[str] = None
+        self._system_blocks: Optional[List[Dict[str, Any]]] = None
+        
+        # Per-tier latency / escalation statistics
+        self._tier_lock = threading.Lock()
+        self.tier_stats: Dict[str, Dict[str, Any]] = {
+            tier_model: {
+                'calls': 0,
+                'escalations': 0,
+                'low_confidence': 0,
+                'invalid': 0,
+                'latencies': deque(maxlen=500),
+            }
+            for tier_model in self.model_tiers
+        }
+    
+    def _create_tools(self) -> List[Dict[str, Any]]:
+        """
+        Create tool definitions for structured output
+        
+        Returns:
+            List of tool definitions
+        """
+        return [
+            {
+                "name": "report_new_signal",
+                "description": "Report a new trading signal found in the message",
+                "input_schema": {
+                    "type": "object",
+                    "properties": {
+                        "pair": {
+                            "type": "string",
+                            "description": "Trading pair (defaults to XAUUSD if not specified)"
+                        },
+                        "action": {
+                            "type": "string",
+                            "enum": ["BUY", "SELL"],
+                            "description": "Trading direction"
+                        },
+                        "entry_price": {
+                            "type": "number",
+                            "description": "Entry price for the trade"
+                        },
+                        "stop_loss": {
+                            "type": "number",
+                            "description": "Stop loss price (optional - can be added in follow-up message)"
+                        },
+                        "take_profit": {
+                            "type": "number",
+                            "description": "Primary take profit price (use first TP if multiple)"
+                        },
+                        "tp_levels": {
+                            "type": "array",
+                            "items": {"type": "number"},
+                            "description": "Multiple TP levels if signal has them (e.g., 'TP: 4450/4470/4500' → [4450, 4470, 4500])"
+                        },
+                        "lot_size": {
+                            "type": "number",
+                            "description": "Position size in lots (if specified)"
+                        },
+                        "execution_type": {
+                            "type": "string",
+                            "enum": ["immediate", "pending", "conditional"],
+                            "description": "When to execute the trade"
+                        },
+                        "confidence": {
+                            "type": "number",
+                            "description": "Confidence score between 0 and 1"
+                        },
+                        "reasoning": {
+                            "type": "string",
+                            "description": "Explanation of the interpretation"
+                        }
+                    },
+                    "required": ["action", "entry_price", "confidence", "reasoning"]
+                }
+            },
+            {
+                "name": "report_modify_signal",
+                "description": "Report an instruction to modify an existing trade",
+                "input_schema": {
+                    "type": "object",
+                    "properties": {
+                        "action_type": {
+                            "type": "string",
+                            "enum": ["modify_sl", "modify_tp", "modify_both"],
+                            "description": "What to modify"
+                        },
+                        "trade_reference": {
+                            "type": "string",
+                            "description": "Reference to which trade (e.g., 'EURUSD', 'EUR trade', 'the gold position')"
+                        },
+                        "new_stop_loss": {
+                            "type": "number",
+                            "description": "New stop loss price (if modifying SL)"
+                        },
+                        "new_take_profit": {
+                            "type": "number",
+                            "description": "New take profit price (if modifying TP)"
+                        },
+                        "confidence": {
+                            "type": "number",
+                            "description": "Confidence score between 0 and 1"
+                        },
+                        "reasoning": {
+                            "type": "string",
+                            "description": "Explanation of the interpretation"
+                        }
+                    },
+                    "required": ["action_type", "confidence", "reasoning"]
+                }
+            },
+            {
+                "name": "report_close_signal",
+                "description": "Report an instruction to close an existing trade",
+                "input_schema": {
+                    "type": "object",
+                    "properties": {
+                        "action_type": {
+                            "type": "string",
+                            "enum": ["close", "partial_close"],
+                            "description": "Full or partial close"
+                        },
+                        "trade_reference": {
+                            "type": "string",
+                            "description": "Reference to which trade"
+                        },
+                        "close_percent": {
+                            "type": "number",
+                            "description": "Percentage to close (100 for full close)"
+                        },
+                        "confidence": {
+                            "type": "number",
+                            "description": "Confidence score between 0 and 1"
+                        },
+                        "reasoning": {
+                            "type": "string",
+                            "description": "Explanation of the interpretation"
+                        }
+                    },
+                    "required": ["action_type", "confidence", "reasoning"]
+                }
+            },
+            {
+                "name": "report_no_signal",
+                "description": "Report that the message does not contain a trading signal",
+                "input_schema": {
+                    "type": "object",
+                    "properties": {
+                        "confidence": {
+                            "type": "number",
+                            "description": "Confidence score between 0 and 1"
+                        },
+                        "reasoning": {
+                            "type": "string",
+                            "description": "Explanation why this is not a signal"
+                        }
+                    },
+                    "required": ["confidence", "reasoning"]
+                }
+            },
+            {
+                "name": "report_multiple_actions",
+                "description": "Report when message contains MULTIPLE trading instructions (e.g., 'SET BE & TAKE PARTIALS'). Use this for compound signals that need multiple actions executed sequentially.",
+                "input_schema": {
+                    "type": "object",
+                    "properties": {
+                        "actions": {
+                            "type": "array",
+                            "description": "List of actions to execute in order",
+                            "items": {
+                                "type": "object",
+                                "properties": {
+                                    "type": {
+                                        "type": "string",
+                                        "enum": ["modify", "close", "new_trade"],
+                                        "description": "Type of action"
+                                    },
+                                    "details": {
+                                        "type": "object",
+                                        "description": "Action-specific details"
+                                    }
+                                },
+                                "required": ["type", "details"]
+                            }
+                        },
+                        "reasoning": {
+                            "type": "string",
+                            "description": "Explanation of all actions identified"
+                        },
                         "confidence": {
                             "type": "number",
                             "description": "Overall confidence score 0-1"
@@ -304,33 +1264,466 @@ class LLMInterpreter:
             }
         ]
     
-    def _build_context_message(self, active_trades: List[Dict[str, Any]]) -> str:
+    def _get_system_blocks(self, system_prompt: str) -> Union[str, List[Dict[str, Any]]]:
+        """
+        Get the system prompt in the form sent to the API
+        
+        Args:
+            system_prompt: System prompt text
+            
+        Returns:
+            Plain string, or a cached text block list when prompt caching is on
+        """
+        if not self.prompt_caching:
+            return system_prompt
+        
+        if system_prompt != self._system_prompt_text:
+            self._system_prompt_text = system_prompt
+            self._system_blocks = [
+                {
+                    "type": "text",
+                    "text": system_prompt,
+                    "cache_control": {"type": "ephemeral"}
+                }
+            ]
+        
+        return self._system_blocks
+    
+    def _log_usage(self, response: Any):
+        """
+        Log token usage, including prompt cache reads/writes
+        
+        Args:
+            response: Anthropic messages response
+        """
+        usage = getattr(response, 'usage', None)
+        if usage is None:
+            return
+        
+        cache_read = getattr(usage, 'cache_read_input_tokens', 0) or 0
+        cache_write = getattr(usage, 'cache_creation_input_tokens', 0) or 0
+        
+        self.logger.info(f"Token usage: input={usage.input_tokens}, output={usage.output_tokens}, "
+                         f"cache_read={cache_read}, cache_write={cache_write}")
+    
+    def _interpret_locally(self, message: str, active_trades: List[Dict[str, Any]],
+                           last_trade_pair: Optional[str],
+                           system_prompt: Optional[str] = None) -> Optional[SignalResponse]:
+        """
+        Answer a message without the LLM when possible
+        
+        Args:
+            message: Message text to interpret
+            active_trades: List of active trades for context
+            last_trade_pair: Most recently executed trade pair
+            system_prompt: Custom system prompt (part of the result cache key)
+            
+        Returns:
+            SignalResponse from the fast-path parser, a mined template or the result cache, else None
+        """
+        # Routine formats are parsed locally - only fall back to the LLM when unsure
+        if self.fast_parser is not None:
+            result = self.fast_parser.parse(message, active_trades, last_trade_pair)
+            if result is not None:
+                return result
+        
+        # Recurring provider formats mined from earlier LLM interpretations
+        if self.template_library is not None:
+            result = self.template_library.extract(message, active_trades, last_trade_pair)
+            if result is not None:
+                return result
+        
+        # Reposted messages are answered from the cache
+        if self.result_cache is not None:
+            result = self.result_cache.get(message, active_trades, last_trade_pair, system_prompt)
+            if result is not None:
+                self.logger.info(f"Cache hit ({result.signal_type}) - LLM call skipped")
+                return result
+        
+        return None
+    
+    def _build_request(self,
+                       message: str,
+                       active_trades: List[Dict[str, Any]],
+                       system_prompt: Optional[str],
+                       recent_messages: Optional[List[str]],
+                       last_trade_pair: Optional[str]) -> Dict[str, Any]:
+        """
+        Build the keyword arguments for a messages.create call
+        
+        Args:
+            message: Message text to interpret
+            active_trades: List of active trades for context
+            system_prompt: Custom system prompt (uses default if None)
+            recent_messages: List of recent messages for conversational context
+            last_trade_pair: Most recently executed trade pair
+            
+        Returns:
+            Request keyword arguments
+        """
+        # Active trades, recent conversation and last trade pair (within the token budget)
+        context, context_tokens = self.context_builder.build(active_trades, recent_messages,
+                                                             last_trade_pair)
+        
+        # Only the few configured examples that resemble this message
+        if self.example_selector is not None:
+            examples = self.example_selector.render(message)
+            if examples:
+                context = f"{examples}\n\n{context}"
+                context_tokens += estimate_tokens(examples)
+        
+        # Default system prompt if not provided
+        if system_prompt is None:
+            system_prompt = DEFAULT_SYSTEM_PROMPT
+        
+        # Sanitize message for logging to avoid Unicode errors on Windows
+        from utils import sanitize_for_logging
+        safe_message = sanitize_for_logging(message, max_length=100)
+        self.logger.info(f"Interpreting message: {safe_message} (context ~{context_tokens} tokens)")
+        
+        return {
+            "model": self.model,
+            "max_tokens": self.max_tokens,
+            "temperature": self.temperature,
+            "system": self._get_system_blocks(system_prompt),
+            "tools": self.tools,
+            "messages": [
+                {
+                    "role": "user",
+                    "content": f"{context}\n\nNew message to analyze:\n{message}\n\nAnalyze this message and use the appropriate tool to report your findings."
+                }
+            ]
+        }
+    
+    def _parse_response(self, response: Any) -> Optional[SignalResponse]:
+        """
+        Convert a tool-use response into a signal
+        
+        Args:
+            response: Anthropic messages response
+            
+        Returns:
+            SignalResponse object or None if no usable tool call was returned
+        """
+        self._log_usage(response)
+        
+        # Extract tool use from response
+        tool_use = None
+        for block in response.content:
+            if block.type == "tool_use":
+                tool_use = block
+                break
+        
+        if tool_use is None:
+            self.logger.warning("No tool use found in response")
+            return None
+        
+        # Parse tool response into appropriate schema (precompiled dispatch table)
+        result = decode_tool_call(tool_use.name, tool_use.input)
+        if result is None:
+            self.logger.warning(f"Unknown tool: {tool_use.name}")
+            return None
+        
+        self.logger.info(TOOL_DISPATCH[tool_use.name][2](result))
+        return result
+    
+    def _evaluate_tier(self, response: Any) -> Tuple[Optional[SignalResponse], Optional[str]]:
+        """
+        Parse a tier's response and decide whether it needs escalation
+        
+        Args:
+            response: Anthropic messages response
+            
+        Returns:
+            Tuple of (signal or None, escalation reason or None if accepted)
+        """
+        try:
+            result = self._parse_response(response)
+        except ValidationError as e:
+            self.logger.warning(f"Tool payload failed validation ({e.error_count()} errors)")
+            return None, 'invalid'
+        
+        if result is None:
+            return None, 'invalid'
+        
+        if result.confidence < self.escalation_confidence:
+            return result, 'low_confidence'
+        
+        return result, None
+    
+    def _record_tier(self, model: str, latency: float, reason: Optional[str], escalated: bool):
+        """
+        Update statistics for one tier call
+        
+        Args:
+            model: Tier model
+            latency: Call latency in seconds
+            reason: Escalation reason from _evaluate_tier (None if accepted)
+            escalated: Whether the next tier was tried
+        """
+        with self._tier_lock:
+            stats = self.tier_stats[model]
+            stats['calls'] += 1
+            stats['latencies'].append(latency)
+            if reason is not None:
+                stats[reason] += 1
+            if escalated:
+                stats['escalations'] += 1
+    
+    def _accept_tier(self, tier: int, latency: float,
+                     response: Any) -> Tuple[Optional[SignalResponse], bool]:
+        """
+        Evaluate, record and log one tier's answer
+        
+        Args:
+            tier: Index into model_tiers
+            latency: Call latency in seconds
+            response: Anthropic messages response
+            
+        Returns:
+            Tuple of (signal or None, True if the answer is final)
+        """
+        model = self.model_tiers[tier]
+        is_last = tier == len(self.model_tiers) - 1
+        
+        result, reason = self._evaluate_tier(response)
+        escalate = reason is not None and not is_last
+        self._record_tier(model, latency, reason, escalate)
+        self.metrics.record_call(model, latency, response, result, retries=tier)
+        
+        if escalate:
+            detail = f"confidence {result.confidence:.2f}" if reason == 'low_confidence' else "invalid payload"
+            self.logger.info(f"Escalating from {model} to {self.model_tiers[tier + 1]} ({detail})")
+        
+        return result, not escalate
+    
+    def _run_tiers(self, request: Dict[str, Any],
+                   send: Callable[[Dict[str, Any]], Any]) -> Optional[SignalResponse]:
+        """
+        Send a request to each model tier until one gives an acceptable answer
+        
+        Args:
+            request: Request keyword arguments from _build_request
+            send: Function performing the API call for a request
+            
+        Returns:
+            Accepted signal, else the last valid low-confidence signal, else None
+        """
+        fallback = None
+        for tier, model in enumerate(self.model_tiers):
+            start = time.perf_counter()
+            response = send(dict(request, model=model))
+            result, final = self._accept_tier(tier, time.perf_counter() - start, response)
+            
+            if result is not None:
+                fallback = result
+            if final:
+                break
+        
+        return fallback
+    
+    def _create(self, request: Dict[str, Any]) -> Any:
+        """
+        messages.create, hedged with a duplicate request when it runs slow
+        
+        A blocking call that is already in flight cannot be interrupted, so the
+        losing request is abandoned and its answer discarded. Each request
+        runs on its own daemon thread: an abandoned loser never holds a
+        worker that a new call is waiting for (hedges are rate-limited, so
+        losers stay few).
+        
+        Args:
+            request: Request keyword arguments
+            
+        Returns:
+            Anthropic messages response
+        """
+        if self.hedging is None:
+            return self.client.messages.create(**request)
+        
+        model = request['model']
+        delay = self.hedging.delay(model)
+        start = time.perf_counter()
+        
+        if delay is None:
+            response = self.client.messages.create(**request)
+            self.hedging.record(model, time.perf_counter() - start)
+            return response
+        
+        primary = self._start_call(self.client.messages.create, **request)
+        done, _ = wait([primary], timeout=delay)
+        
+        if done or not self.hedging.try_acquire():
+            response = primary.result()
+            self.hedging.record(model, time.perf_counter() - start)
+            return response
+        
+        self.logger.info(f"Hedging {model}: no answer after {delay * 1000:.0f}ms, sending duplicate")
+        hedge = self._start_call(self.client.messages.create, **request)
+        done, _ = wait([primary, hedge], return_when=FIRST_COMPLETED)
+        
+        winner = done.pop()
+        if winner.exception() is not None:
+            # First to finish failed - the other one is our only chance
+            winner = hedge if winner is primary else primary
+        
+        response = winner.result()
+        self.hedging.record(model, time.perf_counter() - start, hedge_won=winner is hedge)
+        return response
+    
+    @staticmethod
+    def _start_call(fn: Callable[..., Any], **kwargs) -> Future:
+        """
+        Run a blocking call on a daemon thread of its own
+        
+        Args:
+            fn: Function to call
+            **kwargs: Keyword arguments for fn
+            
+        Returns:
+            Future resolved with fn's result or exception
+        """
+        future: Future = Future()
+        
+        def run():
+            if not future.set_running_or_notify_cancel():
+                return
+            try:
+                future.set_result(fn(**kwargs))
+            except BaseException as e:
+                future.set_exception(e)
+        
+        threading.Thread(target=run, daemon=True, name='llm-hedge').start()
+        return future
+    
+    def get_tier_stats(self) -> List[Dict[str, Any]]:
+        """
+        Get per-tier latency and escalation statistics
+        
+        Returns:
+            One dictionary per tier (fastest first)
+        """
+        with self._tier_lock:
+            tiers = []
+            for tier_model in self.model_tiers:
+                stats = self.tier_stats[tier_model]
+                latencies = list(stats['latencies'])
+                calls = stats['calls']
+                tiers.append({
+                    'model': tier_model,
+                    'calls': calls,
+                    'escalations': stats['escalations'],
+                    'escalation_rate': stats['escalations'] / calls if calls else 0.0,
+                    'low_confidence': stats['low_confidence'],
+                    'invalid': stats['invalid'],
+                    'latency_mean_ms': 1000 * sum(latencies) / len(latencies) if latencies else 0.0,
+                    'latency_p50_ms': 1000 * percentile(latencies, 50),
+                    'latency_p95_ms': 1000 * percentile(latencies, 95),
+                })
+            return tiers
+    
+    def for_provider(self, default_pair: Optional[str] = None) -> 'LLMInterpreter':
+        """
+        Interpreter view for one signal provider
+        
+        The view shares the API client, model tiers, circuit breaker, hedging,
+        metrics and parser statistics with this interpreter, but has its own
+        result cache, single-flight group (the same text can mean different
+        things for different providers) and context line caches, and assumes
+        default_pair for new signals that name no pair.
+        
+        Args:
+            default_pair: Provider's default pair (None = keep the fast parser's)
+            
+        Returns:
+            LLMInterpreter of the same class
+        """
+        view = copy.copy(self)
+        view.single_flight = SingleFlight()
+        view.context_builder = self.context_builder.fork()
+        if self.result_cache is not None:
+            view.result_cache = InterpretationCache(max_size=self.result_cache.max_size,
+                                                    ttl_seconds=self.result_cache.ttl_seconds)
+        if self.fast_parser is not None and default_pair:
+            view.fast_parser = copy.copy(self.fast_parser)
+            view.fast_parser.default_pair = default_pair
+        return view
+    
+    def _interpret_fallback(self, message: str, active_trades: List[Dict[str, Any]],
+                            last_trade_pair: Optional[str], reason: str) -> SignalResponse:
         """
-        Build context message about active trades
+        Interpret locally while the LLM is unavailable
         
         Args:
-            active_trades: List of active trade dictionaries
+            message: Message text to interpret
+            active_trades: List of active trades for context
+            last_trade_pair: Most recently executed trade pair
+            reason: Why the LLM was not used (for the error)
             
         Returns:
-            Formatted context string
+            SignalResponse from the lenient rule-based parser
+            
+        Raises:
+            LLMUnavailableError: If the fallback cannot interpret the message
+        """
+        if self.fast_parser is not None:
+            result = self.fast_parser.parse_lenient(message, active_trades, last_trade_pair)
+            if result is not None:
+                return result
+        
+        raise LLMUnavailableError(f"LLM unavailable ({reason}) and fallback could not interpret message")
+    
+    def _handle_call_failure(self, error: Exception, message: str, active_trades: List[Dict[str, Any]],
+                             last_trade_pair: Optional[str]) -> SignalResponse:
         """
-        if not active_trades:
-            return "No active trades."
+        Record a failed LLM call and fall back to local interpretation
         
-        context = "Active trades:\n"
-        for i, trade in enumerate(active_trades, 1):
-            context += (f"{i}. {trade['action']} {trade['pair']} @ {trade['entry_price']} "
-                       f"(SL: {trade['stop_loss']}, TP: {trade['take_profit']}, "
-                       f"Lot: {trade['lot_size']})\n")
+        Args:
+            error: Exception raised by the call (API error, timeout, ...)
+            message: Message text to interpret
+            active_trades: List of active trades for context
+            last_trade_pair: Most recently executed trade pair
+            
+        Returns:
+            SignalResponse from the fallback interpreter
+            
+        Raises:
+            LLMUnavailableError: If the fallback cannot interpret the message
+        """
+        self.logger.error(f"Error interpreting message: {error}")
+        self.circuit_breaker.record_failure(error)
+        self.metrics.record_error(error)
+        return self._interpret_fallback(message, active_trades, last_trade_pair,
+                                        f"{type(error).__name__}: {error}")
+    
+    def _finish_call(self, message: str, active_trades: List[Dict[str, Any]],
+                     last_trade_pair: Optional[str], result: Optional[SignalResponse],
+                     system_prompt: Optional[str] = None) -> Optional[SignalResponse]:
+        """
+        Bookkeeping after a successful LLM call
         
-        return context
+        Args:
+            message: Message text that was interpreted
+            active_trades: List of active trades for context
+            last_trade_pair: Most recently executed trade pair
+            result: Signal returned by the LLM
+            system_prompt: Custom system prompt the message was interpreted with
+            
+        Returns:
+            The same result
+        """
+        self.circuit_breaker.record_success()
+        if result is not None and self.result_cache is not None:
+            self.result_cache.put(message, active_trades, last_trade_pair, result, system_prompt)
+        return result
     
     def interpret_message(self, 
                          message: str, 
                          active_trades: Optional[List[Dict[str, Any]]] = None,
                          system_prompt: Optional[str] = None,
                          recent_messages: Optional[List[str]] = None,
-                         last_trade_pair: Optional[str] = None) -> Optional[SignalResponse]:
+                         last_trade_pair: Optional[str] = None,
+                         use_local: bool = True) -> Optional[SignalResponse]:
         """
         Interpret a telegram message to extract trading signal
         
@@ -340,119 +1733,475 @@ class LLMInterpreter:
             system_prompt: Custom system prompt (uses default if None)
             recent_messages: List of recent messages for conversational context
             last_trade_pair: Most recently executed trade pair
+            use_local: Try the fast parser/templates/cache first (False = always ask the LLM,
+                e.g. to verify a fast-path result)
+            
+        Returns:
+            SignalResponse object or None if interpretation failed
+            
+        Raises:
+            LLMUnavailableError: LLM down/slow and the local fallback could not help
+        """
+        if active_trades is None:
+            active_trades = []
+        
+        if use_local:
+            result = self._interpret_locally(message, active_trades, last_trade_pair, system_prompt)
+            if result is not None:
+                return result
+        
+        # Forwarded copies arriving while the original is in flight share its request
+        return self.single_flight.do(
+            SingleFlight.key(message, active_trades, last_trade_pair, system_prompt),
+            lambda: self._interpret_remote(message, active_trades, system_prompt,
+                                           recent_messages, last_trade_pair, self._create)
+        )
+    
+    def _interpret_remote(self,
+                          message: str,
+                          active_trades: List[Dict[str, Any]],
+                          system_prompt: Optional[str],
+                          recent_messages: Optional[List[str]],
+                          last_trade_pair: Optional[str],
+                          send: Callable[[Dict[str, Any]], Any]) -> Optional[SignalResponse]:
+        """
+        Interpret a message with the LLM (breaker, tiers, fallback and caching)
+        
+        Args:
+            message: Message text to interpret
+            active_trades: List of active trades for context
+            system_prompt: Custom system prompt (uses default if None)
+            recent_messages: List of recent messages for conversational context
+            last_trade_pair: Most recently executed trade pair
+            send: Function making one API call for a request
+            
+        Returns:
+            SignalResponse object or None if interpretation failed
+            
+        Raises:
+            LLMUnavailableError: LLM down/slow and the local fallback could not help
+        """
+        if not self.circuit_breaker.allow_request():
+            return self._interpret_fallback(message, active_trades, last_trade_pair, "circuit open")
+        
+        request = self._build_request(message, active_trades, system_prompt,
+                                      recent_messages, last_trade_pair)
+        
+        try:
+            # Call Claude with tools (escalating through the model tiers)
+            result = self._run_tiers(request, send)
+        except Exception as e:
+            return self._handle_call_failure(e, message, active_trades, last_trade_pair)
+        
+        return self._finish_call(message, active_trades, last_trade_pair, result, system_prompt)
+    
+    def interpret_message_streaming(self,
+                                    message: str,
+                                    active_trades: Optional[List[Dict[str, Any]]] = None,
+                                    system_prompt: Optional[str] = None,
+                                    recent_messages: Optional[List[str]] = None,
+                                    last_trade_pair: Optional[str] = None,
+                                    on_signal_start: Optional[Callable[[Optional[str], str], None]] = None
+                                    ) -> Optional[SignalResponse]:
+        """
+        Interpret a message while decoding the tool call as it streams in
+        
+        As soon as a report_new_signal call has emitted its action (and pair,
+        if given) on_signal_start(pair, action) is fired once, so the caller
+        can prepare the order while the model is still writing the prices.
+        
+        Args:
+            message: Message text to interpret
+            active_trades: List of active trades for context
+            system_prompt: Custom system prompt (uses default if None)
+            recent_messages: List of recent messages for conversational context
+            last_trade_pair: Most recently executed trade pair
+            on_signal_start: Callback receiving (pair or None, action)
             
         Returns:
             SignalResponse object or None if interpretation failed
+            
+        Raises:
+            LLMUnavailableError: LLM down/slow and the local fallback could not help
         """
         if active_trades is None:
             active_trades = []
         
-        # Build context about active trades
-        context = self._build_context_message(active_trades)
+        result = self._interpret_locally(message, active_trades, last_trade_pair, system_prompt)
+        if result is not None:
+            return result
         
-        # Add recent messages context if available
-        if recent_messages and len(recent_messages) > 0:
-            context += "\n\nRECENT CONVERSATION FOR CONTEXT:\n"
-            for msg in recent_messages:
-                context += f"- {msg}\n"
+        # Only the first tier's stream can trigger speculative preparation
+        callbacks = [on_signal_start]
         
-        # Add last trade context
-        if last_trade_pair:
-            context += f"\n\nMOST RECENT TRADE: {last_trade_pair}\n"
-            context += "(If current message refers to 'the trade' or 'it' without specifying pair, it likely means this one)\n"
+        def send(tier_request: Dict[str, Any]) -> Any:
+            return self._stream_request(tier_request, callbacks.pop() if callbacks else None)
         
-        # Default system prompt if not provided
+        return self.single_flight.do(
+            SingleFlight.key(message, active_trades, last_trade_pair, system_prompt),
+            lambda: self._interpret_remote(message, active_trades, system_prompt,
+                                           recent_messages, last_trade_pair, send)
+        )
+    
+    def _stream_request(self, request: Dict[str, Any],
+                        on_signal_start: Optional[Callable[[Optional[str], str], None]]) -> Any:
+        """
+        Stream one request, firing on_signal_start as soon as pair/action decode
+        
+        Args:
+            request: Request keyword arguments
+            on_signal_start: Callback receiving (pair or None, action)
+            
+        Returns:
+            Final Anthropic message
+        """
+        tool_name = None
+        partial_json = ""
+        fired = False
+        
+        with self.client.messages.stream(**request) as stream:
+            for event in stream:
+                if event.type == "content_block_start" and event.content_block.type == "tool_use":
+                    tool_name = event.content_block.name
+                    partial_json = ""
+                
+                elif (event.type == "content_block_delta"
+                      and event.delta.type == "input_json_delta"):
+                    if fired or tool_name != "report_new_signal" or on_signal_start is None:
+                        continue
+                    
+                    partial_json += event.delta.partial_json
+                    fields = dict(PARTIAL_STRING_FIELD.findall(partial_json))
+                    if fields.get('action', '').upper() in ("BUY", "SELL"):
+                        fired = True
+                        self.logger.info(f"Streaming: early {fields['action'].upper()} "
+                                         f"{fields.get('pair') or '(default pair)'}")
+                        try:
+                            on_signal_start(fields.get('pair'), fields['action'].upper())
+                        except Exception as e:
+                            self.logger.warning(f"Signal start callback failed: {e}")
+            
+            response = stream.get_final_message()
+        
+        return response
+    
+    def _get_batch_tools(self) -> List[Dict[str, Any]]:
+        """
+        Tool definitions for batch requests (each call names the message it answers)
+        
+        Returns:
+            List of tool definitions with a required message_ref field
+        """
+        if self._batch_tools is None:
+            tools = self._create_tools()
+            for tool in tools:
+                schema = tool["input_schema"]
+                schema["properties"] = {
+                    "message_ref": {
+                        "type": "integer",
+                        "description": "Number of the message this result is for"
+                    },
+                    **schema["properties"]
+                }
+                schema["required"] = ["message_ref"] + schema.get("required", [])
+            if self.prompt_caching:
+                tools[-1]["cache_control"] = {"type": "ephemeral"}
+            self._batch_tools = tools
+        return self._batch_tools
+    
+    def _build_batch_request(self,
+                             messages: List[Tuple[Any, str]],
+                             active_trades: List[Dict[str, Any]],
+                             system_prompt: Optional[str],
+                             recent_messages: Optional[List[str]],
+                             last_trade_pair: Optional[str]) -> Dict[str, Any]:
+        """
+        Build one messages.create call interpreting several messages
+        
+        Args:
+            messages: (key, text) pairs, oldest first
+            active_trades: List of active trades for context
+            system_prompt: Custom system prompt (uses default if None)
+            recent_messages: Messages preceding the batch, for conversational context
+            last_trade_pair: Most recently executed trade pair
+            
+        Returns:
+            Request keyword arguments
+        """
+        context, context_tokens = self.context_builder.build(active_trades, recent_messages,
+                                                             last_trade_pair)
         if system_prompt is None:
-            system_prompt = """You are an expert trading signal interpreter. Your job is to analyze messages from a Telegram trading group and determine if they contain valid trading signals.
-
-A valid NEW trading signal must include:
-- Currency pair (e.g., EURUSD, GBPUSD, XAUUSD)
-- Direction (BUY/SELL or LONG/SHORT)
-- Entry price or range
-- Stop Loss (SL)
-- Take Profit (TP)
-
-A MODIFY signal includes instructions like:
-- "Move SL to breakeven"
-- "Close 50% at current price"
-- "Adjust TP to X.XXXX"
+            system_prompt = DEFAULT_SYSTEM_PROMPT
+        
+        numbered = "\n".join(f"[{i}] {text}" for i, (_, text) in enumerate(messages, 1))
+        self.logger.info(f"Interpreting batch of {len(messages)} messages (context ~{context_tokens} tokens)")
+        
+        return {
+            "model": self.model,
+            # Every message gets its own tool call
+            "max_tokens": max(self.max_tokens, BATCH_TOKENS_PER_MESSAGE * len(messages)),
+            "temperature": self.temperature,
+            "system": self._get_system_blocks(system_prompt),
+            "tools": self._get_batch_tools(),
+            "messages": [
+                {
+                    "role": "user",
+                    "content": f"{context}\n\nMissed messages to analyze, oldest first (earlier messages are context for later ones):\n{numbered}\n\nAnalyze each of the {len(messages)} messages and call the appropriate tool exactly once per message, with message_ref set to the message number."
+                }
+            ]
+        }
+    
+    def interpret_batch(self,
+                        messages: List[Tuple[Any, str]],
+                        active_trades: Optional[List[Dict[str, Any]]] = None,
+                        system_prompt: Optional[str] = None,
+                        recent_messages: Optional[List[str]] = None,
+                        last_trade_pair: Optional[str] = None,
+                        batch_size: int = 25) -> Dict[Any, SignalResponse]:
+        """
+        Interpret a backlog of messages with a few batched LLM calls
+        
+        Messages the local stages can answer are returned with those answers and
+        left out of the batches. Messages without a usable answer (failed call,
+        invalid or - with model tiers - low-confidence tool call) are not in the
+        result and should be interpreted individually with interpret_message.
+        
+        Args:
+            messages: (key, text) pairs, oldest first (key is typically the message ID)
+            active_trades: List of active trades for context
+            system_prompt: Custom system prompt (uses default if None)
+            recent_messages: Messages preceding the backlog, for conversational context
+            last_trade_pair: Most recently executed trade pair
+            batch_size: Messages per LLM call
+            
+        Returns:
+            Dictionary of key -> SignalResponse for the messages answered locally or by the LLM
+        """
+        if active_trades is None:
+            active_trades = []
+        
+        results: Dict[Any, SignalResponse] = {}
+        candidates = []
+        for key, text in messages:
+            result = self._interpret_locally(text, active_trades, last_trade_pair, system_prompt)
+            if result is None:
+                candidates.append((key, text))
+            else:
+                results[key] = result
+        answered_locally = len(results)
+        
+        for offset in range(0, len(candidates), batch_size):
+            chunk = candidates[offset:offset + batch_size]
+            if not self.circuit_breaker.allow_request():
+                self.logger.warning("Circuit open - remaining backlog left for individual interpretation")
+                break
+            
+            request = self._build_batch_request(chunk, active_trades, system_prompt,
+                                                recent_messages, last_trade_pair)
+            start = time.perf_counter()
+            try:
+                response = self._create(request)
+            except Exception as e:
+                self.logger.error(f"Batch interpretation failed: {e}")
+                self.circuit_breaker.record_failure(e)
+                self.metrics.record_error(e)
+                break
+            
+            self.circuit_breaker.record_success()
+            self.metrics.record_call(self.model, time.perf_counter() - start, response, None,
+                                     messages=len(chunk))
+            self._log_usage(response)
+            
+            invalid = 0
+            for block in response.content:
+                if block.type != "tool_use":
+                    continue
+                tool_input = dict(block.input)
+                ref = tool_input.pop("message_ref", None)
+                if not isinstance(ref, int) or not 1 <= ref <= len(chunk):
+                    invalid += 1
+                    continue
+                try:
+                    result = decode_tool_call(block.name, tool_input)
+                except ValidationError:
+                    result = None
+                if result is None:
+                    invalid += 1
+                    continue
+                # Doubtful answers go through the individual (tiered) path instead
+                if len(self.model_tiers) > 1 and result.confidence < self.escalation_confidence:
+                    continue
+                results.setdefault(chunk[ref - 1][0], result)
+            
+            if invalid:
+                self.logger.warning(f"Batch returned {invalid} unusable tool calls")
+        
+        self.logger.info(f"Batch interpretation: {len(messages)} messages, {answered_locally} answered locally, "
+                         f"{len(candidates)} sent to the LLM, {len(results) - answered_locally} answered")
+        return results
 
-A CLOSE signal includes instructions like:
-- "Close all positions"
-- "Exit the EUR trade"
-- "Take profit now"
 
-Use the provided tools to report your findings. Always provide your confidence level and reasoning."""
+class AsyncLLMInterpreter(LLMInterpreter):
+    """
+    asyncio-native interpreter that keeps several LLM calls in flight
+    
+    The synchronous interpret_message() is still available; the async variant
+    runs on the event loop with an AsyncAnthropic client and a semaphore
+    bounding the number of concurrent requests. Ordering of the results is the
+    caller's job (see TradingBot.process_message_async).
+    """
+    
+    def __init__(self, api_key: str, max_in_flight: int = 4, **kwargs):
+        """
+        Initialize async LLM interpreter
         
-        # Prepare messages
-        messages = [
-            {
-                "role": "user",
-                "content": f"{context}\n\nNew message to analyze:\n{message}\n\nAnalyze this message and use the appropriate tool to report your findings."
-            }
-        ]
+        Args:
+            api_key: Anthropic API key
+            max_in_flight: Maximum concurrent LLM requests
+            **kwargs: Passed through to LLMInterpreter
+        """
+        super().__init__(api_key=api_key, **kwargs)
+        self.async_client = AsyncAnthropic(**self._client_kwargs)
+        if self.transport is not None:
+            self.async_client = self.transport.wrap_async(self.async_client)
+        self.max_in_flight = max_in_flight
+        self.in_flight = 0
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        # Provider views (for_provider) keep this reference: one limit across all of them
+        self._root = self
+    
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """Create the semaphore lazily so it binds to the running loop"""
+        root = self._root
+        if root._semaphore is None:
+            root._semaphore = asyncio.Semaphore(root.max_in_flight)
+        return root._semaphore
+    
+    async def _create_async(self, request: Dict[str, Any]) -> Any:
+        """
+        Async messages.create, hedged with a duplicate request when it runs slow
+        
+        Args:
+            request: Request keyword arguments
+            
+        Returns:
+            Anthropic messages response (the losing request is cancelled, and so
+            is every request if the caller is cancelled)
+        """
+        if self.hedging is None:
+            return await self.async_client.messages.create(**request)
+        
+        model = request['model']
+        delay = self.hedging.delay(model)
+        start = time.perf_counter()
         
+        primary = asyncio.ensure_future(self.async_client.messages.create(**request))
+        tasks = [primary]
         try:
-            # Call Claude with tools
-            # Sanitize message for logging to avoid Unicode errors on Windows
-            from utils import sanitize_for_logging
-            safe_message = sanitize_for_logging(message, max_length=100)
-            self.logger.info(f"Interpreting message: {safe_message}")
-            
-            response = self.client.messages.create(
-                model=self.model,
-                max_tokens=self.max_tokens,
-                temperature=self.temperature,
-                system=system_prompt,
-                tools=self._create_tools(),
-                messages=messages
-            )
-            
-            # Extract tool use from response
-            tool_use = None
-            for block in response.content:
-                if block.type == "tool_use":
-                    tool_use = block
-                    break
+            if delay is not None:
+                done, _ = await asyncio.wait({primary}, timeout=delay)
             
-            if tool_use is None:
-                self.logger.warning("No tool use found in response")
-                return None
+            if delay is None or done or not self.hedging.try_acquire():
+                response = await primary
+                self.hedging.record(model, time.perf_counter() - start)
+                return response
             
-            # Parse tool response into appropriate schema
-            tool_name = tool_use.name
-            tool_input = tool_use.input
+            self.logger.info(f"Hedging {model}: no answer after {delay * 1000:.0f}ms, sending duplicate")
+            hedge = asyncio.ensure_future(self.async_client.messages.create(**request))
+            tasks.append(hedge)
+            done, _ = await asyncio.wait({primary, hedge}, return_when=asyncio.FIRST_COMPLETED)
             
-            if tool_name == "report_new_signal":
-                result = NewSignal(**tool_input)
-                self.logger.info(f"Detected NEW signal: {result.pair} {result.action}")
-                
-            elif tool_name == "report_modify_signal":
-                result = ModifySignal(**tool_input, signal_type="modify")
-                self.logger.info(f"Detected MODIFY signal: {result.action_type}")
-                
-            elif tool_name == "report_close_signal":
-                result = CloseSignal(**tool_input, signal_type="close")
-                self.logger.info(f"Detected CLOSE signal: {result.action_type}")
-                
-            elif tool_name == "report_no_signal":
-                result = NoSignal(**tool_input, signal_type="none")
-                self.logger.info("No trading signal detected")
+            winner = done.pop()
+            if winner.exception() is not None:
+                # First to finish failed - wait for the other one instead
+                winner = hedge if winner is primary else primary
+                await asyncio.wait({winner})
+            
+            response = winner.result()
+            self.hedging.record(model, time.perf_counter() - start, hedge_won=winner is hedge)
+            return response
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+    
+    async def _run_tiers_async(self, request: Dict[str, Any]) -> Optional[SignalResponse]:
+        """
+        Async counterpart of _run_tiers
+        
+        Args:
+            request: Request keyword arguments from _build_request
             
-            elif tool_name == "report_multiple_actions":
-                result = MultiActionSignal(**tool_input, signal_type="multi_action")
-                action_summary = [a['type'] for a in result.actions]
-                self.logger.info(f"Detected MULTI-ACTION signal: {action_summary}")
+        Returns:
+            Accepted signal, else the last valid low-confidence signal, else None
+        """
+        fallback = None
+        for tier, model in enumerate(self.model_tiers):
+            async with self._get_semaphore():
+                self._root.in_flight += 1
+                try:
+                    start = time.perf_counter()
+                    response = await self._create_async(dict(request, model=model))
+                    latency = time.perf_counter() - start
+                finally:
+                    self._root.in_flight -= 1
             
-            else:
-                self.logger.warning(f"Unknown tool: {tool_name}")
-                return None
+            result, final = self._accept_tier(tier, latency, response)
+            if result is not None:
+                fallback = result
+            if final:
+                break
+        
+        return fallback
+    
+    async def interpret_message_async(self,
+                                      message: str,
+                                      active_trades: Optional[List[Dict[str, Any]]] = None,
+                                      system_prompt: Optional[str] = None,
+                                      recent_messages: Optional[List[str]] = None,
+                                      last_trade_pair: Optional[str] = None) -> Optional[SignalResponse]:
+        """
+        Interpret a telegram message without blocking the event loop
+        
+        Args:
+            message: Message text to interpret
+            active_trades: List of active trades for context
+            system_prompt: Custom system prompt (uses default if None)
+            recent_messages: List of recent messages for conversational context
+            last_trade_pair: Most recently executed trade pair
+            
+        Returns:
+            SignalResponse object or None if interpretation failed
             
+        Raises:
+            LLMUnavailableError: LLM down/slow and the local fallback could not help
+        """
+        if active_trades is None:
+            active_trades = []
+        
+        result = self._interpret_locally(message, active_trades, last_trade_pair, system_prompt)
+        if result is not None:
             return result
+        
+        async def interpret_remote() -> Optional[SignalResponse]:
+            if not self.circuit_breaker.allow_request():
+                return self._interpret_fallback(message, active_trades, last_trade_pair, "circuit open")
             
-        except Exception as e:
-            self.logger.error(f"Error interpreting message: {e}")
-            return None
+            request = self._build_request(message, active_trades, system_prompt,
+                                          recent_messages, last_trade_pair)
+            
+            try:
+                result = await self._run_tiers_async(request)
+            except Exception as e:
+                return self._handle_call_failure(e, message, active_trades, last_trade_pair)
+            
+            return self._finish_call(message, active_trades, last_trade_pair, result, system_prompt)
+        
+        # Forwarded copies arriving while the original is in flight share its request
+        return await self.single_flight.do_async(
+            SingleFlight.key(message, active_trades, last_trade_pair, system_prompt),
+            interpret_remote
+        )
 
 
 # Example usage and testing
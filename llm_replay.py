@@ -0,0 +1,741 @@
+"""
+LLM Replay - Record/replay transport for running the pipeline without the API
+
+Record mode wraps the Anthropic client and appends every request's message
+and tool-use response (plus usage and measured latency) to a compact JSONL
+file. Replay mode answers from that file instead of the network, after a
+synthetic latency, so the whole pipeline can be run and load-tested offline:
+
+    llm:
+      transport:
+        mode: "record"          # live | record | replay
+        file: "data/llm_recording.jsonl"
+
+    python llm_replay.py bench --recording data/llm_recording.jsonl --latency-ms 800
+
+Recorded answers are matched by model and message text (the variable trade
+context is ignored, so a recording stays usable as the trade set changes).
+Messages that were never recorded are answered with report_no_signal.
+"""
+
+import io
+import json
+import copy
+import time
+import random
+import asyncio
+import hashlib
+import logging
+import threading
+from datetime import datetime
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Optional, Dict, Any, List, Tuple
+
+
+# User content is "<context>\n\nNew message to analyze:\n<message>\n\nAnalyze this message..."
+MESSAGE_MARKER = "New message to analyze:\n"
+MESSAGE_END = "\n\nAnalyze this message"
+
+# Streamed tool input is split into chunks of this many characters
+STREAM_CHUNK_CHARS = 24
+
+
+def request_message(request: Dict[str, Any]) -> Tuple[str, str]:
+    """
+    Extract the interpreted message from a messages.create request
+
+    Args:
+        request: Request keyword arguments
+
+    Returns:
+        Tuple of (message text, short hash of the full user content)
+    """
+    content = request['messages'][-1]['content']
+    if not isinstance(content, str):
+        content = json.dumps(content, sort_keys=True)
+
+    message = content
+    start = content.rfind(MESSAGE_MARKER)
+    if start != -1:
+        message = content[start + len(MESSAGE_MARKER):]
+        end = message.rfind(MESSAGE_END)
+        if end != -1:
+            message = message[:end]
+
+    return message, hashlib.sha1(content.encode('utf-8')).hexdigest()[:16]
+
+
+# ============================================================================
+# Record
+# ============================================================================
+
+class _RecordingStream:
+    """Wraps a MessageStream and records its final message"""
+
+    def __init__(self, stream_manager: Any, request: Dict[str, Any], transport: 'RecordingTransport'):
+        self._manager = stream_manager
+        self._request = request
+        self._transport = transport
+        self._stream = None
+        self._start = 0.0
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        self._stream = self._manager.__enter__()
+        return self
+
+    def __exit__(self, *exc_info):
+        return self._manager.__exit__(*exc_info)
+
+    def __iter__(self):
+        return iter(self._stream)
+
+    def get_final_message(self) -> Any:
+        response = self._stream.get_final_message()
+        self._transport.record(self._request, response, time.perf_counter() - self._start)
+        return response
+
+
+class _RecordingMessages:
+    """messages resource that records what the wrapped client answers"""
+
+    def __init__(self, messages: Any, transport: 'RecordingTransport'):
+        self._messages = messages
+        self._transport = transport
+
+    def create(self, **request) -> Any:
+        start = time.perf_counter()
+        response = self._messages.create(**request)
+        self._transport.record(request, response, time.perf_counter() - start)
+        return response
+
+    def stream(self, **request) -> _RecordingStream:
+        return _RecordingStream(self._messages.stream(**request), request, self._transport)
+
+
+class _AsyncRecordingMessages:
+    """Async messages resource that records what the wrapped client answers"""
+
+    def __init__(self, messages: Any, transport: 'RecordingTransport'):
+        self._messages = messages
+        self._transport = transport
+
+    async def create(self, **request) -> Any:
+        start = time.perf_counter()
+        response = await self._messages.create(**request)
+        self._transport.record(request, response, time.perf_counter() - start)
+        return response
+
+
+class RecordingTransport:
+    """
+    Passes calls through to the real client and appends them to a recording
+    """
+
+    def __init__(self, path: str):
+        """
+        Initialize recording transport
+
+        Args:
+            path: JSONL file the recording is appended to
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.logger = logging.getLogger('TradingBot.LLMRecord')
+        self._lock = threading.Lock()
+        self.recorded = 0
+
+    def wrap(self, client: Any) -> Any:
+        """Wrap a synchronous Anthropic client"""
+        return SimpleNamespace(messages=_RecordingMessages(client.messages, self))
+
+    def wrap_async(self, client: Any) -> Any:
+        """Wrap an AsyncAnthropic client"""
+        return SimpleNamespace(messages=_AsyncRecordingMessages(client.messages, self))
+
+    def record(self, request: Dict[str, Any], response: Any, latency: float):
+        """
+        Append one request/response pair
+
+        Args:
+            request: Request keyword arguments
+            response: Anthropic message returned for it
+            latency: Seconds the call took
+        """
+        message, context_hash = request_message(request)
+
+        content = []
+        for block in response.content:
+            if block.type == "tool_use":
+                content.append({'type': 'tool_use', 'name': block.name, 'input': block.input})
+            elif block.type == "text":
+                content.append({'type': 'text', 'text': block.text})
+
+        usage = response.usage
+        entry = {
+            'recorded_at': datetime.now().isoformat(),
+            'model': request['model'],
+            'message': message,
+            'context_hash': context_hash,
+            'content': content,
+            'stop_reason': getattr(response, 'stop_reason', None),
+            'usage': {
+                'input_tokens': usage.input_tokens,
+                'output_tokens': usage.output_tokens,
+                'cache_read_input_tokens': getattr(usage, 'cache_read_input_tokens', 0) or 0,
+                'cache_creation_input_tokens': getattr(usage, 'cache_creation_input_tokens', 0) or 0,
+            },
+            'latency_ms': round(latency * 1000, 1),
+        }
+
+        try:
+            line = json.dumps(entry, ensure_ascii=False, separators=(',', ':'))
+            with self._lock:
+                with open(self.path, 'a', encoding='utf-8') as f:
+                    f.write(line + '\n')
+                self.recorded += 1
+        except Exception as e:
+            self.logger.error(f"Failed to record LLM response: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get recording statistics
+
+        Returns:
+            Dictionary with mode, file and number of calls recorded
+        """
+        return {'mode': 'record', 'file': str(self.path), 'recorded': self.recorded}
+
+
+# ============================================================================
+# Replay
+# ============================================================================
+
+class _ReplayStream:
+    """Replays a recorded answer as a stream of tool-use events"""
+
+    def __init__(self, response: Any, latency: float):
+        self._response = response
+        self._latency = latency
+        self._consumed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def __iter__(self):
+        chunks = []
+        for block in self._response.content:
+            if block.type == "tool_use":
+                raw = json.dumps(block.input)
+                parts = [raw[i:i + STREAM_CHUNK_CHARS] for i in range(0, len(raw), STREAM_CHUNK_CHARS)]
+                chunks.append((block, parts))
+            else:
+                chunks.append((block, [block.text]))
+
+        # ~30% of the latency before the first token, the rest spread over the chunks
+        total_parts = sum(len(parts) for _, parts in chunks) or 1
+        time.sleep(self._latency * 0.3)
+        per_part = self._latency * 0.7 / total_parts
+
+        for index, (block, parts) in enumerate(chunks):
+            yield SimpleNamespace(type="content_block_start", index=index,
+                                  content_block=SimpleNamespace(type=block.type,
+                                                                name=getattr(block, 'name', None)))
+            for part in parts:
+                time.sleep(per_part)
+                if block.type == "tool_use":
+                    delta = SimpleNamespace(type="input_json_delta", partial_json=part)
+                else:
+                    delta = SimpleNamespace(type="text_delta", text=part)
+                yield SimpleNamespace(type="content_block_delta", index=index, delta=delta)
+            yield SimpleNamespace(type="content_block_stop", index=index)
+
+        self._consumed = True
+
+    def get_final_message(self) -> Any:
+        if not self._consumed:
+            for _ in self:
+                pass
+        return self._response
+
+
+class _ReplayMessages:
+    """messages resource answering from a recording"""
+
+    def __init__(self, transport: 'ReplayTransport'):
+        self._transport = transport
+
+    def create(self, **request) -> Any:
+        response, latency = self._transport.answer(request)
+        time.sleep(latency)
+        return response
+
+    def stream(self, **request) -> _ReplayStream:
+        response, latency = self._transport.answer(request)
+        return _ReplayStream(response, latency)
+
+
+class _AsyncReplayMessages:
+    """Async messages resource answering from a recording"""
+
+    def __init__(self, transport: 'ReplayTransport'):
+        self._transport = transport
+
+    async def create(self, **request) -> Any:
+        response, latency = self._transport.answer(request)
+        await asyncio.sleep(latency)
+        return response
+
+
+class ReplayTransport:
+    """
+    Answers LLM calls from a recording, with synthetic latency
+    """
+
+    def __init__(self, path: str, latency_ms: Optional[float] = None, jitter_ms: float = 0.0,
+                 latency_scale: float = 1.0, seed: Optional[int] = None):
+        """
+        Initialize replay transport
+
+        Args:
+            path: JSONL recording written in record mode
+            latency_ms: Fixed latency per call (None = the recorded latency)
+            jitter_ms: Uniform random +/- jitter added to every call
+            latency_scale: Multiplier applied to the latency (0 = answer instantly)
+            seed: Random seed for reproducible jitter
+        """
+        self.path = Path(path)
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.latency_scale = latency_scale
+        self.logger = logging.getLogger('TradingBot.LLMReplay')
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+        self.records: List[Dict[str, Any]] = load_recording(path)
+        # (model, message) -> records, message -> records (any model)
+        self._by_model: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+        self._by_message: Dict[str, List[Dict[str, Any]]] = {}
+        for record in self.records:
+            self._by_model.setdefault((record['model'], record['message']), []).append(record)
+            self._by_message.setdefault(record['message'], []).append(record)
+
+        self.stats = {
+            'calls': 0,
+            'hits': 0,
+            'misses': 0,
+            'simulated_seconds': 0.0,
+        }
+        self.logger.info(f"Loaded {len(self.records)} recorded LLM responses from {path}")
+
+    def wrap(self, client: Any) -> Any:
+        """Replace a synchronous Anthropic client (the client itself is never called)"""
+        return SimpleNamespace(messages=_ReplayMessages(self))
+
+    def wrap_async(self, client: Any) -> Any:
+        """Replace an AsyncAnthropic client (the client itself is never called)"""
+        return SimpleNamespace(messages=_AsyncReplayMessages(self))
+
+    def find(self, request: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Find the recorded answer for a request
+
+        Args:
+            request: Request keyword arguments
+
+        Returns:
+            Best matching record (same context if recorded, else same model,
+            else any model), or None
+        """
+        message, context_hash = request_message(request)
+        candidates = (self._by_model.get((request['model'], message))
+                      or self._by_message.get(message) or [])
+        for record in candidates:
+            if record.get('context_hash') == context_hash:
+                return record
+        return candidates[0] if candidates else None
+
+    def answer(self, request: Dict[str, Any]) -> Tuple[Any, float]:
+        """
+        Build the response for a request and the latency to apply
+
+        Args:
+            request: Request keyword arguments
+
+        Returns:
+            Tuple of (Anthropic-like message, latency in seconds)
+        """
+        record = self.find(request)
+
+        with self._lock:
+            self.stats['calls'] += 1
+            self.stats['hits' if record else 'misses'] += 1
+            jitter = self._random.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0.0
+
+        if record is None:
+            message, _ = request_message(request)
+            self.logger.warning(f"No recorded response for {message[:60]!r} - answering report_no_signal")
+            record = {
+                'content': [{'type': 'tool_use', 'name': 'report_no_signal',
+                             'input': {'confidence': 1.0, 'reasoning': "Not in the replay recording"}}],
+                'stop_reason': 'tool_use',
+                'usage': {},
+                'latency_ms': 0.0,
+            }
+
+        base_ms = self.latency_ms if self.latency_ms is not None else record.get('latency_ms', 0.0)
+        latency = max(0.0, (base_ms + jitter) * self.latency_scale / 1000)
+        with self._lock:
+            self.stats['simulated_seconds'] += latency
+
+        return self._build_response(record, request['model']), latency
+
+    @staticmethod
+    def _build_response(record: Dict[str, Any], model: str) -> Any:
+        """Anthropic-like message object for a record"""
+        content = []
+        for i, block in enumerate(record['content']):
+            if block['type'] == 'tool_use':
+                content.append(SimpleNamespace(type='tool_use', id=f"toolu_replay_{i}",
+                                               name=block['name'], input=copy.deepcopy(block['input'])))
+            else:
+                content.append(SimpleNamespace(type='text', text=block['text']))
+
+        usage = record.get('usage', {})
+        return SimpleNamespace(
+            id="msg_replay",
+            type="message",
+            role="assistant",
+            model=model,
+            content=content,
+            stop_reason=record.get('stop_reason', 'tool_use'),
+            usage=SimpleNamespace(
+                input_tokens=usage.get('input_tokens', 0),
+                output_tokens=usage.get('output_tokens', 0),
+                cache_read_input_tokens=usage.get('cache_read_input_tokens', 0),
+                cache_creation_input_tokens=usage.get('cache_creation_input_tokens', 0),
+            ),
+        )
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get replay statistics
+
+        Returns:
+            Dictionary with recorded responses, calls, hits, misses and simulated latency
+        """
+        with self._lock:
+            stats = dict(self.stats)
+        stats['mode'] = 'replay'
+        stats['file'] = str(self.path)
+        stats['recorded'] = len(self.records)
+        return stats
+
+
+def load_recording(path: str) -> List[Dict[str, Any]]:
+    """
+    Load a recording
+
+    Args:
+        path: JSONL recording
+
+    Returns:
+        Records in recorded order
+    """
+    records = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                records.append(json.loads(line))
+    return records
+
+
+def create_transport(mode: str, path: str, **replay_options) -> Optional[Any]:
+    """
+    Build the transport for a configured mode
+
+    Args:
+        mode: "live", "record" or "replay"
+        path: Recording file
+        **replay_options: ReplayTransport options (latency_ms, jitter_ms, latency_scale, seed)
+
+    Returns:
+        RecordingTransport, ReplayTransport, or None for live
+    """
+    if mode == 'record':
+        return RecordingTransport(path)
+    if mode == 'replay':
+        return ReplayTransport(path, **replay_options)
+    if mode != 'live':
+        raise ValueError(f"Unknown LLM transport mode: {mode}")
+    return None
+
+
+# ============================================================================
+# Offline pipeline benchmark
+# ============================================================================
+
+class PaperMT5Client:
+    """
+    In-memory stand-in for MT5Client used by the offline benchmark
+
+    Every order fills at the current paper price; prices are set by the
+    benchmark from the recorded signals so the trade handlers' price checks
+    see realistic values.
+    """
+
+    def __init__(self):
+        self.prices: Dict[str, float] = {}
+        self.positions: Dict[int, Dict[str, Any]] = {}
+        self.orders: Dict[int, Dict[str, Any]] = {}
+        self._next_ticket = 1000
+
+    def _ticket(self) -> int:
+        self._next_ticket += 1
+        return self._next_ticket
+
+    def check_connection(self) -> bool:
+        return True
+
+    def get_symbol_info(self, symbol: str) -> Optional[Dict[str, Any]]:
+        price = self.prices.get(symbol, 0.0)
+        digits = 2 if price > 100 else 5
+        return {'name': symbol, 'bid': price, 'ask': price, 'spread': 0, 'digits': digits,
+                'point': 10 ** -digits, 'trade_contract_size': 100000, 'volume_min': 0.01,
+                'volume_max': 100.0, 'volume_step': 0.01}
+
+    def prepare_market_order(self, *args, **kwargs) -> Optional[Dict[str, Any]]:
+        return None
+
+    def place_market_order(self, symbol: str, order_type: str, lot_size: float,
+                           stop_loss: float = 0.0, take_profit: float = 0.0, **kwargs) -> Tuple[bool, Optional[int], str]:
+        ticket = self._ticket()
+        self.positions[ticket] = {'ticket': ticket, 'symbol': symbol, 'type': order_type,
+                                  'volume': lot_size, 'open_price': self.prices.get(symbol, 0.0),
+                                  'current_price': self.prices.get(symbol, 0.0),
+                                  'sl': stop_loss, 'tp': take_profit, 'profit': 0.0,
+                                  'magic': 0, 'comment': 'paper'}
+        return True, ticket, "Paper order filled"
+
+    def place_pending_order(self, symbol: str, order_type: str, lot_size: float, entry_price: float,
+                            stop_loss: float = 0.0, take_profit: float = 0.0,
+                            comment: str = "") -> Tuple[bool, Optional[int], str]:
+        ticket = self._ticket()
+        self.orders[ticket] = {'ticket': ticket, 'symbol': symbol, 'type': order_type,
+                               'volume': lot_size, 'entry_price': entry_price,
+                               'current_price': self.prices.get(symbol, 0.0), 'sl': stop_loss,
+                               'tp': take_profit, 'magic': 0, 'comment': comment, 'time_setup': 0}
+        return True, ticket, "Paper pending order placed"
+
+    def determine_pending_order_type(self, action: str, entry_price: float, symbol: str) -> Optional[str]:
+        price = self.prices.get(symbol, 0.0)
+        if entry_price == price:
+            return None
+        below = entry_price < price
+        if action.upper() == "BUY":
+            return "BUY_LIMIT" if below else "BUY_STOP"
+        return "SELL_STOP" if below else "SELL_LIMIT"
+
+    def modify_order(self, ticket: int, stop_loss: Optional[float] = None,
+                     take_profit: Optional[float] = None) -> Tuple[bool, str]:
+        position = self.positions.get(ticket)
+        if position is None:
+            return False, f"Position {ticket} not found"
+        if stop_loss is not None:
+            position['sl'] = stop_loss
+        if take_profit is not None:
+            position['tp'] = take_profit
+        return True, "Paper position modified"
+
+    def close_order(self, ticket: int, volume: Optional[float] = None,
+                    deviation: int = 5) -> Tuple[bool, Optional[float], str]:
+        position = self.positions.get(ticket)
+        if position is None:
+            return False, None, f"Position {ticket} not found"
+        if volume is None or volume >= position['volume']:
+            del self.positions[ticket]
+        else:
+            position['volume'] -= volume
+        return True, self.prices.get(position['symbol'], 0.0), "Paper position closed"
+
+    def cancel_pending_order(self, ticket: int) -> bool:
+        return self.orders.pop(ticket, None) is not None
+
+    def check_ticket_exists(self, ticket: int) -> Tuple[bool, str]:
+        if ticket in self.positions:
+            return True, 'position'
+        if ticket in self.orders:
+            return True, 'pending'
+        return False, 'none'
+
+    def get_open_positions(self) -> List[Dict[str, Any]]:
+        return list(self.positions.values())
+
+    def get_position_by_ticket(self, ticket: int) -> Optional[Dict[str, Any]]:
+        return self.positions.get(ticket)
+
+    def get_pending_orders(self) -> List[Dict[str, Any]]:
+        return list(self.orders.values())
+
+
+def _paper_price(record: Optional[Dict[str, Any]]) -> Optional[Tuple[str, float]]:
+    """Pair and plausible market price for a recorded new signal"""
+    for block in (record or {}).get('content', []):
+        if block.get('type') == 'tool_use' and block.get('name') == 'report_new_signal':
+            signal = block['input']
+            pair = signal.get('pair') or 'XAUUSD'
+            if signal.get('entry_price'):
+                return pair, signal['entry_price']
+            if signal.get('stop_loss') and signal.get('take_profit'):
+                return pair, (signal['stop_loss'] + signal['take_profit']) / 2
+    return None
+
+
+def run_benchmark(config_path: str, recording: str, latency_ms: Optional[float], jitter_ms: float,
+                  latency_scale: float, repeat: int, use_async: bool) -> Dict[str, Any]:
+    """
+    Drive TradingBot.process_message over every recorded message
+
+    Args:
+        config_path: Bot configuration
+        recording: Recording to replay
+        latency_ms: Fixed synthetic latency (None = recorded latencies)
+        jitter_ms: Random +/- jitter per call
+        latency_scale: Latency multiplier
+        repeat: Passes over the recording
+        use_async: Use the async pipeline (messages in flight concurrently)
+
+    Returns:
+        Dictionary with throughput and per-message latency statistics
+    """
+    import os
+    import tempfile
+    from contextlib import redirect_stdout
+    from main import TradingBot
+    from trade_manager import TradeManager, ExecutionGuard
+    from llm import percentile
+
+    records = load_recording(recording)
+    if not records:
+        raise ValueError(f"Recording {recording} is empty")
+
+    bot = TradingBot(config_path)
+    llm_config = bot.config.config.setdefault('llm', {})
+    llm_config['transport'] = {'mode': 'replay', 'file': recording, 'latency_ms': latency_ms,
+                               'jitter_ms': jitter_ms, 'latency_scale': latency_scale, 'seed': 0}
+    llm_config.setdefault('async_interpreter', {})['enabled'] = use_async
+    # Benchmark runs never write to the real training log / trade history
+    workdir = tempfile.mkdtemp(prefix='replay_bench_')
+    llm_config.setdefault('noise_filter', {})['training_log'] = os.path.join(workdir, 'message_log.jsonl')
+    llm_config.setdefault('noise_filter', {})['drop_log'] = os.path.join(workdir, 'noise_drops.jsonl')
+
+    with redirect_stdout(io.StringIO()):
+        bot.trade_manager = TradeManager(storage_file=os.path.join(workdir, 'trades.json'))
+        # Repeated passes re-send identical messages - let every pass execute
+        bot.execution_guard = ExecutionGuard(
+            window_seconds=bot.config.get('risk.duplicate_signal_window_seconds', 60) if repeat == 1 else 0)
+        if not bot._setup_llm():
+            raise RuntimeError("LLM interpreter could not be set up")
+    paper = PaperMT5Client()
+    bot.mt5_client = paper
+    bot.is_running = True
+
+    messages = []
+    for n in range(repeat):
+        for i, record in enumerate(records):
+            messages.append(({'text': record['message'], 'message_id': n * len(records) + i,
+                              'sender_name': 'replay'}, _paper_price(record)))
+
+    latencies: List[float] = []
+
+    def timed(message_data, price):
+        if price:
+            paper.prices[price[0]] = price[1]
+        start = time.perf_counter()
+        bot.process_message(message_data)
+        latencies.append(time.perf_counter() - start)
+
+    async def run_async():
+        async def timed_async(message_data, price):
+            if price:
+                paper.prices[price[0]] = price[1]
+            start = time.perf_counter()
+            await bot.process_message_async(message_data)
+            latencies.append(time.perf_counter() - start)
+        # Tasks start in arrival order, like Telegram's handler
+        await asyncio.gather(*(timed_async(data, price) for data, price in messages))
+
+    wall_start = time.perf_counter()
+    with redirect_stdout(io.StringIO()):
+        if use_async:
+            asyncio.run(run_async())
+        else:
+            for message_data, price in messages:
+                timed(message_data, price)
+    wall = time.perf_counter() - wall_start
+
+    return {
+        'messages': len(messages),
+        'wall_seconds': wall,
+        'throughput': len(messages) / wall if wall else 0.0,
+        'p50_ms': percentile(latencies, 50) * 1000,
+        'p95_ms': percentile(latencies, 95) * 1000,
+        'max_ms': max(latencies) * 1000,
+        'trades_opened': len(bot.trade_manager.trades),
+        'replay': bot.llm_interpreter.transport.get_stats(),
+    }
+
+
+# Offline benchmark
+if __name__ == "__main__":
+    import argparse
+
+    logging.basicConfig(level=logging.WARNING)
+
+    parser = argparse.ArgumentParser(description="Record/replay LLM transport tools")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    bench = subparsers.add_parser('bench', help="Replay a recording through TradingBot.process_message")
+    bench.add_argument('--recording', default='data/llm_recording.jsonl')
+    bench.add_argument('--config', default='config.yaml')
+    bench.add_argument('--latency-ms', type=float, default=None, help="Fixed latency (default: recorded)")
+    bench.add_argument('--jitter-ms', type=float, default=0.0)
+    bench.add_argument('--latency-scale', type=float, default=1.0)
+    bench.add_argument('--repeat', type=int, default=1, help="Passes over the recording")
+    bench.add_argument('--async', dest='use_async', action='store_true', help="Use the async pipeline")
+
+    info = subparsers.add_parser('info', help="Summarise a recording")
+    info.add_argument('--recording', default='data/llm_recording.jsonl')
+
+    args = parser.parse_args()
+
+    if args.command == 'info':
+        records = load_recording(args.recording)
+        tools: Dict[str, int] = {}
+        for record in records:
+            for block in record['content']:
+                if block['type'] == 'tool_use':
+                    tools[block['name']] = tools.get(block['name'], 0) + 1
+        latencies = [record.get('latency_ms', 0.0) for record in records]
+        print(f"{len(records)} recorded calls, {len({r['message'] for r in records})} distinct messages")
+        if latencies:
+            print(f"Recorded latency: mean {sum(latencies) / len(latencies):.0f}ms, max {max(latencies):.0f}ms")
+        for name, count in sorted(tools.items(), key=lambda t: -t[1]):
+            print(f"  {name}: {count}")
+    else:
+        result = run_benchmark(args.config, args.recording, args.latency_ms, args.jitter_ms,
+                               args.latency_scale, args.repeat, args.use_async)
+        pipeline = "async" if args.use_async else "sync"
+        print(f"Replayed {result['messages']} messages ({pipeline} pipeline) in {result['wall_seconds']:.2f}s")
+        print(f"  Throughput: {result['throughput']:.1f} messages/s")
+        print(f"  Per message: p50 {result['p50_ms']:.0f}ms, p95 {result['p95_ms']:.0f}ms, "
+              f"max {result['max_ms']:.0f}ms")
+        replay = result['replay']
+        print(f"  LLM calls: {replay['calls']} ({replay['misses']} not in recording), "
+              f"simulated latency {replay['simulated_seconds']:.1f}s")
+        print(f"  Paper trades opened: {result['trades_opened']}")
@@ -4,11 +4,16 @@ Main Trading Bot - Orchestrates Telegram, LLM, and MT5 integration with REPL int
 
 import os
 import sys
+import asyncio
 import threading
 import time
+import re
+import json
 import logging
-from datetime import datetime
-from typing import Optional, Dict, Any
+from collections import deque
+from datetime import datetime, timezone, timedelta
+from typing import Optional, Dict, Any, List, Tuple
+from pathlib import Path
 from getpass import getpass
 
 # Fix for Windows Unicode/emoji handling in console
@@ -27,10 +32,33 @@ if sys.platform == 'win32':
 
 # Import our modules
 from utils import Config, setup_logging, colorize, print_trade_summary, validate_lot_size, calculate_risk_reward
-from trade_manager import TradeManager, TradeStatus
+from trade_manager import TradeManager, TradeStatus, ExecutionGuard, DEFAULT_PARTIAL_SCHEDULE
 from mt5 import MT5Client
-from llm import LLMInterpreter, NewSignal, ModifySignal, CloseSignal, NoSignal, MultiActionSignal
-from telegram import TelegramClient
+from llm import LLMInterpreter, AsyncLLMInterpreter, InterpretationCache, HedgingPolicy, CircuitBreaker, CallMetrics, LLMUnavailableError, DEFAULT_SYSTEM_PROMPT, NewSignal, ModifySignal, CloseSignal, NoSignal, MultiActionSignal
+from signal_parser import FastSignalParser
+from noise_filter import NoiseFilter, ALWAYS_FORWARD_PATTERN
+from context_builder import ContextBuilder
+from few_shot import FewShotSelector
+from template_miner import TemplateLibrary
+from llm_replay import create_transport
+from telegram import TelegramClient, PRIORITY_NOISE, PRIORITY_NORMAL, PRIORITY_CRITICAL
+from providers import Provider, load_providers, current_provider, in_provider_context, run_as
+from coalescer import BurstCoalescer, Burst
+
+
+# Follow-ups managing open trades (never dropped when a chat queue is full)
+TRADE_MANAGEMENT_PATTERN = re.compile(
+    r'\b(?:CLOSE|CLOSED|EXIT|CUT|BE|BREAKEVEN|BREAK\s+EVEN|PARTIALS?|MOVE|SECURE|CANCEL|DELETE)\b'
+)
+# SL/TP without a direction completes or modifies a trade rather than opening one
+LEVEL_PATTERN = re.compile(r'\b(?:SL|TP\d?|S/L|T/P)\b')
+DIRECTION_PATTERN = re.compile(r'\b(?:BUY|SELL|LONG|SHORT)\b')
+
+
+def _provider_state(name: str) -> property:
+    """Bot attribute stored on the provider of the message being processed"""
+    return property(lambda self: getattr(self.provider, name),
+                    lambda self, value: setattr(self.provider, name, value))
 
 
 class TradingBot:
@@ -38,6 +66,19 @@ class TradingBot:
     Main trading bot orchestrator that coordinates all components
     """
     
+    # Conversational context (recent messages, last pair) and message correlation
+    # for merging signals are kept per signal provider
+    recent_messages = _provider_state('recent_messages')
+    last_executed_pair = _provider_state('last_executed_pair')
+    last_signal_time = _provider_state('last_signal_time')
+    last_signal_timestamp = _provider_state('last_signal_timestamp')
+    last_signal_pair = _provider_state('last_signal_pair')
+    last_signal_action = _provider_state('last_signal_action')
+    last_signal_had_sltp = _provider_state('last_signal_had_sltp')
+    last_entry_trade_id = _provider_state('last_entry_trade_id')
+    # Async pipeline: future resolved when the provider's latest message has been committed
+    _commit_tail = _provider_state('commit_tail')
+    
     def __init__(self, config_path: str = "config.yaml"):
         """
         Initialize the trading bot
@@ -55,27 +96,79 @@ class TradingBot:
         self.telegram_client: Optional[TelegramClient] = None
         self.mt5_client: Optional[MT5Client] = None
         self.llm_interpreter: Optional[LLMInterpreter] = None
+        self.noise_filter: Optional[NoiseFilter] = None
+        self.coalescer: Optional[BurstCoalescer] = None
         self.trade_manager: Optional[TradeManager] = None
+        self.execution_guard: Optional[ExecutionGuard] = None
         
         # State
         self.is_running = False
         self.is_paused = False
         self.selected_chat_id: Optional[int] = None
         
-        # Conversational context
-        self.recent_messages = []  # Store last 5 messages for context
+        self.selected_chat_ids: List[int] = []
+        
+        # Signal providers by chat (empty = single interactively selected chat,
+        # served by the default provider)
+        self.providers: Dict[int, Provider] = {}
+        self.default_provider = Provider(chat_id=None, name='default')
         self.max_context_messages = 5
-        self.last_executed_pair: Optional[str] = None
-        self.last_signal_time: Optional[str] = None
         
-        # Message correlation for merging signals
-        self.last_signal_timestamp: Optional[datetime] = None
-        self.last_signal_pair: Optional[str] = None
-        self.last_signal_action: Optional[str] = None
-        self.last_signal_had_sltp: bool = True
+        # Providers are interpreted concurrently; trade execution is serialized
+        self._execution_lock = threading.RLock()
+        
+        # Message the signal being executed replies to (set under the execution lock)
+        self._reply_to_msg_id: Optional[int] = None
+        
+        # Messages that could not be interpreted while the LLM was down
+        self.deferred_messages: deque = deque()
+        self._deferred_lock = threading.Lock()
+        
+        # Catch-up of messages missed while offline / disconnected
+        self._catch_up_lock = threading.Lock()
+        
+        # Streaming mode: orders prepared while the LLM is still decoding, keyed by (pair, action)
+        self.streaming_enabled = False
+        self._speculative_orders: Dict[Tuple[str, str], Tuple[float, Dict[str, Any]]] = {}
+        self._speculative_lock = threading.Lock()
+        
+        # Verify-after-execute: fast-path entries run at once, the LLM confirms them afterwards
+        self.verify_after_execute = False
+        self.verification_stats = {'verified': 0, 'agreed': 0, 'corrected': 0, 'unwound': 0, 'unverified': 0}
+        self._verification_lock = threading.Lock()
         
         self.logger.info("Trading Bot initialized")
     
+    @property
+    def provider(self) -> Provider:
+        """Provider of the message being processed (default provider outside the pipeline)"""
+        return current_provider.get() or self.default_provider
+    
+    @property
+    def interpreter(self) -> LLMInterpreter:
+        """Interpreter for the current provider (its defaults, shared client and caches)"""
+        return self.provider.interpreter or self.llm_interpreter
+    
+    def provider_for(self, message_data: Dict[str, Any]) -> Provider:
+        """
+        Provider that sent a message
+        
+        Args:
+            message_data: Message dictionary from Telegram
+        
+        Returns:
+            Configured provider of the message's chat, else the default provider
+        """
+        return self.providers.get(message_data.get('chat_id'), self.default_provider)
+    
+    def _default_lot_size(self) -> float:
+        """Lot size for signals without one (provider setting, else risk.default_lot_size)"""
+        return self.provider.default_lot_size or self.config.get('risk.default_lot_size', 0.1)
+    
+    def _system_prompt(self) -> Optional[str]:
+        """System prompt for the current provider (provider setting, else llm.system_prompt)"""
+        return self.provider.system_prompt or self.config.get('llm.system_prompt')
+    
     def startup(self) -> bool:
         """
         Startup sequence: connect to Telegram and MT5
@@ -96,19 +189,22 @@ class TradingBot:
         active_count = len(self.trade_manager.get_active_trades())
         print(f"✓ Trade Manager initialized ({active_count} active trades)")
         
-        # Initialize LLM
-        print("\n[2/4] Initializing LLM Interpreter...")
-        if not self.config.anthropic_api_key:
-            print("✗ ANTHROPIC_API_KEY not found in environment")
+        # Signal providers (chats) followed by this process
+        try:
+            self.providers = {p.chat_id: p for p in load_providers(self.config.get('providers'))}
+        except ValueError as e:
+            print(f"✗ Invalid providers configuration: {e}")
             return False
         
-        self.llm_interpreter = LLMInterpreter(
-            api_key=self.config.anthropic_api_key,
-            model=self.config.get('llm.model'),
-            temperature=self.config.get('llm.temperature'),
-            max_tokens=self.config.get('llm.max_tokens')
+        # Re-deliveries of a message / forwarded copies of an entry never execute twice
+        self.execution_guard = ExecutionGuard(
+            window_seconds=self.config.get('risk.duplicate_signal_window_seconds', 60)
         )
-        print(f"✓ LLM initialized (model: {self.config.get('llm.model')})")
+        
+        # Initialize LLM
+        print("\n[2/4] Initializing LLM Interpreter...")
+        if not self._setup_llm():
+            return False
         
         # Connect to Telegram
         print("\n[3/4] Connecting to Telegram...")
@@ -126,6 +222,173 @@ class TradingBot:
         
         return True
     
+    def _setup_llm(self) -> bool:
+        """Setup the LLM interpreter and the local stages around it"""
+        # Record API calls to a file, or answer from one instead of the network
+        transport_mode = self.config.get('llm.transport.mode', 'live')
+        try:
+            transport = create_transport(
+                transport_mode,
+                self.config.get('llm.transport.file', 'data/llm_recording.jsonl'),
+                **({
+                    'latency_ms': self.config.get('llm.transport.latency_ms'),
+                    'jitter_ms': self.config.get('llm.transport.jitter_ms', 0),
+                    'latency_scale': self.config.get('llm.transport.latency_scale', 1.0),
+                    'seed': self.config.get('llm.transport.seed')
+                } if transport_mode == 'replay' else {})
+            )
+        except (OSError, ValueError) as e:
+            print(f"✗ LLM transport setup failed: {e}")
+            return False
+        
+        api_key = self.config.anthropic_api_key
+        if not api_key:
+            if transport_mode != 'replay':
+                print("✗ ANTHROPIC_API_KEY not found in environment")
+                return False
+            # Replay never reaches the API
+            api_key = 'replay'
+        
+        # Deterministic parser for routine formats (skips the LLM round trip)
+        fast_parser = None
+        if self.config.get('llm.fast_parser.enabled', True):
+            fast_parser = FastSignalParser(
+                default_pair=self.config.get('llm.fast_parser.default_pair', 'XAUUSD'),
+                confidence=self.config.get('llm.fast_parser.confidence', 0.9),
+                max_length=self.config.get('llm.fast_parser.max_length', 200)
+            )
+        
+        # Cache for reposted messages ("SET BE", "Take partials", ...)
+        result_cache = None
+        if self.config.get('llm.result_cache.enabled', True):
+            result_cache = InterpretationCache(
+                max_size=self.config.get('llm.result_cache.max_size', 256),
+                ttl_seconds=self.config.get('llm.result_cache.ttl_seconds', 600)
+            )
+        
+        # Local index over llm.examples - only similar examples are sent
+        example_selector = None
+        if self.config.get('llm.few_shot.enabled', True) and self.config.get('llm.examples'):
+            example_selector = FewShotSelector(
+                examples=self.config.get('llm.examples'),
+                k=self.config.get('llm.few_shot.k', 2),
+                min_similarity=self.config.get('llm.few_shot.min_similarity', 0.1)
+            )
+        
+        # Extractors mined offline from the provider's recurring formats
+        template_library = None
+        if self.config.get('llm.templates.enabled', True):
+            template_library = TemplateLibrary(
+                path=self.config.get('llm.templates.file', 'data/templates.json'),
+                max_confidence=self.config.get('llm.templates.max_confidence', 0.95)
+            )
+        
+        interpreter_kwargs = dict(
+            api_key=api_key,
+            model=self.config.get('llm.model'),
+            temperature=self.config.get('llm.temperature'),
+            max_tokens=self.config.get('llm.max_tokens'),
+            fast_parser=fast_parser,
+            prompt_caching=self.config.get('llm.prompt_caching', True),
+            result_cache=result_cache,
+            context_builder=ContextBuilder(
+                token_budget=self.config.get('llm.context.token_budget', 600)
+            ),
+            example_selector=example_selector,
+            template_library=template_library,
+            request_timeout=self.config.get('llm.resilience.request_timeout', 15),
+            max_retries=self.config.get('llm.resilience.max_retries', 0),
+            circuit_breaker=CircuitBreaker(
+                failure_threshold=self.config.get('llm.resilience.failure_threshold', 3),
+                cooldown_seconds=self.config.get('llm.resilience.cooldown_seconds', 30)
+            ),
+            transport=transport,
+            metrics=CallMetrics(
+                window=self.config.get('llm.metrics.window', 1000),
+                pricing=self.config.get('llm.metrics.pricing')
+            )
+        )
+        
+        # Fastest model first, escalate on low confidence / invalid tool payloads
+        if self.config.get('llm.tiers.enabled', False):
+            interpreter_kwargs['model_tiers'] = self.config.get('llm.tiers.models') or [self.config.get('llm.model')]
+            interpreter_kwargs['escalation_confidence'] = self.config.get('llm.tiers.escalation_confidence', 0.7)
+        
+        # Duplicate requests that are slower than usual (tail latency = missed entries)
+        if self.config.get('llm.hedging.enabled', False):
+            interpreter_kwargs['hedging'] = HedgingPolicy(
+                percentile=self.config.get('llm.hedging.percentile', 95),
+                min_samples=self.config.get('llm.hedging.min_samples', 20),
+                min_delay=self.config.get('llm.hedging.min_delay_ms', 500) / 1000,
+                max_ratio=self.config.get('llm.hedging.max_ratio', 0.1),
+                max_per_minute=self.config.get('llm.hedging.max_per_minute', 6)
+            )
+        
+        if self.config.get('llm.async_interpreter.enabled', False):
+            self.llm_interpreter = AsyncLLMInterpreter(
+                max_in_flight=self.config.get('llm.async_interpreter.max_in_flight', 4),
+                **interpreter_kwargs
+            )
+        else:
+            self.llm_interpreter = LLMInterpreter(**interpreter_kwargs)
+        print(f"✓ LLM initialized (model: {' → '.join(self.llm_interpreter.model_tiers)})")
+        if isinstance(self.llm_interpreter, AsyncLLMInterpreter):
+            print(f"✓ Async interpreter enabled ({self.llm_interpreter.max_in_flight} requests in flight)")
+        if fast_parser:
+            print("✓ Fast-path signal parser enabled")
+        if example_selector:
+            print(f"✓ Few-shot retrieval enabled ({len(example_selector.examples)} examples, top {example_selector.k})")
+        if template_library and template_library.templates:
+            print(f"✓ Mined message templates loaded ({len(template_library.templates)} formats)")
+        if transport_mode == 'record':
+            print(f"✓ Recording LLM responses to {transport.path}")
+        elif transport_mode == 'replay':
+            print(colorize(f"⚠ Replaying {len(transport.records)} recorded LLM responses - no API calls", 'yellow'))
+        
+        # Each provider interprets through its own view (own caches, default pair, prompt)
+        for provider in self.providers.values():
+            provider.interpreter = self.llm_interpreter.for_provider(provider.default_pair)
+            if provider.default_pair:
+                prompt = provider.system_prompt or self.config.get('llm.system_prompt') or DEFAULT_SYSTEM_PROMPT
+                provider.system_prompt = (f"{prompt}\n\nThis provider trades {provider.default_pair} by default: "
+                                          f"a new signal that names no pair is for {provider.default_pair}.")
+        if self.providers:
+            print(f"✓ {len(self.providers)} signal providers configured")
+        
+        # Local pre-classifier that drops obvious commentary before the LLM
+        if self.config.get('llm.noise_filter.enabled', True):
+            self.noise_filter = NoiseFilter(
+                threshold=self.config.get('llm.noise_filter.threshold', 0.2),
+                model_path=self.config.get('llm.noise_filter.model_file', 'data/noise_model.json'),
+                drop_log=self.config.get('llm.noise_filter.drop_log', 'logs/noise_drops.jsonl'),
+                training_log=self.config.get('llm.noise_filter.training_log', 'data/message_log.jsonl')
+            )
+            model_note = "trained model" if self.noise_filter.model_loaded else "built-in weights"
+            print(f"✓ Noise pre-filter enabled (threshold {self.noise_filter.threshold}, {model_note})")
+        
+        # Streaming decode only applies to the synchronous pipeline
+        self.streaming_enabled = (self.config.get('llm.streaming.enabled', False) and
+                                  not isinstance(self.llm_interpreter, AsyncLLMInterpreter))
+        if self.streaming_enabled:
+            print("✓ Streaming decode with speculative order preparation enabled")
+        
+        # Confident fast-path market entries don't wait for the LLM - it reconciles afterwards
+        self.verify_after_execute = (self.config.get('llm.verify_after_execute.enabled', False) and
+                                     fast_parser is not None)
+        if self.verify_after_execute:
+            print("✓ Verify-after-execute enabled (fast-path entries confirmed by the LLM)")
+        
+        # SL/TP fragments following an entry are merged into one modification
+        if self.config.get('app.burst_coalescing.enabled', False) and fast_parser is not None:
+            self.coalescer = BurstCoalescer(
+                on_flush=self._apply_burst,
+                window_seconds=self.config.get('app.burst_coalescing.window_seconds', 3),
+                max_wait_seconds=self.config.get('app.burst_coalescing.max_wait_seconds', 10)
+            )
+            print(f"✓ Burst coalescing enabled (SL/TP fragments merged within {self.coalescer.window_seconds:g}s)")
+        
+        return True
+    
     def _setup_telegram(self) -> bool:
         """Setup Telegram connection and select group"""
         # Get credentials from config
@@ -143,7 +406,12 @@ class TradingBot:
         
         # Create client
         try:
-            self.telegram_client = TelegramClient(api_id, api_hash, phone)
+            self.telegram_client = TelegramClient(
+                api_id, api_hash, phone,
+                queue_size=self.config.get('app.message_queue.max_size', 100),
+                sender_cache_size=self.config.get('app.sender_cache_size', 500),
+                watermark_file=self.config.get('app.catch_up.watermark_file', 'data/watermarks.json')
+            )
         except Exception as e:
             print(f"✗ Failed to create Telegram client: {e}")
             return False
@@ -162,7 +430,7 @@ class TradingBot:
         return True
     
     def _select_group(self) -> bool:
-        """Display groups and let user select one"""
+        """Display groups and let user select one (or use the configured providers)"""
         print("\nFetching your chats/groups...")
         dialogs = self.telegram_client.get_dialogs()
         
@@ -170,6 +438,9 @@ class TradingBot:
             print("✗ No chats found")
             return False
         
+        if self.providers:
+            return self._select_provider_chats(dialogs)
+        
         # Filter to show only groups and channels
         groups = [d for d in dialogs if d['type'] in ['Group', 'Supergroup', 'Channel']]
         
@@ -192,6 +463,7 @@ class TradingBot:
                 if 0 <= index < len(groups):
                     selected_group = groups[index]
                     self.selected_chat_id = selected_group['id']
+                    self.selected_chat_ids = [self.selected_chat_id]
                     print(f"\n✓ Selected: {selected_group['title']}")
                     return True
                 else:
@@ -202,6 +474,34 @@ class TradingBot:
                 print("\n\nSetup cancelled")
                 return False
     
+    def _select_provider_chats(self, dialogs: List[Dict[str, Any]]) -> bool:
+        """
+        Check the configured providers' chats against the account's dialogs
+        
+        Args:
+            dialogs: Dialogs from Telegram
+            
+        Returns:
+            True if every provider chat was found
+        """
+        titles = {d['id']: d['title'] for d in dialogs}
+        missing = [p for p in self.providers.values() if p.chat_id not in titles]
+        
+        print(f"\nSignal providers ({len(self.providers)}):\n")
+        for provider in self.providers.values():
+            if provider.chat_id in titles:
+                print(f"  ✓ {provider.name}: {titles[provider.chat_id]} ({provider.chat_id})")
+            else:
+                print(colorize(f"  ✗ {provider.name}: chat {provider.chat_id} not found in your dialogs", 'red'))
+        
+        if missing:
+            print("✗ Fix the chat IDs in the providers section of config.yaml")
+            return False
+        
+        self.selected_chat_ids = list(self.providers)
+        self.selected_chat_id = self.selected_chat_ids[0]
+        return True
+    
     def _setup_mt5(self) -> bool:
         """Setup MT5 connection"""
         # Get credentials
@@ -228,92 +528,893 @@ class TradingBot:
             print("✗ Invalid account number")
             return False
         
-        if not self.mt5_client.login(account, password, server):
-            print("✗ Failed to login to MT5")
-            return False
+        if not self.mt5_client.login(account, password, server):
+            print("✗ Failed to login to MT5")
+            return False
+        
+        # Display account info
+        account_info = self.mt5_client.get_account_info()
+        if account_info:
+            print(f"✓ Connected to MT5")
+            print(f"  Balance: {account_info['balance']} {account_info['currency']}")
+            print(f"  Equity: {account_info['equity']} {account_info['currency']}")
+            print(f"  Server: {account_info['server']}")
+        
+        return True
+    
+    def start_listening(self):
+        """Start listening to Telegram messages"""
+        if not self.telegram_client or not self.selected_chat_id:
+            self.logger.error("Telegram not properly configured")
+            return
+        
+        # Set message callback (async pipeline runs directly on the Telegram event loop)
+        # Each chat has a bounded queue; the sync pipeline handles one message at a time
+        if isinstance(self.llm_interpreter, AsyncLLMInterpreter):
+            self.telegram_client.set_message_callback(
+                self.process_message_async,
+                max_concurrent=self.config.get('app.message_queue.max_concurrent',
+                                               self.llm_interpreter.max_in_flight)
+            )
+        else:
+            self.telegram_client.set_message_callback(self.process_message)
+        self.telegram_client.set_priority_classifier(self.classify_message_priority)
+        
+        # Messages sent while the bot was offline (client loop not running yet),
+        # from each chat's last processed message on
+        if self.config.get('app.process_historical', False):
+            self.catch_up(min_ids=self.telegram_client.get_watermarks(), reason="startup")
+        
+        # Start listening
+        self.telegram_client.set_reconnect_callback(self._on_telegram_reconnect)
+        self.telegram_client.start_listening(self.selected_chat_ids)
+        
+        # Start TP monitoring thread
+        self.start_tp_monitor()
+        
+        self.is_running = True
+        
+        # Retry messages deferred while the LLM was unavailable
+        self.start_deferred_retry()
+        
+        self.logger.info("Started listening to messages")
+    
+    def process_message(self, message_data: Dict[str, Any], replay: bool = False):
+        """
+        Main message processing pipeline
+        
+        Args:
+            message_data: Dictionary containing message information
+            replay: True when re-processing a deferred message
+        """
+        if self.is_paused:
+            return
+        
+        # Runs on the chat's worker thread - the provider stays set for its messages
+        current_provider.set(self.provider_for(message_data))
+        
+        if message_data.get('edited'):
+            self._handle_edited_message(message_data)
+            return
+        
+        try:
+            message_text, message_id, interpret_kwargs = self._record_message(message_data, replay=replay)
+            
+            if not replay and self._coalesce_fragment(message_text, message_id):
+                return
+            # Held fragments apply before anything sent after them
+            self._flush_burst()
+            
+            if not replay and self._is_noise(message_text):
+                return
+            
+            # Interpret message with LLM (with context)
+            print("  Analyzing with LLM...")
+            if self.streaming_enabled:
+                signal = self.interpreter.interpret_message_streaming(
+                    message_text,
+                    on_signal_start=self._prepare_speculative_order,
+                    **interpret_kwargs
+                )
+            else:
+                signal = self.interpreter.interpret_message(message_text, **interpret_kwargs)
+            
+            if self._should_verify(signal):
+                self._execute_and_verify(signal, message_text, message_id, interpret_kwargs)
+            else:
+                self._dispatch_signal(signal, message_text, message_id,
+                                      reply_to=message_data.get('reply_to_msg_id'))
+            
+        except LLMUnavailableError as e:
+            self._defer_message(message_data, e, front=replay)
+            
+        except Exception as e:
+            self.logger.error(f"Error processing message: {e}", exc_info=True)
+            print(f"  ✗ Error: {e}")
+    
+    async def process_message_async(self, message_data: Dict[str, Any]):
+        """
+        Async message pipeline: concurrent interpretation, ordered commit
+        
+        Interpretations of a burst of messages run concurrently, but each
+        signal is only handed to the trade executor after the previous
+        message's signal has been committed, so a "SL/TP" follow-up can never
+        be applied before the "BUY NOW" it completes.
+        
+        Args:
+            message_data: Dictionary containing message information
+        """
+        if self.is_paused:
+            return
+        
+        # Context of this task only; commits are chained per provider
+        current_provider.set(self.provider_for(message_data))
+        
+        # Chain onto the previous message's commit (tasks start in arrival order)
+        loop = asyncio.get_running_loop()
+        previous_commit = self._commit_tail
+        commit_done = loop.create_future()
+        self._commit_tail = commit_done
+        
+        try:
+            # Edits modify what earlier messages committed - apply them in order
+            if message_data.get('edited'):
+                if previous_commit is not None:
+                    await previous_commit
+                await loop.run_in_executor(None, in_provider_context(self._handle_edited_message, message_data))
+                return
+            
+            message_text, message_id, interpret_kwargs = self._record_message(message_data)
+            
+            # A fragment can only be matched to its entry once the entry is committed
+            if self.coalescer is not None and self.interpreter.fast_parser.parse_levels(message_text):
+                if previous_commit is not None:
+                    await previous_commit
+                    previous_commit = None
+                if self._coalesce_fragment(message_text, message_id):
+                    return
+            if self.coalescer is not None and self.coalescer.pending(self.provider.chat_id):
+                await loop.run_in_executor(None, in_provider_context(self._flush_burst))
+            
+            if self._is_noise(message_text):
+                return
+            
+            print("  Analyzing with LLM...")
+            signal = await self.interpreter.interpret_message_async(message_text, **interpret_kwargs)
+            
+            if previous_commit is not None:
+                await previous_commit
+                
+                # An earlier message committed meanwhile - a follow-up ("SL 4450" after
+                # "BUY NOW") must be read against the trade that message opened
+                active_trades = self._active_trades_context(message_data.get('reply_to_msg_id'))
+                if (InterpretationCache.context_fingerprint(active_trades, self.last_executed_pair) !=
+                        InterpretationCache.context_fingerprint(interpret_kwargs['active_trades'],
+                                                                interpret_kwargs['last_trade_pair'])):
+                    self.logger.info(f"Trade context changed while interpreting message {message_id} - "
+                                     f"interpreting again")
+                    interpret_kwargs.update(active_trades=active_trades, last_trade_pair=self.last_executed_pair)
+                    signal = await self.interpreter.interpret_message_async(message_text, **interpret_kwargs)
+            
+            # Trade handlers make blocking MT5 calls - keep them off the event loop
+            # (executor threads don't inherit the provider context)
+            if self._should_verify(signal):
+                await loop.run_in_executor(None, in_provider_context(
+                    self._execute_and_verify, signal, message_text, message_id, interpret_kwargs))
+            else:
+                await loop.run_in_executor(None, in_provider_context(
+                    self._dispatch_signal, signal, message_text, message_id,
+                    reply_to=message_data.get('reply_to_msg_id')))
+            
+        except LLMUnavailableError as e:
+            self._defer_message(message_data, e)
+            
+        except Exception as e:
+            self.logger.error(f"Error processing message: {e}", exc_info=True)
+            print(f"  ✗ Error: {e}")
+        finally:
+            commit_done.set_result(None)
+    
+    def _record_message(self, message_data: Dict[str, Any],
+                        replay: bool = False) -> Tuple[str, Optional[int], Dict[str, Any]]:
+        """
+        Display an incoming message and capture the context to interpret it with
+        
+        Args:
+            message_data: Dictionary containing message information
+            replay: Deferred message - already in the recent-message history
+            
+        Returns:
+            Tuple of (message_text, message_id, interpret_message keyword arguments)
+        """
+        message_text = message_data.get('text', '')
+        message_id = message_data.get('message_id')
+        sender_name = message_data.get('sender_name', 'Unknown')
+        
+        # Display incoming message (sanitize for Windows console)
+        from utils import sanitize_for_logging
+        timestamp = datetime.now().strftime("%H:%M:%S")
+        safe_message = sanitize_for_logging(message_text, max_length=100)
+        if self.providers:
+            sender_name = f"{sender_name} [{self.provider.name}]"
+        if replay:
+            print(f"\n[{timestamp}] Retrying deferred message from {sender_name}:")
+            print(f"  {safe_message}")
+            
+            # Already in the history - use the current history as context
+            history = [msg for msg in self.recent_messages if msg['text'] != message_text]
+        else:
+            print(f"\n[{timestamp}] New message from {sender_name}:")
+            print(f"  {safe_message}")
+            self.provider.messages += 1
+            
+            # Add to recent messages for context
+            self.recent_messages.append({
+                'timestamp': timestamp,
+                'sender': sender_name,
+                'text': message_text,
+                'message_id': message_id
+            })
+            if len(self.recent_messages) > self.max_context_messages:
+                self.recent_messages.pop(0)  # Remove oldest
+            
+            history = self.recent_messages[:-1]  # All except current
+        
+        # Build context from recent messages (exclude current one)
+        recent_context = []
+        for msg in history:
+            recent_context.append(f"[{msg['timestamp']}] {msg['sender']}: {msg['text']}")
+        
+        interpret_kwargs = {
+            'active_trades': self._active_trades_context(message_data.get('reply_to_msg_id')),
+            'system_prompt': self._system_prompt(),
+            'recent_messages': recent_context,
+            'last_trade_pair': self.last_executed_pair
+        }
+        
+        return message_text, message_id, interpret_kwargs
+    
+    def _active_trades_context(self, reply_to: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Get the active trades context a message is interpreted with
+        
+        Args:
+            reply_to: Telegram message ID the message replies to
+            
+        Returns:
+            The provider's own active trades - only the replied-to signal's
+            trades when the message is a reply to one (nothing to disambiguate)
+        """
+        if reply_to is not None:
+            active_trades = self.trade_manager.get_context_for_llm(self.provider.trade_tag,
+                                                                   telegram_msg_id=reply_to)
+            if active_trades:
+                return active_trades
+        return self.trade_manager.get_context_for_llm(self.provider.trade_tag)
+    
+    def _defer_message(self, message_data: Dict[str, Any], error: Exception, front: bool = False):
+        """
+        Queue a message that could not be interpreted while the LLM is unavailable
+        
+        Args:
+            message_data: Dictionary containing message information
+            error: LLMUnavailableError describing why
+            front: Put it back at the head of the queue (failed retry)
+        """
+        max_deferred = self.config.get('llm.resilience.max_deferred', 50)
+        message_data.setdefault('deferred_at', time.time())
+        
+        with self._deferred_lock:
+            if front:
+                self.deferred_messages.appendleft(message_data)
+            else:
+                self.deferred_messages.append(message_data)
+            while len(self.deferred_messages) > max_deferred:
+                dropped = self.deferred_messages.popleft()
+                self.logger.warning(f"Deferred queue full - dropped message {dropped.get('message_id')}")
+            queued = len(self.deferred_messages)
+        
+        self.logger.warning(f"Deferred message {message_data.get('message_id')}: {error}")
+        print(f"  ⏳ LLM unavailable - message queued for retry ({queued} waiting)")
+    
+    def start_deferred_retry(self):
+        """Start thread that re-interprets deferred messages once the LLM recovers"""
+        interval = self.config.get('llm.resilience.retry_interval_seconds', 5)
+        
+        def retry_loop():
+            while self.is_running:
+                time.sleep(interval)
+                try:
+                    if self.deferred_messages and not self.is_paused:
+                        self._retry_deferred_messages()
+                except Exception as e:
+                    self.logger.error(f"Deferred retry error: {e}")
+            
+            self.logger.info("Deferred retry stopped")
+        
+        retry_thread = threading.Thread(target=retry_loop, daemon=True)
+        retry_thread.start()
+    
+    def _retry_deferred_messages(self):
+        """Re-process deferred messages (with fresh context) while the LLM is available"""
+        max_age = self.config.get('llm.resilience.max_deferred_age_seconds', 300)
+        breaker = self.llm_interpreter.circuit_breaker
+        
+        while breaker.available:
+            with self._deferred_lock:
+                if not self.deferred_messages:
+                    return
+                message_data = self.deferred_messages.popleft()
+            
+            # A signal that waited too long is not safe to act on any more
+            age = time.time() - message_data['deferred_at']
+            if age > max_age:
+                self.logger.warning(f"Discarded deferred message {message_data.get('message_id')} "
+                                    f"after {age:.0f}s: {message_data.get('text', '')[:100]!r}")
+                print(f"\n  ✗ Discarded deferred message ({age:.0f}s old, limit {max_age}s)")
+                continue
+            
+            self.process_message(message_data, replay=True)
+    
+    def catch_up(self, min_ids: Optional[Dict[int, int]] = None, limit: Optional[int] = None,
+                 reason: str = "catch-up") -> Dict[str, int]:
+        """
+        Work through messages that were not delivered live
+        
+        Stale messages and noise are dropped first; the remaining candidates
+        are interpreted with a few batched LLM calls and then executed in
+        message order. Signals already reflected in MT5 are skipped. Each
+        followed chat is caught up in turn, as its provider.
+        
+        Args:
+            min_ids: Only messages after these IDs, by chat (the whole gap up to the
+                staleness cutoff; missing = the latest `limit` messages)
+            limit: Maximum messages to fetch per chat without a min ID (default app.catch_up.max_messages)
+            reason: Label shown in the console ("startup", "reconnect", ...)
+            
+        Returns:
+            Dictionary with fetched/stale/noise/batched/executed/reflected/deferred/failed counts
+        """
+        if limit is None:
+            limit = self.config.get('app.catch_up.max_messages', 200)
+        min_ids = min_ids or {}
+        
+        counts = {'fetched': 0, 'stale': 0, 'noise': 0, 'batched': 0, 'executed': 0,
+                  'reflected': 0, 'deferred': 0, 'failed': 0}
+        
+        # One catch-up at a time (startup, reconnect and REPL may overlap)
+        if not self._catch_up_lock.acquire(blocking=False):
+            print(f"\n  ⏳ Catch-up already running - {reason} request skipped")
+            return counts
+        
+        try:
+            for chat_id in self.selected_chat_ids:
+                provider = self.providers.get(chat_id, self.default_provider)
+                chat_counts = run_as(provider, self._catch_up_chat, chat_id,
+                                     min_ids.get(chat_id, 0), limit, reason)
+                for key, value in chat_counts.items():
+                    counts[key] += value
+            return counts
+        
+        finally:
+            self._catch_up_lock.release()
+    
+    def _catch_up_chat(self, chat_id: int, min_id: int, limit: int, reason: str) -> Dict[str, int]:
+        """
+        Catch up on one chat (runs as the chat's provider)
+        
+        Args:
+            chat_id: Chat to fetch from
+            min_id: Only messages after this ID (0 = the latest `limit` messages)
+            limit: Maximum messages to fetch without a min ID
+            reason: Label shown in the console
+            
+        Returns:
+            Dictionary with the chat's counts (see catch_up)
+        """
+        max_age = self.config.get('app.catch_up.max_age_seconds', 300)
+        batch_size = self.config.get('app.catch_up.batch_size', 25)
+        
+        counts = {'fetched': 0, 'stale': 0, 'noise': 0, 'batched': 0, 'executed': 0,
+                  'reflected': 0, 'deferred': 0, 'failed': 0}
+        
+        # The whole gap after a watermark (paged), but nothing that would be stale
+        now = datetime.now(timezone.utc)
+        messages = self.telegram_client.get_messages_since(chat_id, min_id, None if min_id else limit,
+                                                           since=now - timedelta(seconds=max_age))
+        counts['fetched'] = len(messages)
+        if not messages:
+            return counts
+        
+        # The watermark may not pass the gap before every message of it was handled
+        for message_data in messages:
+            self.telegram_client.mark_pending(chat_id, message_data['message_id'])
+        
+        source = f" from {self.provider.name}" if self.providers else ""
+        print(f"\n{colorize(f'⏪ Catching up on {len(messages)} missed messages{source} ({reason})', 'cyan')}")
+        
+        # Cheap filters first: a signal that waited too long is not safe to act on
+        now = datetime.now(timezone.utc)
+        candidates = []
+        for message_data in messages:
+            sent_at = message_data.get('date')
+            if sent_at is not None and (now - sent_at).total_seconds() > max_age:
+                counts['stale'] += 1
+            elif self._is_noise(message_data.get('text', ''), announce=False):
+                counts['noise'] += 1
+            else:
+                candidates.append(message_data)
+        
+        print(f"  Skipped {counts['stale']} stale (> {max_age}s) and {counts['noise']} noise messages")
+        
+        # Remaining candidates: a few batched LLM calls instead of one call per message
+        results: Dict[Any, Any] = {}
+        if candidates:
+            history = [f"[{msg['timestamp']}] {msg['sender']}: {msg['text']}" for msg in self.recent_messages]
+            try:
+                results = self.interpreter.interpret_batch(
+                    [(message_data['message_id'], message_data.get('text', '')) for message_data in candidates],
+                    active_trades=self.trade_manager.get_context_for_llm(self.provider.trade_tag),
+                    system_prompt=self._system_prompt(),
+                    recent_messages=history,
+                    last_trade_pair=self.last_executed_pair,
+                    batch_size=batch_size
+                )
+            except Exception as e:
+                self.logger.error(f"Batch interpretation failed: {e}", exc_info=True)
+            counts['batched'] = len(results)
+            print(f"  Interpreted {len(results)}/{len(candidates)} candidates locally or in batched calls "
+                  f"(rest individually)")
+        
+        # Execute in message order, each with the context left by the previous one;
+        # the chat's watermark follows (skipped messages count as handled, messages
+        # left over by a pause stay pending for the next catch-up)
+        candidate_ids = {message_data['message_id'] for message_data in candidates}
+        for message_data in messages:
+            if message_data['message_id'] in candidate_ids:
+                if self.is_paused:
+                    print(colorize("  ⏸ Paused - rest of the gap left for the next catch-up", 'yellow'))
+                    break
+                outcome = self._catch_up_message(message_data, results.get(message_data['message_id']))
+                counts[outcome] += 1
+            self.telegram_client.mark_processed(chat_id, message_data['message_id'])
+        
+        print(f"  {colorize('✓ Catch-up done', 'green')}: {counts['executed']} processed, "
+              f"{counts['reflected']} already in MT5, {counts['deferred']} deferred")
+        return counts
+    
+    def _catch_up_message(self, message_data: Dict[str, Any], signal: Optional[Any]) -> str:
+        """
+        Execute one caught-up message
+        
+        Args:
+            message_data: Dictionary containing message information
+            signal: Signal from the batch (None = interpret individually now)
+            
+        Returns:
+            "executed", "reflected", "deferred" or "failed"
+        """
+        try:
+            message_text, message_id, interpret_kwargs = self._record_message(message_data)
+            
+            if signal is None:
+                signal = self.interpreter.interpret_message(message_text, **interpret_kwargs)
+            
+            if self._already_reflected(signal, message_id):
+                print("  ⊘ Already reflected in MT5 - skipped")
+                return 'reflected'
+            
+            self._dispatch_signal(signal, message_text, message_id,
+                                  reply_to=message_data.get('reply_to_msg_id'))
+            return 'executed'
+            
+        except LLMUnavailableError as e:
+            self._defer_message(message_data, e)
+            return 'deferred'
+        
+        except Exception as e:
+            self.logger.error(f"Error processing caught-up message: {e}", exc_info=True)
+            print(f"  ✗ Error: {e}")
+            return 'failed'
+    
+    def _already_reflected(self, signal: Optional[Any], message_id: Optional[int]) -> bool:
+        """
+        Check whether a caught-up signal has already been acted on
+        
+        Args:
+            signal: Interpreted signal
+            message_id: Telegram message ID
+            
+        Returns:
+            True if executing it again would duplicate what MT5 already holds
+        """
+        if isinstance(signal, NewSignal):
+            # Only the bot's own record of this message counts - a matching position
+            # may be manual, another provider's or a legitimate second entry
+            return message_id is not None and bool(
+                self.trade_manager.get_trades_by_message(message_id, provider=self.provider.trade_tag))
+        
+        if isinstance(signal, ModifySignal) and not signal.is_breakeven:
+            trade = self._find_trade_by_reference(signal.trade_reference)
+            if trade is None:
+                return False
+            sl_done = signal.new_stop_loss is None or trade.stop_loss == signal.new_stop_loss
+            tp_done = signal.new_take_profit is None or trade.take_profit == signal.new_take_profit
+            return sl_done and tp_done
+        
+        return False
+    
+    def _on_telegram_reconnect(self, watermarks: Dict[int, int]):
+        """
+        Catch up on messages missed while Telegram was disconnected
+        
+        Args:
+            watermarks: Last processed message ID per chat before the connection dropped
+        """
+        if not self.is_running or not self.config.get('app.catch_up.on_reconnect', True):
+            return
+        try:
+            self.catch_up(min_ids=watermarks, reason="reconnect")
+        except Exception as e:
+            self.logger.error(f"Reconnect catch-up failed: {e}", exc_info=True)
+    
+    def classify_message_priority(self, message_data: Dict[str, Any]) -> int:
+        """
+        Rank a queued message for backpressure (runs on the Telegram event loop)
+        
+        Args:
+            message_data: Dictionary containing message information
+            
+        Returns:
+            PRIORITY_CRITICAL for close/modify follow-ups, PRIORITY_NOISE for
+            messages the noise filter would drop, else PRIORITY_NORMAL
+        """
+        text = (message_data.get('text') or '').upper()
+        
+        # Edits fix the levels of signals that may already be trading
+        if message_data.get('edited'):
+            return PRIORITY_CRITICAL
+        
+        if TRADE_MANAGEMENT_PATTERN.search(text) or (LEVEL_PATTERN.search(text) and
+                                                     not DIRECTION_PATTERN.search(text)):
+            return PRIORITY_CRITICAL
+        
+        # Same decision as NoiseFilter.is_noise, without its logging / statistics
+        if (self.noise_filter is not None and not ALWAYS_FORWARD_PATTERN.search(text) and
+                self.noise_filter.score(text) < self.noise_filter.threshold):
+            return PRIORITY_NOISE
+        
+        return PRIORITY_NORMAL
+    
+    def _is_noise(self, message_text: str, announce: bool = True) -> bool:
+        """
+        Run the noise pre-filter on a message
+        
+        Nothing is dropped while the provider has open trades - any short
+        message ("cut it", "enough") may then be an instruction for them.
+        
+        Args:
+            message_text: Message text
+            announce: Print the skip to the console
+            
+        Returns:
+            True if the message was dropped without calling the LLM
+        """
+        if self.noise_filter is None or TRADE_MANAGEMENT_PATTERN.search(message_text.upper()):
+            return False
+        
+        provider_tag = self.provider.trade_tag
+        if any(trade.signal_provider == provider_tag and
+               trade.status in (TradeStatus.ACTIVE.value, TradeStatus.PENDING.value)
+               for trade in self.trade_manager.trades.values()):
+            return False
+        
+        if not self.noise_filter.is_noise(message_text):
+            return False
+        
+        if announce:
+            print("  ⊘ Skipped as noise (no LLM call)")
+        return True
+    
+    def _handle_edited_message(self, message_data: Dict[str, Any]):
+        """
+        Apply a provider's edit of an earlier message
+        
+        An edit of a message a trade was opened from is diffed against the
+        trade's original text and only the changed levels are sent to MT5;
+        the LLM is asked only when the diff is ambiguous. An edit of a
+        message that opened no trade is interpreted like a new message.
+        
+        Args:
+            message_data: Edited message (edited=True, previous_text)
+        """
+        if not self.config.get('app.edits.enabled', True):
+            return
+        
+        message_text = message_data.get('text', '')
+        message_id = message_data.get('message_id')
+        self._flush_burst()
+        
+        from utils import sanitize_for_logging
+        timestamp = datetime.now().strftime("%H:%M:%S")
+        print(f"\n[{timestamp}] Message edited by {message_data.get('sender_name', 'Unknown')}:")
+        print(f"  {sanitize_for_logging(message_text, max_length=100)}")
+        
+        try:
+            trades = self.trade_manager.get_trades_by_message(message_id, self.provider.trade_tag)
+            
+            if not trades:
+                # Nothing was opened from it - the edit may have only now made it a signal
+                sent_at = message_data.get('date')
+                max_age = self.config.get('app.edits.max_age_seconds', 900)
+                if sent_at is not None and (datetime.now(timezone.utc) - sent_at).total_seconds() > max_age:
+                    print(f"  ⊘ Edit of a message older than {max_age}s with no trade - ignored")
+                    return
+                
+                print("  ℹ No trade from the original - interpreting the edit as a new message")
+                self.recent_messages[:] = [msg for msg in self.recent_messages if msg.get('message_id') != message_id]
+                self.process_message(dict(message_data, edited=False))
+                return
+            
+            # Keep the conversation context in line with what the chat now shows
+            for msg in self.recent_messages:
+                if msg.get('message_id') == message_id:
+                    msg['text'] = message_text
+            
+            open_trades = [trade for trade in trades
+                           if trade.status in (TradeStatus.ACTIVE.value, TradeStatus.PENDING.value)]
+            if not open_trades:
+                print("  ℹ Trade from this message is already closed - edit ignored")
+                return
+            
+            # Cheap path: both versions parse as the same signal, only levels differ
+            changes = None
+            if self.interpreter.fast_parser is not None:
+                changes = self.interpreter.fast_parser.diff_levels(open_trades[0].original_message, message_text)
+            
+            if changes is None:
+                print("  Edit is ambiguous - re-interpreting with LLM...")
+                changes = self._edit_changes_from_llm(open_trades[0], message_text)
+                if changes is None:
+                    return
+            
+            if not changes:
+                print("  ℹ Edit changes no SL/TP levels")
+                return
+            
+            with self._execution_lock:
+                for trade in open_trades:
+                    if self._apply_level_changes(trade, changes, '✏ SIGNAL EDITED'):
+                        # Later edits are diffed against this version
+                        trade.original_message = message_text
+                self.trade_manager.save_trades()
+            
+        except LLMUnavailableError as e:
+            self._defer_message(message_data, e)
+            
+        except Exception as e:
+            self.logger.error(f"Error processing edited message: {e}", exc_info=True)
+            print(f"  ✗ Error: {e}")
+    
+    def _edit_changes_from_llm(self, trade: Any, message_text: str) -> Optional[Dict[str, Any]]:
+        """
+        Interpret an edited signal with the LLM and compare it with its trade
+        
+        Args:
+            trade: Trade opened from the original message
+            message_text: Edited message text
+            
+        Returns:
+            Dictionary of changed levels (see FastSignalParser.diff_levels), or
+            None if the edit no longer describes the trade
+        """
+        history = [f"[{msg['timestamp']}] {msg['sender']}: {msg['text']}" for msg in self.recent_messages
+                   if msg.get('message_id') != trade.telegram_msg_id]
+        signal = self.interpreter.interpret_message(
+            message_text,
+            active_trades=self.trade_manager.get_context_for_llm(self.provider.trade_tag),
+            system_prompt=self._system_prompt(),
+            recent_messages=history,
+            last_trade_pair=self.last_executed_pair
+        )
+        
+        changes: Dict[str, Any] = {}
+        if isinstance(signal, NewSignal):
+            pair = signal.pair or self.provider.default_pair or trade.pair
+            if pair.upper() in ['GOLD', 'XAU']:
+                pair = 'XAUUSD'
+            if pair.upper() != trade.pair.upper() or signal.action != trade.action:
+                print(f"  ⚠ Edited message is now a {signal.action} {pair} signal - "
+                      f"{trade.action} {trade.pair} trade left unchanged")
+                return None
+            
+            if signal.entry_price and signal.entry_price != (trade.signal_entry or trade.entry_price):
+                changes['entry_price'] = signal.entry_price
+            if signal.stop_loss and signal.stop_loss != trade.stop_loss:
+                changes['stop_loss'] = signal.stop_loss
+            if signal.tp_levels and signal.tp_levels != trade.tp_levels:
+                changes['tp_levels'] = signal.tp_levels
+            elif signal.take_profit and signal.take_profit != trade.take_profit:
+                changes['take_profit'] = signal.take_profit
+        
+        elif isinstance(signal, ModifySignal) and not signal.is_breakeven:
+            if signal.new_stop_loss and signal.new_stop_loss != trade.stop_loss:
+                changes['stop_loss'] = signal.new_stop_loss
+            if signal.new_take_profit and signal.new_take_profit != trade.take_profit:
+                changes['take_profit'] = signal.new_take_profit
+        
+        else:
+            reason = signal.reasoning if signal is not None else "interpretation failed"
+            print(f"  ⚠ Edit not applied - not a level change ({reason})")
+            return None
+        
+        return changes
+    
+    def _apply_level_changes(self, trade: Any, changes: Dict[str, Any], title: str) -> bool:
+        """
+        Send changed levels of a trade to MT5 as one modification
+        
+        Args:
+            trade: Trade to modify
+            changes: Changed levels (stop_loss, take_profit, tp_levels, entry_price)
+            title: Heading shown in the console
+            
+        Returns:
+            True if the trade now has the new levels
+        """
+        print(f"\n  {colorize(title, 'yellow')} - {trade.action} {trade.pair} (Ticket: {trade.mt5_ticket})")
+        for field_name, value in changes.items():
+            print(f"  {field_name}: {value}")
+        
+        new_sl = changes.get('stop_loss', trade.stop_loss)
+        new_tp = changes.get('take_profit', trade.take_profit)
+        if changes.get('tp_levels'):
+            new_tp = self._determine_mt5_tp(changes['tp_levels'], new_tp)
+        
+        if 'entry_price' in changes:
+            print("  ℹ Entry changed - an open position keeps its fill")
+        
+        exists, location = self.mt5_client.check_ticket_exists(trade.mt5_ticket)
+        if not exists:
+            print(f"  ℹ Position already closed in MT5")
+            self.trade_manager.close_trade(trade.trade_id, 0, 0)
+            return False
+        
+        if location == 'pending':
+            print(f"  💡 Note: Pending orders require manual modification in MT5")
+            return False
+        
+        if new_sl != trade.stop_loss or new_tp != trade.take_profit:
+            success, message = self.mt5_client.modify_order(
+                ticket=trade.mt5_ticket,
+                stop_loss=new_sl,
+                take_profit=new_tp
+            )
+            if not success:
+                print(f"  ✗ Modification failed: {message}")
+                return False
+            
+            if new_sl != trade.stop_loss:
+                trade.update_stop_loss(new_sl)
+            if new_tp != trade.take_profit:
+                trade.update_take_profit(new_tp)
         
-        # Display account info
-        account_info = self.mt5_client.get_account_info()
-        if account_info:
-            print(f"✓ Connected to MT5")
-            print(f"  Balance: {account_info['balance']} {account_info['currency']}")
-            print(f"  Equity: {account_info['equity']} {account_info['currency']}")
-            print(f"  Server: {account_info['server']}")
+        if changes.get('tp_levels'):
+            trade.tp_levels = changes['tp_levels']
+        trade.add_modification('signal_edit', dict(changes))
         
+        print(f"  {colorize('✓ LEVELS APPLIED', 'green')} - SL: {trade.stop_loss} | TP: {trade.take_profit}")
         return True
     
-    def start_listening(self):
-        """Start listening to Telegram messages"""
-        if not self.telegram_client or not self.selected_chat_id:
-            self.logger.error("Telegram not properly configured")
-            return
+    def _coalesce_fragment(self, message_text: str, message_id: Optional[int]) -> bool:
+        """
+        Hold an SL/TP-only follow-up of the latest entry to merge it with the rest of its burst
         
-        # Set message callback
-        self.telegram_client.set_message_callback(self.process_message)
+        Args:
+            message_text: Message text
+            message_id: Telegram message ID
+            
+        Returns:
+            True if the message was held (it is applied when its burst completes)
+        """
+        if self.coalescer is None or self.interpreter.fast_parser is None:
+            return False
         
-        # Start listening
-        self.telegram_client.start_listening(self.selected_chat_id)
+        levels = self.interpreter.fast_parser.parse_levels(message_text)
+        if levels is None:
+            return False
         
-        # Start TP monitoring thread
-        self.start_tp_monitor()
+        # Only fragments completing the provider's latest entry are merged
+        max_age = self.config.get('app.burst_coalescing.max_entry_age_seconds', 60)
+        trade = self.trade_manager.get_trade(self.last_entry_trade_id) if self.last_entry_trade_id else None
+        if (trade is None or trade.status != TradeStatus.ACTIVE.value or not self.last_signal_timestamp or
+                (datetime.now() - self.last_signal_timestamp).total_seconds() > max_age):
+            return False
         
-        self.is_running = True
-        self.logger.info("Started listening to messages")
+        burst = self.coalescer.add(self.provider.chat_id, levels, message_id, message_text,
+                                   context=(self.provider, trade.trade_id))
+        print(f"  ⏳ SL/TP fragment for {trade.action} {trade.pair} held ({len(burst.texts)} in burst, "
+              f"applied after {self.coalescer.window_seconds:g}s without another)")
+        return True
     
-    def process_message(self, message_data: Dict[str, Any]):
+    def _flush_burst(self):
+        """Apply the current provider's held fragments now"""
+        if self.coalescer is not None:
+            self.coalescer.flush(self.provider.chat_id)
+    
+    def _apply_burst(self, burst: Burst):
         """
-        Main message processing pipeline
+        Apply a completed burst of SL/TP fragments (coalescer callback, any thread)
         
         Args:
-            message_data: Dictionary containing message information
+            burst: Merged fragments; context is (provider, trade ID)
         """
-        if self.is_paused:
-            return
+        provider, trade_id = burst.context
+        run_as(provider, self._apply_burst_levels, burst, trade_id)
+    
+    def _apply_burst_levels(self, burst: Burst, trade_id: str):
+        """
+        Send a burst's merged levels to its trade as one modification
         
-        try:
-            message_text = message_data.get('text', '')
-            message_id = message_data.get('message_id')
-            sender_name = message_data.get('sender_name', 'Unknown')
-            
-            # Display incoming message (sanitize for Windows console)
-            from utils import sanitize_for_logging
-            timestamp = datetime.now().strftime("%H:%M:%S")
-            safe_message = sanitize_for_logging(message_text, max_length=100)
-            print(f"\n[{timestamp}] New message from {sender_name}:")
-            print(f"  {safe_message}")
-            
-            # Add to recent messages for context
-            self.recent_messages.append({
-                'timestamp': timestamp,
-                'sender': sender_name,
-                'text': message_text
-            })
-            if len(self.recent_messages) > self.max_context_messages:
-                self.recent_messages.pop(0)  # Remove oldest
-            
-            # Build context from recent messages (exclude current one)
-            recent_context = []
-            for msg in self.recent_messages[:-1]:  # All except current
-                recent_context.append(f"[{msg['timestamp']}] {msg['sender']}: {msg['text']}")
-            
-            # Get active trades context
-            active_trades = self.trade_manager.get_context_for_llm()
+        Args:
+            burst: Merged fragments
+            trade_id: Trade of the entry the fragments follow
+        """
+        with self._execution_lock:
+            trade = self.trade_manager.get_trade(trade_id)
+            if trade is None or trade.status != TradeStatus.ACTIVE.value:
+                print(f"\n  ⚠ Trade closed before its SL/TP fragments could be applied: {' | '.join(burst.texts)}")
+                return
             
-            # Interpret message with LLM (with context)
-            print("  Analyzing with LLM...")
-            system_prompt = self.config.get('llm.system_prompt')
-            signal = self.llm_interpreter.interpret_message(
-                message_text,
-                active_trades=active_trades,
-                system_prompt=system_prompt,
-                recent_messages=recent_context,
-                last_trade_pair=self.last_executed_pair
-            )
+            changes: Dict[str, Any] = {}
+            if burst.stop_loss is not None and burst.stop_loss != trade.stop_loss:
+                changes['stop_loss'] = burst.stop_loss
+            if len(burst.tp_levels) > 1:
+                if burst.tp_levels != trade.tp_levels:
+                    changes['tp_levels'] = list(burst.tp_levels)
+            elif burst.tp_levels and burst.tp_levels[0] != trade.take_profit:
+                changes['take_profit'] = burst.tp_levels[0]
+            
+            if not changes:
+                print(f"\n  ℹ SL/TP fragments repeat the current levels of {trade.action} {trade.pair}")
+                return
             
+            title = f"🧩 {len(burst.texts)} SL/TP FRAGMENTS MERGED" if len(burst.texts) > 1 else "🧩 SL/TP FRAGMENT"
+            if self._apply_level_changes(trade, changes, title):
+                self.last_signal_had_sltp = bool(trade.stop_loss and trade.take_profit)
+            self.trade_manager.save_trades()
+    
+    def _dispatch_signal(self, signal: Optional[Any], message_text: str, message_id: Optional[int],
+                         allow_repeat: bool = False, reply_to: Optional[int] = None):
+        """
+        Hand an interpreted signal to the matching trade handler
+        
+        Args:
+            signal: Interpreted signal (None if interpretation failed)
+            message_text: Original message text
+            message_id: Telegram message ID
+            allow_repeat: Skip the duplicate-execution guard (re-dispatch of a corrected signal)
+            reply_to: Telegram message ID the message replies to (targets that signal's trade)
+        """
+        # Providers are interpreted concurrently, but trades are executed one at a time
+        self._execution_lock.acquire()
+        previous_reply_to, self._reply_to_msg_id = self._reply_to_msg_id, reply_to
+        try:
             if signal is None:
                 print("  ⚠ Failed to interpret message")
                 return
             
+            # Labelled example for retraining the noise pre-filter / mining templates
+            if self.noise_filter:
+                self.noise_filter.record(message_text, signal.signal_type, signal.model_dump())
+            
+            # One logical signal never trades twice, however many copies arrive
+            if (not isinstance(signal, NoSignal) and not allow_repeat and self.execution_guard and
+                    not self._claim_execution(signal, message_text, message_id)):
+                self.logger.warning(f"Duplicate signal skipped (message {message_id}): {message_text[:100]!r}")
+                print("  ⊘ Duplicate of a signal already acted on - skipped")
+                return
+            
             # Handle different signal types
             if isinstance(signal, NewSignal):
                 self._handle_new_signal(signal, message_text, message_id)
@@ -342,13 +1443,357 @@ class TradingBot:
         except Exception as e:
             self.logger.error(f"Error processing message: {e}", exc_info=True)
             print(f"  ✗ Error: {e}")
+        finally:
+            self._reply_to_msg_id = previous_reply_to
+            self._execution_lock.release()
+    
+    def _claim_execution(self, signal: Any, message_text: str, message_id: Optional[int]) -> bool:
+        """
+        Claim a signal with the duplicate-execution guard
+        
+        A message is acted on once however often it is delivered (catch-up,
+        replay, re-delivery); an edit with different content is a new
+        instruction. Forwarded copies of an entry are caught by their content
+        within the guard window. Management instructions repeated in separate
+        messages ("take partials" twice, "SET BE" after a new entry) go through.
+        
+        Args:
+            signal: Interpreted signal
+            message_text: Original message text
+            message_id: Telegram message ID
+            
+        Returns:
+            True if the signal may be executed
+        """
+        content = InterpretationCache.normalize_message(message_text)
+        if message_id is not None:
+            chat_id = self.provider.chat_id or self.selected_chat_id
+            if not self.execution_guard.claim(f"message|{chat_id}|{message_id}|{content}"):
+                return False
+        
+        opens_trade = isinstance(signal, NewSignal) or (
+            isinstance(signal, MultiActionSignal) and any(isinstance(step, NewSignal) for step in signal.actions))
+        if opens_trade:
+            return self.execution_guard.claim(self.provider.guard_key(content))
+        return True
+    
+    def _should_verify(self, signal: Optional[Any]) -> bool:
+        """
+        Check whether a signal is executed first and verified by the LLM afterwards
+        
+        Args:
+            signal: Interpreted signal
+            
+        Returns:
+            True for confident fast-path market entries when verify-after-execute is on
+        """
+        return (self.verify_after_execute and
+                isinstance(signal, NewSignal) and
+                signal.execution_type == 'immediate' and
+                signal.reasoning.startswith('Fast-path') and
+                signal.confidence >= self.config.get('llm.verify_after_execute.min_confidence', 0.85))
+    
+    def _execute_and_verify(self, signal: NewSignal, message_text: str, message_id: Optional[int],
+                            interpret_kwargs: Dict[str, Any]):
+        """
+        Execute a fast-path entry at once while the LLM interprets the same message
+        
+        The LLM call starts before the order is sent; once both are done the
+        executed trade is reconciled against the LLM's interpretation.
+        
+        Args:
+            signal: Fast-path NewSignal
+            message_text: Original message text
+            message_id: Telegram message ID
+            interpret_kwargs: Context the message was interpreted with
+        """
+        fast_signal = signal.model_copy(deep=True)  # the handler may rewrite the pair
+        executed = threading.Event()
+        max_wait = self.config.get('llm.verify_after_execute.max_wait_seconds', 30)
+        
+        def verify():
+            llm_signal, error = None, None
+            try:
+                llm_signal = self.interpreter.interpret_message(message_text, use_local=False,
+                                                                **interpret_kwargs)
+            except Exception as e:
+                error = e
+            
+            executed.wait(timeout=max_wait)
+            try:
+                self._reconcile_fast_signal(fast_signal, llm_signal, error, message_text, message_id)
+            except Exception as e:
+                self.logger.error(f"Fast-path reconciliation failed: {e}", exc_info=True)
+        
+        threading.Thread(target=in_provider_context(verify), daemon=True).start()
+        
+        print(f"  ⚡ Fast-path entry - executing now, LLM verifies in background")
+        try:
+            self._dispatch_signal(signal, message_text, message_id)
+        finally:
+            executed.set()
+    
+    def _find_trade_for_message(self, message_text: str, message_id: Optional[int]) -> Optional[Any]:
+        """
+        Find the active trade opened by a message
+        
+        Args:
+            message_text: Original message text
+            message_id: Telegram message ID
+            
+        Returns:
+            Most recent matching Trade or None
+        """
+        matches = [trade for trade in self.trade_manager.get_trades_by_message(message_id)
+                   if trade.status == TradeStatus.ACTIVE.value and trade.original_message == message_text]
+        return matches[-1] if matches else None
+    
+    def _signal_divergences(self, fast_signal: NewSignal, llm_signal: Any) -> Dict[str, List[Any]]:
+        """
+        Compare a fast-path entry with the LLM's interpretation of the same message
+        
+        Args:
+            fast_signal: Fast-path NewSignal
+            llm_signal: LLM interpretation
+            
+        Returns:
+            Dictionary of field -> [fast value, LLM value] for every field that differs
+        """
+        if not isinstance(llm_signal, NewSignal):
+            return {'signal_type': [fast_signal.signal_type, llm_signal.signal_type]}
+        
+        def normalize_pair(pair):
+            return 'XAUUSD' if not pair or pair.upper() in ['GOLD', 'XAU', ''] else pair.upper()
+        
+        def differs(a, b):
+            return a is not None and b is not None and abs(a - b) > 1e-6
+        
+        divergences = {}
+        if normalize_pair(fast_signal.pair) != normalize_pair(llm_signal.pair):
+            divergences['pair'] = [fast_signal.pair, llm_signal.pair]
+        if fast_signal.action != llm_signal.action:
+            divergences['action'] = [fast_signal.action, llm_signal.action]
+        if llm_signal.stop_loss is not None and (fast_signal.stop_loss is None or
+                                                 differs(fast_signal.stop_loss, llm_signal.stop_loss)):
+            divergences['stop_loss'] = [fast_signal.stop_loss, llm_signal.stop_loss]
+        
+        fast_tp = self._determine_mt5_tp(fast_signal.tp_levels, fast_signal.take_profit)
+        llm_tp = self._determine_mt5_tp(llm_signal.tp_levels, llm_signal.take_profit)
+        if llm_tp is not None and (fast_tp is None or differs(fast_tp, llm_tp)):
+            divergences['take_profit'] = [fast_tp, llm_tp]
+        if llm_signal.tp_levels and sorted(llm_signal.tp_levels) != sorted(fast_signal.tp_levels or []):
+            divergences['tp_levels'] = [fast_signal.tp_levels, llm_signal.tp_levels]
+        
+        return divergences
+    
+    def _reconcile_fast_signal(self, fast_signal: NewSignal, llm_signal: Optional[Any],
+                               error: Optional[Exception], message_text: str, message_id: Optional[int]):
+        """
+        Correct an executed fast-path entry where the LLM read the message differently
+        
+        SL/TP differences are fixed with modify_order; a different direction,
+        pair or signal type unwinds the position with close_order (and the
+        LLM's signal is then handled normally). Every divergence is appended
+        to the divergence log.
+        
+        Args:
+            fast_signal: Fast-path NewSignal that was executed
+            llm_signal: LLM interpretation (None if it failed)
+            error: Exception raised by the LLM call, if any
+            message_text: Original message text
+            message_id: Telegram message ID
+        """
+        # Without a real LLM answer the fast-path result stands
+        if error is not None or llm_signal is None or llm_signal.reasoning.startswith('Fallback'):
+            reason = error or "no LLM interpretation"
+            self.logger.warning(f"Fast-path signal for message {message_id} not verified: {reason}")
+            with self._verification_lock:
+                self.verification_stats['unverified'] += 1
+            return
+        
+        divergences = self._signal_divergences(fast_signal, llm_signal)
+        with self._verification_lock:
+            self.verification_stats['verified'] += 1
+            if not divergences:
+                self.verification_stats['agreed'] += 1
+        
+        if not divergences:
+            self.logger.info(f"LLM confirmed fast-path signal for message {message_id}")
+            return
+        
+        print(f"\n  {colorize('🔍 FAST-PATH DIVERGENCE', 'yellow')} (message {message_id})")
+        for field, (fast_value, llm_value) in divergences.items():
+            print(f"  {field}: fast-path {fast_value} → LLM {llm_value}")
+        
+        # The chat worker, edit handler and burst flush may be changing the same trade
+        with self._execution_lock:
+            action, outcome = self._correct_fast_trade(llm_signal, divergences, message_text, message_id)
+        
+        self._log_divergence({
+            'timestamp': datetime.now().isoformat(),
+            'message_id': message_id,
+            'text': message_text,
+            'fast_path': fast_signal.model_dump(),
+            'llm': llm_signal.model_dump(),
+            'divergences': divergences,
+            'action': action,
+            'result': outcome,
+        })
+    
+    def _correct_fast_trade(self, llm_signal: Any, divergences: Dict[str, List[Any]],
+                            message_text: str, message_id: Optional[int]) -> Tuple[str, str]:
+        """
+        Fix or unwind the trade a diverging fast-path entry opened (execution lock held)
+        
+        Args:
+            llm_signal: LLM interpretation
+            divergences: Field -> [fast value, LLM value] (see _signal_divergences)
+            message_text: Original message text
+            message_id: Telegram message ID
+            
+        Returns:
+            (action taken: none/unwind/modify, outcome message)
+        """
+        trade = self._find_trade_for_message(message_text, message_id)
+        if trade is None:
+            print(f"  ℹ No open trade from this message - nothing to correct")
+            return 'none', "no trade opened by this message"
+        
+        action, outcome = 'none', ""
+        if {'signal_type', 'pair', 'action'} & divergences.keys():
+            # Misread direction/instrument - get out, then act on what the LLM read
+            action = 'unwind'
+            print(f"  {colorize('⚡ UNWINDING POSITION...', 'yellow')}")
+            success, close_price, outcome = self.mt5_client.close_order(
+                ticket=trade.mt5_ticket,
+                deviation=self.config.get('mt5.deviation', 5)
+            )
+            if success:
+                self.trade_manager.close_trade(trade.trade_id, close_price or 0, 0)
+                with self._verification_lock:
+                    self.verification_stats['unwound'] += 1
+                print(f"  {colorize('✓ POSITION UNWOUND', 'green')}")
+                if not isinstance(llm_signal, NoSignal):
+                    self._dispatch_signal(llm_signal, message_text, message_id, allow_repeat=True)
+            else:
+                print(f"  {colorize('✗ UNWIND FAILED', 'red')}")
+                print(f"  {outcome}")
+        
+        elif any(mod['type'] in ('sl_update', 'tp_update') for mod in trade.modifications):
+            # A follow-up already set the levels - they no longer are the fast-path reading
+            outcome = "SL/TP changed since execution - left as is"
+            print(f"  ℹ SL/TP changed since execution - not overwritten")
+        
+        else:
+            action = 'modify'
+            new_sl = divergences['stop_loss'][1] if 'stop_loss' in divergences else trade.stop_loss
+            new_tp = divergences['take_profit'][1] if 'take_profit' in divergences else trade.take_profit
+            print(f"  {colorize('⚡ CORRECTING SL/TP...', 'yellow')}")
+            success, outcome = self.mt5_client.modify_order(
+                ticket=trade.mt5_ticket,
+                stop_loss=new_sl,
+                take_profit=new_tp
+            )
+            if success:
+                if new_sl != trade.stop_loss:
+                    trade.update_stop_loss(new_sl)
+                if new_tp != trade.take_profit:
+                    trade.update_take_profit(new_tp)
+                if 'tp_levels' in divergences:
+                    trade.tp_levels = divergences['tp_levels'][1]
+                self.trade_manager.save_trades()
+                with self._verification_lock:
+                    self.verification_stats['corrected'] += 1
+                print(f"  {colorize('✓ POSITION CORRECTED', 'green')} (SL: {new_sl}, TP: {new_tp})")
+            else:
+                print(f"  {colorize('✗ CORRECTION FAILED', 'red')}")
+                print(f"  {outcome}")
+        
+        return action, outcome
+    
+    def _log_divergence(self, entry: Dict[str, Any]):
+        """
+        Append a fast-path/LLM divergence to the divergence log
+        
+        Args:
+            entry: Divergence record
+        """
+        self.logger.warning(f"Fast-path divergence for message {entry['message_id']}: "
+                            f"{entry['divergences']} -> {entry['action']}")
+        path = Path(self.config.get('llm.verify_after_execute.divergence_log',
+                                    'logs/fast_path_divergences.jsonl'))
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry) + '\n')
+        except Exception as e:
+            self.logger.error(f"Failed to write divergence log: {e}")
+    
+    def _prepare_speculative_order(self, pair: Optional[str], action: str):
+        """
+        Warm MT5 for a signal whose pair/action streamed in before its prices
+        
+        Args:
+            pair: Trading pair from the partial tool call (None if not given)
+            action: BUY or SELL
+        """
+        if self.is_paused or not self.mt5_client:
+            return
+        
+        # Same defaulting as _handle_new_signal
+        if not pair and self.provider.default_pair:
+            pair = self.provider.default_pair
+        elif not pair or pair.upper() in ['GOLD', 'XAU', '']:
+            pair = 'XAUUSD'
+        
+        prepared = self.mt5_client.prepare_market_order(
+            symbol=pair,
+            order_type=action,
+            lot_size=self._default_lot_size(),
+            deviation=self.config.get('mt5.deviation', 5),
+            comment=self.config.get('mt5.order_comment', 'TelegramBot')
+        )
+        if prepared is None:
+            return
+        
+        with self._speculative_lock:
+            self._speculative_orders[(pair, action)] = (time.time(), prepared)
+    
+    def _take_speculative_order(self, pair: str, action: str) -> Optional[Dict[str, Any]]:
+        """
+        Pop a prepared order matching the final signal
+        
+        Args:
+            pair: Final trading pair
+            action: Final direction
+            
+        Returns:
+            Prepared order or None if nothing fresh matches
+        """
+        max_age = self.config.get('llm.streaming.max_prepared_age_seconds', 30)
+        
+        with self._speculative_lock:
+            entry = self._speculative_orders.pop((pair, action), None)
+            # Drop anything left over from mispredicted signals
+            now = time.time()
+            for key in [k for k, (ts, _) in self._speculative_orders.items() if now - ts > max_age]:
+                del self._speculative_orders[key]
+        
+        if entry is None or time.time() - entry[0] > max_age:
+            return None
+        
+        self.logger.info(f"Using speculatively prepared order for {pair} {action}")
+        return entry[1]
     
     def _handle_new_signal(self, signal: NewSignal, original_message: str, message_id: int):
         """Handle new trading signal"""
         print(f"\n  {colorize('📊 NEW SIGNAL DETECTED', 'cyan')}")
         
-        # Default to XAUUSD if pair missing or generic
-        if not signal.pair or signal.pair.upper() in ['GOLD', 'XAU', '']:
+        # Default to the provider's pair if missing, XAUUSD if missing or generic
+        if not signal.pair and self.provider.default_pair:
+            signal.pair = self.provider.default_pair
+            print(f"  ℹ No specific pair - defaulting to {signal.pair} ({self.provider.name})")
+        elif not signal.pair or signal.pair.upper() in ['GOLD', 'XAU', '']:
             signal.pair = 'XAUUSD'
             print(f"  ℹ No specific pair - defaulting to XAUUSD (Gold)")
         
@@ -366,7 +1811,7 @@ class TradingBot:
                 
                 # This is likely a completion of previous signal
                 print(f"  ℹ Detected potential signal completion ({time_diff:.0f}s after previous)")
-                active_trades = self.trade_manager.get_active_trades()
+                active_trades = self.trade_manager.get_active_trades(self.provider.trade_tag)
                 
                 if active_trades:
                     # Find most recent matching trade
@@ -476,7 +1921,7 @@ class TradingBot:
         take_profit = signal.take_profit or 0.0
         
         # Determine lot size
-        lot_size = signal.lot_size or self.config.get('risk.default_lot_size', 0.1)
+        lot_size = signal.lot_size or self._default_lot_size()
         
         # Validate lot size
         is_valid, error_msg = validate_lot_size(lot_size, self.config)
@@ -528,7 +1973,8 @@ class TradingBot:
                 stop_loss=stop_loss,
                 take_profit=take_profit,
                 deviation=self.config.get('mt5.deviation', 5),
-                comment=self.config.get('mt5.order_comment', 'TelegramBot')
+                comment=self.config.get('mt5.order_comment', 'TelegramBot'),
+                prepared=self._take_speculative_order(signal.pair, signal.action)
             )
             
         elif signal.execution_type == "pending":
@@ -648,7 +2094,8 @@ class TradingBot:
                     stop_loss=stop_loss,
                     take_profit=take_profit,
                     deviation=self.config.get('mt5.deviation', 5),
-                    comment=self.config.get('mt5.order_comment', 'TelegramBot')
+                    comment=self.config.get('mt5.order_comment', 'TelegramBot'),
+                    prepared=self._take_speculative_order(signal.pair, signal.action)
                 )
             else:
                 # Place pending order
@@ -693,6 +2140,8 @@ class TradingBot:
                 'mt5_ticket': ticket,
                 'original_message': original_message,
                 'telegram_msg_id': message_id,
+                'signal_provider': self.provider.trade_tag,
+                'partial_schedule': self.provider.partial_schedule or [],
                 'status': TradeStatus.PENDING.value if signal.execution_type == "pending" else TradeStatus.ACTIVE.value
             }
             
@@ -704,6 +2153,7 @@ class TradingBot:
             print_trade_summary(trade_data, color=True)
             
             # Track this signal for correlation
+            self.last_entry_trade_id = trade.trade_id
             self.last_signal_timestamp = datetime.now()
             self.last_signal_pair = signal.pair
             self.last_signal_action = signal.action
@@ -740,11 +2190,17 @@ class TradingBot:
         if is_close_all:
             print(f"\n  {colorize('🚨 CLOSE ALL DETECTED - Closing all positions and pending orders', 'yellow')}")
             
-            # Get all active trades
-            active_trades = self.trade_manager.get_active_trades()
+            # Get all active trades (of this provider)
+            provider_tag = self.provider.trade_tag
+            active_trades = self.trade_manager.get_active_trades(provider_tag)
             
             # Get all pending orders from MT5
             pending_orders = self.mt5_client.get_pending_orders()
+            if provider_tag is not None:
+                # Other providers' orders stay open
+                own_tickets = {trade.mt5_ticket for trade in self.trade_manager.trades.values()
+                               if trade.signal_provider == provider_tag}
+                pending_orders = [order for order in pending_orders if order['ticket'] in own_tickets]
             
             total_to_close = len(active_trades) + len(pending_orders)
             
@@ -786,52 +2242,18 @@ class TradingBot:
             return
         
         # Execute each action in sequence (normal multi-action flow)
-        for i, action_dict in enumerate(signal.actions, 1):
-            action_type = action_dict.get('type')
-            details = action_dict.get('details', {})
-            
-            print(f"\n  --- Action {i}/{len(signal.actions)}: {action_type.upper()} ---")
-            
-            if action_type == 'modify':
-                # Create ModifySignal from details
-                modify_signal = ModifySignal(
-                    action_type=details.get('action_type', 'modify_sl'),
-                    trade_reference=details.get('trade_reference'),
-                    new_stop_loss=details.get('new_stop_loss'),
-                    new_take_profit=details.get('new_take_profit'),
-                    confidence=signal.confidence,
-                    reasoning=f"Part of multi-action: {signal.reasoning}"
-                )
-                self._handle_modify_signal(modify_signal, original_message)
-            
-            elif action_type == 'close':
-                # Create CloseSignal from details
-                close_signal = CloseSignal(
-                    action_type=details.get('action_type', 'partial_close'),
-                    trade_reference=details.get('trade_reference'),
-                    close_percent=details.get('close_percent', 100.0),
-                    confidence=signal.confidence,
-                    reasoning=f"Part of multi-action: {signal.reasoning}"
-                )
-                self._handle_close_signal(close_signal, original_message)
-            
-            elif action_type == 'new_trade':
-                # Create NewSignal from details
-                new_signal = NewSignal(
-                    pair=details.get('pair'),
-                    action=details.get('action'),
-                    entry_price=details.get('entry_price', 0),
-                    stop_loss=details.get('stop_loss'),
-                    take_profit=details.get('take_profit'),
-                    lot_size=details.get('lot_size'),
-                    execution_type=details.get('execution_type', 'immediate'),
-                    confidence=signal.confidence,
-                    reasoning=f"Part of multi-action: {signal.reasoning}"
-                )
-                self._handle_new_signal(new_signal, original_message, None)
+        # Steps arrive as validated ModifySignal / CloseSignal / NewSignal
+        for i, step in enumerate(signal.actions, 1):
+            print(f"\n  --- Action {i}/{len(signal.actions)}: {step.signal_type.upper()} ---")
             
-            else:
-                print(f"  ⚠ Unknown action type: {action_type}")
+            if isinstance(step, ModifySignal):
+                self._handle_modify_signal(step, original_message)
+            
+            elif isinstance(step, CloseSignal):
+                self._handle_close_signal(step, original_message)
+            
+            elif isinstance(step, NewSignal):
+                self._handle_new_signal(step, original_message, None)
         
         print(f"\n  {colorize('✓ All actions completed', 'green')}")
     
@@ -861,7 +2283,7 @@ class TradingBot:
         new_tp = signal.new_take_profit if signal.new_take_profit else trade.take_profit
         
         # Handle special cases like "move to breakeven"
-        if "breakeven" in original_message.lower() or " be " in original_message.lower() or original_message.lower().endswith(" be"):
+        if signal.is_breakeven or "breakeven" in original_message.lower() or " be " in original_message.lower() or original_message.lower().endswith(" be"):
             # Smart BE logic based on profitability
             symbol_info = self.mt5_client.get_symbol_info(trade.pair)
             if symbol_info:
@@ -1072,17 +2494,32 @@ class TradingBot:
         """
         Find trade by reference string
         
+        A message replying to a signal targets the trade opened from that
+        signal, unless the reference names another open pair.
+        
         Args:
             reference: Reference to trade (pair name, description, etc.)
             
         Returns:
             Trade object or None
         """
-        active_trades = self.trade_manager.get_active_trades()
+        active_trades = self.trade_manager.get_active_trades(self.provider.trade_tag)
         
         if not active_trades:
             return None
         
+        if self._reply_to_msg_id is not None:
+            replied = [trade for trade in self.trade_manager.get_trades_by_message(
+                           self._reply_to_msg_id, self.provider.trade_tag)
+                       if trade.status == TradeStatus.ACTIVE.value]
+            if replied:
+                trade = replied[-1]
+                named = (reference or '').upper()
+                if not any(other.pair.upper() in named and other.pair.upper() != trade.pair.upper()
+                           for other in active_trades):
+                    self.logger.info(f"Reply to message {self._reply_to_msg_id} targets ticket {trade.mt5_ticket}")
+                    return trade
+        
         # If no reference, return most recent trade
         if not reference:
             return active_trades[0] if active_trades else None
@@ -1116,6 +2553,10 @@ class TradingBot:
             except Exception as e:
                 self.logger.warning(f"Error stopping listener: {e}")
         
+        # Held SL/TP fragments still belong on their trades
+        if self.coalescer:
+            self.coalescer.flush_all()
+        
         # Close MT5 connection
         if self.mt5_client:
             try:
@@ -1251,7 +2692,8 @@ class TradingBot:
                 try:
                     active_trades = self.trade_manager.get_active_trades()
                     trades_with_tps = [t for t in active_trades 
-                                       if t.tp_levels and len(t.tp_levels) > 0 and t.partials_taken < 4]
+                                       if t.tp_levels and len(t.tp_levels) > 0 and
+                                       t.get_next_partial_percentage() is not None]
                     
                     if not trades_with_tps:
                         time.sleep(5)  # Idle when no trades to monitor
@@ -1309,7 +2751,7 @@ class TradingBot:
             if not trade.tp_levels or len(trade.tp_levels) == 0:
                 continue
             
-            if trade.partials_taken >= 4:
+            if trade.get_next_partial_percentage() is None:
                 continue
             
             # Get current price
@@ -1325,7 +2767,7 @@ class TradingBot:
         percentage = trade.get_next_partial_percentage()
         
         if percentage is None:
-            self.logger.info(f"All partials taken for {trade.pair}, final 10% running")
+            self.logger.info(f"All partials taken for {trade.pair}, remainder running")
             return
         
         print(f"\n  {colorize('🎯 TP LEVEL HIT', 'green')}")
@@ -1381,8 +2823,8 @@ class TradingBot:
             total_closed = sum([p['percentage'] for p in trade.partial_history])
             print(f"  Remaining: {remaining_lots:.2f} lots ({100 - total_closed:.0f}%)")
             
-            if trade.partials_taken >= 4:
-                print(f"  {colorize('✓ Final 10% still running - all partials complete', 'green')}")
+            if trade.get_next_partial_percentage() is None:
+                print(f"  {colorize(f'✓ Final {100 - total_closed:.0f}% still running - all partials complete', 'green')}")
         else:
             self.logger.error(f"Partial close failed for {trade.pair}: {message}")
             print(f"  ✗ Partial close failed: {message}")
@@ -1460,6 +2902,28 @@ class REPL:
             self.cmd_stats()
         elif cmd == 'sync':
             self.cmd_sync()
+        elif cmd == 'parser':
+            self.cmd_parser()
+        elif cmd == 'templates':
+            self.cmd_templates()
+        elif cmd == 'cache':
+            self.cmd_cache()
+        elif cmd == 'noise':
+            self.cmd_noise(*args)
+        elif cmd == 'tiers':
+            self.cmd_tiers()
+        elif cmd == 'llmstats':
+            self.cmd_llmstats()
+        elif cmd == 'context':
+            self.cmd_context()
+        elif cmd == 'health':
+            self.cmd_health()
+        elif cmd == 'catchup':
+            self.cmd_catchup(*args)
+        elif cmd == 'queue':
+            self.cmd_queue()
+        elif cmd == 'providers':
+            self.cmd_providers()
         elif cmd == 'setlot':
             self.cmd_setlot(*args)
         elif cmd == 'lot':
@@ -1491,6 +2955,17 @@ class REPL:
         print("    maxlot <size> - Set maximum lot size (e.g., 'maxlot 5.0')")
         print("")
         print("  sync        - Sync trade manager with MT5 (close trades that no longer exist)")
+        print("  parser      - Show fast-path parser hit rate and verify-after-execute results")
+        print("  templates   - Show mined message templates and their hit counts")
+        print("  cache       - Show interpretation cache statistics")
+        print("  noise [threshold] - Show noise pre-filter stats / set drop threshold")
+        print("  tiers       - Show per-model latency, escalation rate and hedging")
+        print("  llmstats    - Show LLM call latency percentiles, tokens and cost")
+        print("  context     - Show LLM context size (tokens per call)")
+        print("  health      - Show LLM circuit breaker state and deferred messages")
+        print("  catchup [n] - Process up to n recent messages that were missed (default 200)")
+        print("  queue       - Show per-chat message queue depth, wait times, drops and sender cache")
+        print("  providers   - Show signal providers, their settings, messages and open trades")
         print("  pause       - Pause message processing")
         print("  resume      - Resume message processing")
         print("  help        - Show this help message")
@@ -1790,6 +3265,281 @@ class REPL:
             print(f"  Total P&L: {colorize(pnl_str, pnl_color)}")
         print()
     
+    def cmd_parser(self):
+        """Show fast-path parser hit rate"""
+        fast_parser = self.bot.llm_interpreter.fast_parser if self.bot.llm_interpreter else None
+        
+        if not fast_parser:
+            print("\nFast-path parser is disabled")
+            return
+        
+        stats = fast_parser.get_stats()
+        
+        print(f"\n{colorize('Fast-Path Parser:', 'cyan')}")
+        print(f"  Messages seen: {stats['attempts']}")
+        print(f"  Parsed locally: {stats['hits']} (LLM calls saved)")
+        print(f"  Sent to LLM: {stats['misses']}")
+        print(f"  Hit rate: {stats['hit_rate']:.1%}")
+        for signal_type, count in stats['by_type'].items():
+            print(f"    {signal_type}: {count}")
+        
+        if self.bot.verify_after_execute:
+            verification = self.bot.verification_stats
+            print(f"  Verify-after-execute: {verification['verified']} verified, "
+                  f"{verification['agreed']} agreed with the LLM")
+            print(f"    Corrected (SL/TP): {verification['corrected']} | "
+                  f"Unwound: {verification['unwound']} | Unverified: {verification['unverified']}")
+        print()
+    
+    def cmd_templates(self):
+        """Show mined message templates and how often each one answered locally"""
+        template_library = self.bot.llm_interpreter.template_library if self.bot.llm_interpreter else None
+        
+        if not template_library:
+            print("\nMessage templates are disabled")
+            return
+        
+        stats = template_library.get_stats()
+        
+        print(f"\n{colorize('Message Templates:', 'cyan')}")
+        if not stats['templates']:
+            print("  No templates loaded - run: python template_miner.py")
+            print()
+            return
+        print(f"  Templates: {stats['templates']}")
+        print(f"  Messages seen: {stats['attempts']} | Matched: {stats['hits']} | Coverage: {stats['hit_rate']:.1%}")
+        for template in sorted(template_library.templates.values(), key=lambda t: t['id']):
+            hits = stats['by_template'].get(template['id'], 0)
+            print(f"    {template['id']} {template['signal_type']:<10} hits {hits:>4} | "
+                  f"mined support {template['support']}, agreement with LLM {template['agreement']:.0%} | "
+                  f"{template['skeleton'][:40]}")
+        print()
+    
+    def cmd_cache(self):
+        """Show interpretation cache statistics"""
+        result_cache = self.bot.llm_interpreter.result_cache if self.bot.llm_interpreter else None
+        
+        if not result_cache:
+            print("\nInterpretation cache is disabled")
+            return
+        
+        stats = result_cache.get_stats()
+        
+        print(f"\n{colorize('Interpretation Cache:', 'cyan')}")
+        print(f"  Entries: {stats['size']}/{result_cache.max_size} (TTL {result_cache.ttl_seconds:.0f}s)")
+        print(f"  Hits: {stats['hits']} | Misses: {stats['misses']} | Hit rate: {stats['hit_rate']:.1%}")
+        print(f"  Evictions: {stats['evictions']} | Expired: {stats['expirations']}")
+        print(f"  Invalidations (trade set changed): {stats['invalidations']}")
+        
+        flights = self.bot.llm_interpreter.single_flight.get_stats()
+        print(f"  In-flight dedup: {flights['shared']} copies shared a request "
+              f"({flights['requests']} requests, {flights['in_flight']} in flight)")
+        if self.bot.execution_guard:
+            print(f"  Duplicate signals blocked: {self.bot.execution_guard.blocked}")
+        print()
+    
+    def cmd_noise(self, *args):
+        """Show noise pre-filter statistics or set its threshold"""
+        noise_filter = self.bot.noise_filter
+        
+        if not noise_filter:
+            print("\nNoise pre-filter is disabled")
+            return
+        
+        if args:
+            try:
+                threshold = float(args[0])
+                if not 0 <= threshold <= 1:
+                    print("✗ Threshold must be between 0 and 1")
+                    return
+                noise_filter.threshold = threshold
+                print(f"✓ Noise threshold set to {threshold}")
+            except ValueError:
+                print(f"✗ Invalid threshold. Must be a number")
+            return
+        
+        stats = noise_filter.get_stats()
+        
+        print(f"\n{colorize('Noise Pre-Filter:', 'cyan')}")
+        print(f"  Model: {'trained' if stats['model_loaded'] else 'built-in weights'}")
+        print(f"  Threshold: {stats['threshold']}")
+        print(f"  Checked: {stats['checked']} | Dropped: {stats['dropped']} | Forwarded: {stats['forwarded']}")
+        print(f"  Drop rate: {stats['drop_rate']:.1%}")
+        if noise_filter.drop_log:
+            print(f"  Drops logged to: {noise_filter.drop_log}")
+        print()
+    
+    def cmd_tiers(self):
+        """Show per-tier LLM latency and escalation statistics"""
+        if not self.bot.llm_interpreter:
+            print("\nLLM interpreter not initialized")
+            return
+        
+        interpreter = self.bot.llm_interpreter
+        
+        print(f"\n{colorize('LLM Model Tiers:', 'cyan')} (escalate below confidence {interpreter.escalation_confidence})")
+        for i, stats in enumerate(interpreter.get_tier_stats(), 1):
+            print(f"  {i}. {stats['model']}")
+            print(f"     Calls: {stats['calls']} | Escalated: {stats['escalations']} ({stats['escalation_rate']:.1%})"
+                  f" | Low confidence: {stats['low_confidence']} | Invalid: {stats['invalid']}")
+            print(f"     Latency: mean {stats['latency_mean_ms']:.0f}ms | p50 {stats['latency_p50_ms']:.0f}ms"
+                  f" | p95 {stats['latency_p95_ms']:.0f}ms")
+        
+        if interpreter.hedging:
+            hedging = interpreter.hedging.get_stats()
+            print(f"  Hedging (p{interpreter.hedging.percentile:g}): {hedging['hedges']}/{hedging['calls']} calls hedged"
+                  f" ({hedging['hedge_rate']:.1%}), duplicate won {hedging['hedge_wins']},"
+                  f" denied by budget {hedging['budget_denied']}")
+        print()
+    
+    def cmd_llmstats(self):
+        """Show per-call LLM latency, token and cost statistics"""
+        if not self.bot.llm_interpreter:
+            print("\nLLM interpreter not initialized")
+            return
+        
+        stats = self.bot.llm_interpreter.metrics.get_stats()
+        totals = stats['totals']
+        
+        print(f"\n{colorize('LLM Calls:', 'cyan')} (last {stats['window_calls']} calls)")
+        print(f"  Calls: {totals['calls']} for {totals['messages']} messages | Retries: {totals['retries']}"
+              f" | Errors: {totals['errors']}")
+        if stats['errors']:
+            print("  Errors by type: " + ", ".join(f"{name} {count}" for name, count in stats['errors'].items()))
+        print(f"  Latency: p50 {stats['latency_p50_ms']:.0f}ms | p95 {stats['latency_p95_ms']:.0f}ms"
+              f" | p99 {stats['latency_p99_ms']:.0f}ms | max {stats['latency_max_ms']:.0f}ms")
+        
+        if stats['window_calls']:
+            peak = max(count for _, count in stats['latency_histogram']) or 1
+            print("  Latency histogram (ms):")
+            for label, count in stats['latency_histogram']:
+                print(f"    {label:>7} {'█' * round(20 * count / peak):<20} {count}")
+            print("  Confidence: " + " | ".join(f"{label} {count}" for label, count in stats['confidence_histogram']))
+            print("  Tools: " + ", ".join(f"{tool} {count}" for tool, count in
+                                          sorted(stats['by_tool'].items(), key=lambda t: -t[1])))
+        
+        print(f"  Tokens per call: input {stats['mean_input_tokens']:.0f} | output {stats['mean_output_tokens']:.0f}"
+              f" | cache read {stats['mean_cache_read_tokens']:.0f}")
+        print(f"  Tokens total: input {totals['input_tokens']} | output {totals['output_tokens']}"
+              f" | cache read {totals['cache_read_tokens']} | cache write {totals['cache_write_tokens']}")
+        print(f"  Cost: ${totals['cost']:.4f} total | ${stats['cost_per_message']:.5f}/message"
+              f" | ${stats['cost_per_hour']:.4f}/hour")
+        
+        for model, model_stats in stats['by_model'].items():
+            print(f"  {model}: {model_stats['calls']} calls | p50 {model_stats['p50_ms']:.0f}ms"
+                  f" | p95 {model_stats['p95_ms']:.0f}ms | ${model_stats['cost']:.4f}")
+        print()
+    
+    def cmd_context(self):
+        """Show LLM context size statistics"""
+        if not self.bot.llm_interpreter:
+            print("\nLLM interpreter not initialized")
+            return
+        
+        stats = self.bot.llm_interpreter.context_builder.get_stats()
+        budget = stats['token_budget'] if stats['token_budget'] is not None else 'unlimited'
+        
+        print(f"\n{colorize('LLM Context:', 'cyan')} (budget {budget} tokens)")
+        print(f"  Calls: {stats['calls']}")
+        print(f"  Tokens: last ~{stats['last_tokens']} | mean ~{stats['mean_tokens']:.0f} | max ~{stats['max_tokens']}")
+        print(f"  Trimmed calls: {stats['trimmed_calls']} ({stats['lines_dropped']} lines dropped)")
+        print(f"  Lines rendered: {stats['lines_rendered']} (rest reused from cache)")
+        
+        example_selector = self.bot.llm_interpreter.example_selector
+        if example_selector:
+            few_shot = example_selector.get_stats()
+            print(f"  Few-shot: {few_shot['indexed']} examples indexed, "
+                  f"{few_shot['avg_examples']:.1f} added per call (max {few_shot['k']})")
+        print()
+    
+    def cmd_health(self):
+        """Show LLM circuit breaker state and deferred message queue"""
+        if not self.bot.llm_interpreter:
+            print("\nLLM interpreter not initialized")
+            return
+        
+        breaker = self.bot.llm_interpreter.circuit_breaker
+        stats = breaker.get_stats()
+        state_color = {'closed': 'green', 'half_open': 'yellow', 'open': 'red'}[stats['state']]
+        
+        print(f"\n{colorize('LLM Health:', 'cyan')}")
+        print(f"  Circuit: {colorize(stats['state'].upper(), state_color)}"
+              f" (opens after {breaker.failure_threshold} failures, cooldown {breaker.cooldown_seconds:.0f}s)")
+        print(f"  Request deadline: {self.bot.llm_interpreter.request_timeout}s")
+        print(f"  Failures: {stats['failures']} (timeouts: {stats['timeouts']}) | Opened: {stats['opened']}")
+        print(f"  Calls short-circuited to local fallback: {stats['short_circuited']}")
+        print(f"  Deferred messages waiting: {len(self.bot.deferred_messages)}")
+        print()
+    
+    def cmd_catchup(self, *args):
+        """Process recent messages that were not delivered live"""
+        if not self.bot.telegram_client or not self.bot.selected_chat_id:
+            print("\nTelegram not connected")
+            return
+        
+        limit = None
+        if args:
+            try:
+                limit = int(args[0])
+            except ValueError:
+                print(f"Invalid message count: {args[0]}")
+                return
+        
+        counts = self.bot.catch_up(limit=limit, reason="manual")
+        if not counts['fetched']:
+            print("\nNo missed messages")
+    
+    def cmd_queue(self):
+        """Show per-chat message queue statistics"""
+        if not self.bot.telegram_client:
+            print("\nTelegram not connected")
+            return
+        
+        queues = self.bot.telegram_client.get_queue_stats()
+        print(f"\n{colorize('Message Queues:', 'cyan')}")
+        if not queues:
+            print("  No messages received yet")
+        for chat_id, stats in queues.items():
+            provider = self.bot.providers.get(chat_id)
+            print(f"  Chat {chat_id}{f' ({provider.name})' if provider else ''}:")
+            print(f"    Depth: {stats['depth']}/{stats['max_size']} (max seen {stats['max_depth']})")
+            print(f"    Enqueued: {stats['enqueued']} | Processed: {stats['processed']}")
+            print(f"    Wait: p50 {stats['wait_p50_ms']:.0f}ms | p95 {stats['wait_p95_ms']:.0f}ms"
+                  f" | max {stats['wait_max_ms']:.0f}ms")
+            print(f"    Dropped: {stats['dropped_noise']} noise, {stats['dropped_normal']} other"
+                  f" | Follow-ups admitted over limit: {stats['overflow']}")
+        
+        if self.bot.coalescer:
+            bursts = self.bot.coalescer.get_stats()
+            print(f"  Burst coalescing: {bursts['fragments']} SL/TP fragments in {bursts['bursts']} modifications "
+                  f"({bursts['modifications_saved']} MT5 calls saved, {bursts['waiting']} waiting)")
+        
+        senders = self.bot.telegram_client.get_sender_cache_stats()
+        print(f"  Sender cache: {senders['size']}/{senders['max_size']} "
+              f"({senders['prewarmed']} pre-warmed) | Hit rate: {senders['hit_rate']:.0%} "
+              f"({senders['hits']} hits, {senders['misses']} misses)")
+        print()
+    
+    def cmd_providers(self):
+        """Show configured signal providers"""
+        if not self.bot.providers:
+            print("\nSingle chat mode (no providers configured in config.yaml)")
+            return
+        
+        default_lot = self.bot.config.get('risk.default_lot_size', 0.1)
+        print(f"\n{colorize('Signal Providers:', 'cyan')} ({len(self.bot.providers)})")
+        print("-" * 70)
+        for provider in self.bot.providers.values():
+            trades = self.bot.trade_manager.get_active_trades(provider.trade_tag)
+            schedule = provider.partial_schedule or DEFAULT_PARTIAL_SCHEDULE
+            print(f"{colorize(provider.name, 'magenta')} (chat {provider.chat_id})")
+            print(f"  Default pair: {provider.default_pair or '-'} | "
+                  f"Lot size: {provider.default_lot_size or default_lot}")
+            print(f"  Partials: {' / '.join(f'{p}%' for p in schedule)}")
+            print(f"  Messages: {provider.messages} | Open trades: {len(trades)} | "
+                  f"Last pair: {provider.last_executed_pair or '-'}")
+        print()
+    
     def cmd_sync(self):
         """Sync trade manager with MT5 - close trades that no longer exist"""
         print(f"\n{colorize('Syncing with MT5...', 'cyan')}")
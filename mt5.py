@@ -164,6 +164,60 @@ class MT5Client:
             'volume_step': symbol_info.volume_step,
         }
     
+    def prepare_market_order(self,
+                             symbol: str,
+                             order_type: str,
+                             lot_size: float,
+                             deviation: int = 5,
+                             comment: str = "TelegramBot") -> Optional[Dict[str, Any]]:
+        """
+        Speculatively prepare a market order before the full signal is known
+        
+        Selects the symbol, warms its tick and pre-builds the request so that
+        place_market_order only has to refresh the price and fill in SL/TP.
+        
+        Args:
+            symbol: Trading symbol (e.g., EURUSD)
+            order_type: "BUY" or "SELL"
+            lot_size: Expected position size in lots
+            deviation: Maximum price deviation in points
+            comment: Order comment
+            
+        Returns:
+            Prepared order dictionary or None if the symbol is unavailable
+        """
+        if order_type.upper() not in ("BUY", "SELL"):
+            return None
+        
+        # Selects the symbol in Market Watch and loads its properties
+        symbol_info = self.get_symbol_info(symbol)
+        if symbol_info is None:
+            return None
+        
+        # Touch the tick so the terminal has a fresh quote cached
+        mt5.symbol_info_tick(symbol)
+        
+        trade_type = mt5.ORDER_TYPE_BUY if order_type.upper() == "BUY" else mt5.ORDER_TYPE_SELL
+        
+        self.logger.info(f"Prepared speculative {order_type.upper()} order for {symbol}")
+        
+        return {
+            'symbol': symbol,
+            'order_type': order_type.upper(),
+            'lot_size': lot_size,
+            'symbol_info': symbol_info,
+            'request': {
+                "action": mt5.TRADE_ACTION_DEAL,
+                "symbol": symbol,
+                "type": trade_type,
+                "deviation": deviation,
+                "magic": self.magic_number,
+                "comment": comment,
+                "type_time": mt5.ORDER_TIME_GTC,
+            },
+            'prepared_at': datetime.now().isoformat(),
+        }
+    
     def place_market_order(self, 
                           symbol: str, 
                           order_type: str, 
@@ -171,7 +225,8 @@ class MT5Client:
                           stop_loss: float = 0.0,
                           take_profit: float = 0.0,
                           deviation: int = 5,
-                          comment: str = "TelegramBot") -> Tuple[bool, Optional[int], str]:
+                          comment: str = "TelegramBot",
+                          prepared: Optional[Dict[str, Any]] = None) -> Tuple[bool, Optional[int], str]:
         """
         Place a market order
         
@@ -183,6 +238,7 @@ class MT5Client:
             take_profit: Take profit price (0 for no TP)
             deviation: Maximum price deviation in points
             comment: Order comment
+            prepared: Order from prepare_market_order (skips symbol lookup)
             
         Returns:
             Tuple of (success, ticket_number, message)
@@ -190,8 +246,17 @@ class MT5Client:
         if not self.check_connection():
             return False, None, "Not connected to MT5"
         
+        # Reuse a speculatively prepared order if it matches - only the quote is refreshed
+        symbol_info = None
+        if (prepared and prepared['symbol'] == symbol
+                and prepared['order_type'] == order_type.upper()):
+            tick = mt5.symbol_info_tick(symbol)
+            if tick is not None:
+                symbol_info = dict(prepared['symbol_info'], bid=tick.bid, ask=tick.ask)
+        
         # Get symbol info
-        symbol_info = self.get_symbol_info(symbol)
+        if symbol_info is None:
+            symbol_info = self.get_symbol_info(symbol)
         if symbol_info is None:
             return False, None, f"Failed to get symbol info for {symbol}"
         
@@ -231,22 +296,30 @@ class MT5Client:
         
         last_error_msg = ""
         
-        for filling_mode in filling_modes:
-            # Prepare order request
-            request = {
+        # Static part of the request (pre-built when the order was prepared)
+        if prepared and prepared['symbol'] == symbol and prepared['order_type'] == order_type.upper():
+            base_request = dict(prepared['request'])
+        else:
+            base_request = {
                 "action": mt5.TRADE_ACTION_DEAL,
                 "symbol": symbol,
-                "volume": lot_size,
                 "type": trade_type,
-                "price": price,
-                "sl": stop_loss,
-                "tp": take_profit,
                 "deviation": deviation,
                 "magic": self.magic_number,
                 "comment": comment,
                 "type_time": mt5.ORDER_TIME_GTC,
-                "type_filling": filling_mode,
             }
+        
+        for filling_mode in filling_modes:
+            # Prepare order request
+            request = dict(base_request)
+            request.update({
+                "volume": lot_size,
+                "price": price,
+                "sl": stop_loss,
+                "tp": take_profit,
+                "type_filling": filling_mode,
+            })
             
             # Send order
             self.logger.info(f"Placing {order_type} order: {symbol} {lot_size} lots @ {price} (filling: {filling_names[filling_mode]})")
@@ -0,0 +1,471 @@
+"""
+Noise Filter - Cheap local pre-classifier in front of the LLM
+
+Most group messages (greetings, emojis, screenshot captions, market commentary)
+end in NoSignal. This module scores each message with a small logistic
+regression over hand-made keyword/number-density features and hashed character
+n-grams, and drops clear noise before an LLM call is made.
+
+The model is trained offline from the message log the bot writes
+(llm.noise_filter.training_log), e.g.:
+
+    python noise_filter.py train data/message_log.jsonl --output data/noise_model.json
+    python noise_filter.py evaluate data/message_log.jsonl --model data/noise_model.json
+
+Without a trained model the built-in feature weights are used, which only drop
+messages that have no trading vocabulary and no prices at all.
+"""
+
+import re
+import json
+import math
+import zlib
+import random
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Tuple
+
+
+# ============================================================================
+# Features
+# ============================================================================
+
+# Vocabulary of signals and follow-ups (see config.yaml llm.system_prompt)
+TRADING_KEYWORDS = [
+    'BUY', 'SELL', 'LONG', 'SHORT', 'NOW', 'ENTRY', 'ENTER', 'RANGE', 'ZONE', 'LIMIT',
+    'SL', 'TP', 'STOP', 'TARGET', 'TARGETS', 'PROFIT', 'PROFITS', 'PARTIAL', 'PARTIALS',
+    'BE', 'BREAKEVEN', 'CLOSE', 'CLOSED', 'EXIT', 'SECURE', 'LOCK', 'BOOK', 'HALF',
+    'TRADE', 'POSITION', 'POSITIONS', 'ORDER', 'ORDERS', 'PENDING', 'CANCEL', 'DELETE',
+    'MOVE', 'SET', 'LOT', 'LOTS', 'RISK',
+]
+
+# Messages matching this are always forwarded, whatever the model says
+ALWAYS_FORWARD_PATTERN = re.compile(
+    r'\b(?:BUY|SELL|SL|TP\d?|S/L|T/P|BE|BREAKEVEN|BREAK\s+EVEN|CLOSE|CLOSED|EXIT|CUT|PARTIALS?'
+    r'|SECURE|CANCEL|DELETE)\b'
+)
+
+WORD_PATTERN = re.compile(r"[A-Z][A-Z/']*")
+NUMBER_PATTERN = re.compile(r'\d+(?:\.\d+)?')
+EMOJI_PATTERN = re.compile('[\U0001F000-\U0001FAFF☀-➿]')
+
+# Built-in weights used until a model has been trained
+DEFAULT_WEIGHTS = {
+    'bias': -3.0,
+    'keyword_count': 2.5,
+    'has_direction': 3.0,
+    'has_level': 2.0,
+    'price_count': 1.5,
+    'number_density': 2.0,
+    'emoji_ratio': -2.0,
+    'log_length': 0.0,
+    'question': -1.0,
+}
+
+_keyword_set = set(TRADING_KEYWORDS)
+
+
+def _stable_hash(text: str) -> int:
+    """Hash that is identical across processes (str hash() is salted)"""
+    return zlib.crc32(text.encode('utf-8'))
+
+
+class NoiseFilter:
+    """
+    Scores messages and drops the ones that are clearly not trading signals
+    """
+
+    def __init__(self,
+                 threshold: float = 0.2,
+                 model_path: Optional[str] = None,
+                 drop_log: Optional[str] = None,
+                 training_log: Optional[str] = None):
+        """
+        Initialize noise filter
+
+        Args:
+            threshold: Messages scoring below this signal probability are dropped
+            model_path: JSON model written by `python noise_filter.py train`
+            drop_log: JSONL file every dropped message is appended to (for auditing)
+            training_log: JSONL file interpreted messages are appended to (training data)
+        """
+        self.logger = logging.getLogger('TradingBot.NoiseFilter')
+        self.threshold = threshold
+        self.drop_log = drop_log
+        self.training_log = training_log
+
+        # Model parameters
+        self.ngram_range: Tuple[int, int] = (2, 4)
+        self.num_buckets = 2 ** 16
+        self.weights: Dict[str, float] = dict(DEFAULT_WEIGHTS)
+        self.bucket_weights: Dict[int, float] = {}
+        self.model_loaded = False
+
+        if model_path:
+            self.load(model_path)
+
+        self.stats: Dict[str, int] = {
+            'checked': 0,
+            'dropped': 0,
+            'forwarded': 0,
+        }
+
+    # ------------------------------------------------------------------
+    # Feature extraction
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def extract_features(message: str) -> Dict[str, float]:
+        """
+        Compute the hand-made features for a message
+
+        Args:
+            message: Raw message text
+
+        Returns:
+            Dictionary of feature name to value
+        """
+        text = message.upper()
+        words = WORD_PATTERN.findall(text)
+        numbers = NUMBER_PATTERN.findall(text)
+        length = max(len(text), 1)
+
+        keyword_count = sum(1 for w in words if w in _keyword_set)
+        digits = sum(len(n) for n in numbers)
+
+        return {
+            'bias': 1.0,
+            'keyword_count': min(keyword_count, 4),
+            'has_direction': 1.0 if any(w in ('BUY', 'SELL', 'LONG', 'SHORT') for w in words) else 0.0,
+            'has_level': 1.0 if any(w in ('SL', 'TP', 'ENTRY', 'STOP', 'TARGET') for w in words) else 0.0,
+            # Prices have 3+ significant digits (4450, 1.0850) - "2 hours" does not count
+            'price_count': min(sum(1 for n in numbers if len(n.replace('.', '')) >= 3), 4),
+            'number_density': digits / length,
+            'emoji_ratio': len(EMOJI_PATTERN.findall(message)) / length,
+            'log_length': math.log(length),
+            'question': 1.0 if '?' in text else 0.0,
+        }
+
+    def _ngram_buckets(self, message: str) -> List[int]:
+        """Hashed character n-grams of the normalized message"""
+        text = f" {' '.join(message.upper().split())} "
+        low, high = self.ngram_range
+        return [
+            _stable_hash(text[i:i + n]) % self.num_buckets
+            for n in range(low, high + 1)
+            for i in range(len(text) - n + 1)
+        ]
+
+    # ------------------------------------------------------------------
+    # Scoring
+    # ------------------------------------------------------------------
+
+    def score(self, message: str) -> float:
+        """
+        Probability that a message is a trading signal or follow-up
+
+        Args:
+            message: Raw message text
+
+        Returns:
+            Probability between 0 and 1
+        """
+        features = self.extract_features(message)
+        z = sum(self.weights.get(name, 0.0) * value for name, value in features.items())
+
+        if self.bucket_weights:
+            buckets = self._ngram_buckets(message)
+            if buckets:
+                scale = 1.0 / len(buckets)
+                z += scale * sum(self.bucket_weights.get(b, 0.0) for b in buckets)
+
+        return 1.0 / (1.0 + math.exp(-max(min(z, 30.0), -30.0)))
+
+    def is_noise(self, message: str) -> bool:
+        """
+        Decide whether a message can skip the LLM
+
+        Every drop is logged (and appended to the drop log if configured) so
+        false negatives can be audited.
+
+        Args:
+            message: Raw message text
+
+        Returns:
+            True if the message should be dropped
+        """
+        self.stats['checked'] += 1
+
+        if ALWAYS_FORWARD_PATTERN.search(message.upper()):
+            self.stats['forwarded'] += 1
+            return False
+
+        probability = self.score(message)
+        if probability >= self.threshold:
+            self.stats['forwarded'] += 1
+            return False
+
+        self.stats['dropped'] += 1
+        self.logger.info(f"Dropped as noise (p={probability:.3f} < {self.threshold}): {message[:100]!r}")
+
+        if self.drop_log:
+            self._append_jsonl(self.drop_log, {
+                'timestamp': datetime.now().isoformat(),
+                'text': message,
+                'score': round(probability, 4),
+                'threshold': self.threshold,
+            })
+
+        return True
+
+    def record(self, message: str, signal_type: str,
+               interpretation: Optional[Dict[str, Any]] = None):
+        """
+        Append an interpreted message to the training log
+
+        Args:
+            message: Raw message text
+            signal_type: signal_type the interpreter returned ("none" for noise)
+            interpretation: Full interpreted signal (used by template_miner.py)
+        """
+        if self.training_log:
+            entry = {
+                'timestamp': datetime.now().isoformat(),
+                'text': message,
+                'signal_type': signal_type,
+            }
+            if interpretation is not None:
+                entry['interpretation'] = interpretation
+            self._append_jsonl(self.training_log, entry)
+
+    def _append_jsonl(self, path: str, entry: Dict[str, Any]):
+        """Append one JSON line, never letting logging break the pipeline"""
+        try:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            with open(path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        except Exception as e:
+            self.logger.warning(f"Failed to write {path}: {e}")
+
+    @property
+    def drop_rate(self) -> float:
+        """Fraction of checked messages that were dropped"""
+        checked = self.stats['checked']
+        return self.stats['dropped'] / checked if checked else 0.0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get filter statistics
+
+        Returns:
+            Dictionary with checked/dropped/forwarded counts, drop rate and threshold
+        """
+        return {
+            **self.stats,
+            'drop_rate': self.drop_rate,
+            'threshold': self.threshold,
+            'model_loaded': self.model_loaded,
+        }
+
+    # ------------------------------------------------------------------
+    # Training (offline)
+    # ------------------------------------------------------------------
+
+    def train(self,
+              messages: List[str],
+              labels: List[int],
+              epochs: int = 20,
+              learning_rate: float = 0.5,
+              l2: float = 1e-4,
+              seed: int = 42):
+        """
+        Fit the logistic regression with SGD
+
+        Signals are rare, so positives are weighted by the class ratio.
+
+        Args:
+            messages: Message texts
+            labels: 1 for signals/follow-ups, 0 for noise
+            epochs: Passes over the data
+            learning_rate: SGD step size
+            l2: L2 regularization strength
+            seed: Shuffle seed (training is deterministic)
+        """
+        samples = []
+        for message, label in zip(messages, labels):
+            buckets = self._ngram_buckets(message)
+            samples.append((self.extract_features(message), buckets, label))
+
+        positives = sum(labels)
+        negatives = len(labels) - positives
+        positive_weight = negatives / positives if positives else 1.0
+
+        weights = {name: 0.0 for name in DEFAULT_WEIGHTS}
+        bucket_weights: Dict[int, float] = {}
+        rng = random.Random(seed)
+
+        for epoch in range(epochs):
+            rng.shuffle(samples)
+            lr = learning_rate / (1 + epoch)
+            for features, buckets, label in samples:
+                scale = 1.0 / len(buckets) if buckets else 0.0
+                z = sum(weights[name] * value for name, value in features.items())
+                z += scale * sum(bucket_weights.get(b, 0.0) for b in buckets)
+                p = 1.0 / (1.0 + math.exp(-max(min(z, 30.0), -30.0)))
+
+                gradient = (p - label) * (positive_weight if label else 1.0)
+                for name, value in features.items():
+                    weights[name] -= lr * (gradient * value + l2 * weights[name])
+                for b in buckets:
+                    w = bucket_weights.get(b, 0.0)
+                    bucket_weights[b] = w - lr * (gradient * scale + l2 * w)
+
+        self.weights = weights
+        self.bucket_weights = {b: w for b, w in bucket_weights.items() if abs(w) > 1e-6}
+        self.model_loaded = True
+        self.logger.info(f"Trained on {len(samples)} messages ({positives} signals, {negatives} noise)")
+
+    def save(self, path: str):
+        """
+        Save model parameters as JSON
+
+        Args:
+            path: Output file
+        """
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'version': 1,
+                'trained_at': datetime.now().isoformat(),
+                'ngram_range': list(self.ngram_range),
+                'num_buckets': self.num_buckets,
+                'weights': self.weights,
+                'bucket_weights': {str(b): round(w, 6) for b, w in self.bucket_weights.items()},
+            }, f)
+
+    def load(self, path: str) -> bool:
+        """
+        Load model parameters saved by save()
+
+        Args:
+            path: Model file
+
+        Returns:
+            True if loaded, False if missing/invalid (built-in weights stay active)
+        """
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+
+            self.ngram_range = tuple(data['ngram_range'])
+            self.num_buckets = data['num_buckets']
+            self.weights = {**DEFAULT_WEIGHTS, **data['weights']}
+            self.bucket_weights = {int(b): w for b, w in data['bucket_weights'].items()}
+            self.model_loaded = True
+
+            self.logger.info(f"Loaded noise model from {path} ({len(self.bucket_weights)} n-gram weights)")
+            return True
+
+        except FileNotFoundError:
+            self.logger.warning(f"Noise model {path} not found - using built-in weights")
+        except Exception as e:
+            self.logger.error(f"Failed to load noise model {path}: {e}")
+        return False
+
+
+def load_training_log(path: str) -> Tuple[List[str], List[int]]:
+    """
+    Read messages and labels from a training log
+
+    Args:
+        path: JSONL file written by NoiseFilter.record()
+
+    Returns:
+        Tuple of (messages, labels) - messages that failed interpretation are skipped
+    """
+    messages, labels = [], []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            entry = json.loads(line)
+            if not entry.get('text') or not entry.get('signal_type'):
+                continue
+            messages.append(entry['text'])
+            labels.append(0 if entry['signal_type'] == 'none' else 1)
+    return messages, labels
+
+
+def evaluate(noise_filter: NoiseFilter, messages: List[str], labels: List[int]) -> Dict[str, Any]:
+    """
+    Measure how the filter would have behaved on labelled messages
+
+    Args:
+        noise_filter: Filter to evaluate (its threshold is used)
+        messages: Message texts
+        labels: 1 for signals/follow-ups, 0 for noise
+
+    Returns:
+        Dictionary with drop rate, false negatives (signals dropped) and the
+        highest threshold that would not have dropped any signal
+    """
+    dropped_signals = []
+    dropped_noise = 0
+    safe_threshold = 1.0
+
+    for message, label in zip(messages, labels):
+        forced = bool(ALWAYS_FORWARD_PATTERN.search(message.upper()))
+        probability = 1.0 if forced else noise_filter.score(message)
+        if label:
+            safe_threshold = min(safe_threshold, probability)
+        if probability < noise_filter.threshold:
+            if label:
+                dropped_signals.append(message)
+            else:
+                dropped_noise += 1
+
+    noise_total = labels.count(0)
+    return {
+        'messages': len(messages),
+        'signals': sum(labels),
+        'noise_dropped': dropped_noise,
+        'noise_drop_rate': dropped_noise / noise_total if noise_total else 0.0,
+        'false_negatives': dropped_signals,
+        'max_safe_threshold': safe_threshold,
+    }
+
+
+# Offline training / evaluation
+if __name__ == "__main__":
+    import argparse
+
+    logging.basicConfig(level=logging.INFO)
+
+    parser = argparse.ArgumentParser(description="Train or evaluate the noise pre-filter")
+    parser.add_argument('command', choices=['train', 'evaluate'])
+    parser.add_argument('log', help="Training log (JSONL with text and signal_type)")
+    parser.add_argument('--model', default='data/noise_model.json', help="Model file to evaluate")
+    parser.add_argument('--output', default='data/noise_model.json', help="Where to save a trained model")
+    parser.add_argument('--threshold', type=float, default=0.2)
+    parser.add_argument('--epochs', type=int, default=20)
+    args = parser.parse_args()
+
+    messages, labels = load_training_log(args.log)
+    print(f"Loaded {len(messages)} messages ({sum(labels)} signals)")
+
+    noise_filter = NoiseFilter(threshold=args.threshold)
+    if args.command == 'train':
+        noise_filter.train(messages, labels, epochs=args.epochs)
+        noise_filter.save(args.output)
+        print(f"✓ Model saved to {args.output}")
+    else:
+        noise_filter.load(args.model)
+
+    report = evaluate(noise_filter, messages, labels)
+    print(f"Noise dropped: {report['noise_dropped']} ({report['noise_drop_rate']:.0%})")
+    print(f"Signals dropped (false negatives): {len(report['false_negatives'])}")
+    for message in report['false_negatives']:
+        print(f"  - {message[:80]!r}")
+    print(f"Highest threshold with no false negatives: {report['max_safe_threshold']:.3f}")
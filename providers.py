@@ -0,0 +1,173 @@
+"""
+Providers - Per-chat signal provider settings and conversation state
+
+One bot process can follow several signal providers (Telegram chats). Each
+provider has its own settings, overriding the global ones when set:
+
+    providers:
+      - chat_id: -1001234567890
+        name: "GoldDesk"
+        default_pair: "XAUUSD"
+        default_lot_size: 0.05
+        partial_schedule: [50, 25, 15]   # % closed at TP1, TP2, TP3 (rest runs)
+        system_prompt: |
+          ...
+
+and its own conversation state (recent messages, last executed pair,
+signal-correlation fields), so a "SL 4450" from one provider can never
+complete another provider's entry.
+
+The provider a piece of work belongs to is carried in a context variable,
+set when a message enters the pipeline (and copied into worker threads).
+"""
+
+import asyncio
+import contextvars
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Optional, List, Dict, Any, Callable
+
+
+@dataclass
+class Provider:
+    """
+    Settings and conversation state of one signal provider (chat)
+    """
+    chat_id: Optional[int]  # None = default provider (single-chat mode)
+    name: str
+
+    # Settings (None = use the global config)
+    default_pair: Optional[str] = None
+    default_lot_size: Optional[float] = None
+    partial_schedule: Optional[List[int]] = None
+    system_prompt: Optional[str] = None
+
+    # Conversation state
+    recent_messages: List[Dict[str, Any]] = field(default_factory=list)
+    last_executed_pair: Optional[str] = None
+    last_signal_time: Optional[str] = None
+    last_signal_timestamp: Optional[datetime] = None
+    last_signal_pair: Optional[str] = None
+    last_signal_action: Optional[str] = None
+    last_signal_had_sltp: bool = True
+    last_entry_trade_id: Optional[str] = None
+    commit_tail: Optional[asyncio.Future] = None
+
+    # Interpreter sharing the bot's LLM client/caches but with this provider's defaults
+    interpreter: Optional[Any] = None
+
+    # Counters
+    messages: int = 0
+
+    @property
+    def trade_tag(self) -> Optional[str]:
+        """Value stored in Trade.signal_provider (None for the default provider)"""
+        return None if self.chat_id is None else self.name
+
+    def guard_key(self, content: str) -> str:
+        """
+        Scope duplicate-execution content to this provider
+
+        Args:
+            content: Normalized message content
+
+        Returns:
+            Content key (identical signals from different providers are independent)
+        """
+        if self.chat_id is None:
+            return content
+        return f"{self.chat_id}|{content}"
+
+
+def load_providers(entries: Optional[List[Dict[str, Any]]]) -> List[Provider]:
+    """
+    Build providers from the `providers` config section
+
+    Args:
+        entries: List of provider dictionaries (chat_id required)
+
+    Returns:
+        List of Provider objects in config order
+
+    Raises:
+        ValueError: If an entry has no chat_id, a chat or name is listed twice,
+            or a partial schedule closes more than 100%
+    """
+    providers = []
+    seen = set()
+    names = set()
+
+    for i, entry in enumerate(entries or [], 1):
+        chat_id = entry.get('chat_id')
+        if chat_id is None:
+            raise ValueError(f"Provider #{i} has no chat_id")
+        chat_id = int(chat_id)
+        if chat_id in seen:
+            raise ValueError(f"Chat {chat_id} is listed twice in providers")
+        seen.add(chat_id)
+        name = entry.get('name') or str(chat_id)
+        if name in names:
+            raise ValueError(f"Provider name '{name}' is used twice (trades are tagged by name)")
+        names.add(name)
+
+        schedule = entry.get('partial_schedule')
+        if schedule is not None:
+            schedule = [int(p) for p in schedule]
+            if sum(schedule) > 100:
+                raise ValueError(f"Provider {name}: partial_schedule closes more than 100%")
+
+        providers.append(Provider(
+            chat_id=chat_id,
+            name=name,
+            default_pair=entry.get('default_pair'),
+            default_lot_size=entry.get('default_lot_size'),
+            partial_schedule=schedule,
+            system_prompt=entry.get('system_prompt'),
+        ))
+
+    return providers
+
+
+# Provider of the message currently being processed (unset = default provider)
+current_provider: contextvars.ContextVar = contextvars.ContextVar('current_provider', default=None)
+
+
+def in_provider_context(fn: Callable, *args, **kwargs) -> Callable[[], Any]:
+    """
+    Bind a call to the current context (provider) for another thread
+
+    Threads and run_in_executor do not inherit context variables.
+
+    Args:
+        fn: Function to call
+        *args: Positional arguments
+        **kwargs: Keyword arguments
+
+    Returns:
+        Zero-argument callable running fn in a copy of the current context
+    """
+    context = contextvars.copy_context()
+    return lambda: context.run(fn, *args, **kwargs)
+
+
+def run_as(provider: Provider, fn: Callable, *args, **kwargs) -> Any:
+    """
+    Call a function with the given provider as the current provider
+
+    The previous provider is restored afterwards, so callers on shared threads
+    (console, catch-up) do not leak provider state into later work.
+
+    Args:
+        provider: Provider to run as
+        fn: Function to call
+        *args: Positional arguments
+        **kwargs: Keyword arguments
+
+    Returns:
+        Result of fn
+    """
+    token = current_provider.set(provider)
+    try:
+        return fn(*args, **kwargs)
+    finally:
+        current_provider.reset(token)
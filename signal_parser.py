@@ -0,0 +1,603 @@
+"""
+Signal Parser - Deterministic fast-path parser for common signal formats
+
+Handles the message formats documented in config.yaml's llm.system_prompt
+(market orders, ranges, multi-TP lists, SL/TP follow-ups, BE, partials and
+close-all) without an LLM round trip. The parser is deliberately strict: every
+token in the message must be understood, otherwise it returns None and the
+caller falls back to the LLM.
+"""
+
+import re
+import logging
+from typing import Optional, Dict, Any, List, Tuple
+
+from llm import NewSignal, ModifySignal, CloseSignal, MultiActionSignal, SignalResponse
+
+
+# ============================================================================
+# Grammar
+# ============================================================================
+
+CURRENCIES = ['EUR', 'USD', 'GBP', 'JPY', 'CHF', 'AUD', 'NZD', 'CAD', 'XAU', 'XAG']
+
+# Aliases providers use instead of the MT5 symbol
+PAIR_ALIASES = {
+    'GOLD': 'XAUUSD',
+    'XAU': 'XAUUSD',
+    'SILVER': 'XAGUSD',
+    'XAG': 'XAGUSD',
+}
+
+# Phrases main.py treats as "close everything" (see _handle_multi_action_signal)
+CLOSE_ALL_PATTERN = (r'(?:WE\s+ARE\s+)?NO\s+LONGER\s+IN\s+THIS\s+TRADE'
+                     r'|POSITION\s+CLOSED|TRADE\s+CLOSED'
+                     r'|CLOSE\s+ALL(?:\s+(?:POSITIONS|TRADES|ORDERS))?'
+                     r'|EXIT\s+ALL(?:\s+(?:POSITIONS|TRADES|ORDERS))?')
+
+# Default partial percentages from the system prompt
+PARTIAL_PHRASES = [
+    (r'(?:TAKE|SECURE|BOOK)\s+(?:SOME\s+)?PARTIALS?(?:\s+PROFITS?)?', 30.0),
+    (r'(?:TAKE|SECURE|BOOK)\s+SOME\s+PROFITS?', 40.0),
+    (r'LOCK(?:\s+IN)?\s+(?:SOME\s+)?PROFITS?', 50.0),
+    (r'CLOSE\s+HALF', 50.0),
+]
+
+# Words that carry no meaning for the signal and may be skipped
+FILLER_WORDS = ['SET', 'MOVE', 'PUT', 'ADD', 'UPDATE', 'NEW', 'THE', 'OUR', 'TO', 'AT',
+                'ON', 'GUYS', 'PLEASE', 'TRADE', 'POSITION', 'ORDER', 'SIGNAL', 'ENTRY',
+                'SL']
+
+# Lenient (fallback) mode skips unknown words, but never when the message hedges or negates
+LENIENT_BLOCKERS = {'DON\'T', 'DONT', 'NOT', 'NO', 'NEVER', 'WAIT', 'MIGHT', 'MAYBE', 'IF',
+                    'WILL', 'WOULD', 'COULD', 'SHOULD', 'POSSIBLE', 'POSSIBLY', 'SOON', 'LATER',
+                    'LOOKING', 'WATCH', 'WATCHING', 'YET', 'AVOID', 'CAREFUL', '?'}
+
+UNKNOWN_WORD = re.compile(r'\S+\s*')
+
+NUM = r'\d+(?:\.\d+)?'
+
+# Optional level index after TP/TARGET ("TP1: 4450", "TP 10 4470") - never the first digits of a price
+LEVEL = r'(?:\s?(?:1\d|20|[1-9])(?=\s*[:=]|\s))?'
+
+# Pending order types - left to the LLM (a STOP here is an entry type, not a stop loss)
+PENDING_ORDER_PATTERN = r'(?:BUY|SELL|LONG|SHORT)\s*(?:LIMIT|STOP)'
+
+_pair_codes = '|'.join(CURRENCIES)
+_partials = '|'.join(f'(?P<partial{i}>{p})' for i, (p, _) in enumerate(PARTIAL_PHRASES))
+
+# Order matters: the first alternative that matches at the current position wins
+TOKEN_PATTERN = re.compile(
+    rf'(?P<close_all>{CLOSE_ALL_PATTERN})\b'
+    rf'|{_partials}\b'
+    rf'|CLOSE\s+(?P<close_pct>\d{{1,3}}(?:\.\d+)?)\s*%'
+    rf'|(?P<close>CLOSE|EXIT)(?:\s+(?:IT|NOW))?\b'
+    rf'|(?P<be>BREAKEVEN|BE)\b'
+    rf'|(?P<pending>{PENDING_ORDER_PATTERN})\b'
+    rf'|(?P<dir>BUY|SELL|LONG|SHORT)\b'
+    rf'|(?P<pair>(?:{_pair_codes})\s?/?\s?(?:{_pair_codes})|GOLD|SILVER|XAU|XAG)\b'
+    rf'|(?P<market>NOW|(?:AT\s+)?MARKET(?:\s+PRICE)?|CMP)\b'
+    rf'|(?:(?:RANGE|ZONE|ENTRY|@|AT)\s*:?\s*)?(?P<range_lo>{NUM})\s*(?:-|TO)\s*(?P<range_hi>{NUM})\b'
+    rf'|(?:@|AT|ENTRY|PRICE)\s*:?\s*(?P<entry>{NUM})\b'
+    rf'|(?:SL|S/L|STOP\s*LOSS|STOPLOSS)\s*(?:TO|AT|@|=)?\s*:?\s*(?P<sl>{NUM})\b'
+    rf'|(?:TP|T/P|TAKE\s*PROFIT|TARGETS?){LEVEL}\s*(?:TO|AT|@|=)?\s*:?\s*'
+    rf'(?P<tp>{NUM}(?:\s*[/|]\s*{NUM})*)\b'
+    rf'|(?P<sl_after>{NUM})\s*SL\b'
+    rf'|(?P<tp_after>{NUM})\s*(?:TP|TARGET)\b'
+    rf'|(?P<num>{NUM})\b'
+    rf'|(?P<filler>{"|".join(FILLER_WORDS)})\b'
+    rf'|(?P<sep>[\s,;&!.:/|\-]+|AND\b|THEN\b)'
+)
+
+# Emojis and other non-ASCII decoration are dropped before tokenizing
+NON_ASCII = re.compile(r'[^\x00-\x7F]+')
+WHITESPACE = re.compile(r'\s+')
+
+
+class FastSignalParser:
+    """
+    Compiled-grammar parser that recognises routine signals without the LLM
+    """
+
+    def __init__(self, default_pair: str = "XAUUSD", confidence: float = 0.9,
+                 max_length: int = 200):
+        """
+        Initialize fast-path parser
+
+        Args:
+            default_pair: Pair to assume when a new signal names none
+            confidence: Confidence reported on parsed signals
+            max_length: Longer messages are left to the LLM
+        """
+        self.default_pair = default_pair
+        self.confidence = confidence
+        self.max_length = max_length
+        self.logger = logging.getLogger('TradingBot.FastParser')
+
+        # Hit-rate counters
+        self.stats: Dict[str, Any] = {
+            'attempts': 0,
+            'hits': 0,
+            'misses': 0,
+            'by_type': {},
+        }
+
+    def _normalize(self, message: str) -> str:
+        """Uppercase, strip emojis and collapse whitespace"""
+        text = NON_ASCII.sub(' ', message.upper())
+        return WHITESPACE.sub(' ', text).strip()
+
+    def _tokenize(self, text: str, lenient: bool = False) -> Optional[List[Tuple[str, Any]]]:
+        """
+        Split normalized text into grammar tokens
+
+        Args:
+            text: Normalized message text
+            lenient: Skip words the grammar does not know instead of failing
+
+        Returns:
+            List of (kind, value) tuples, or None if any part of the text
+            is not covered by the grammar (or, if lenient, hedges/negates)
+        """
+        tokens = []
+        pos = 0
+
+        while pos < len(text):
+            match = TOKEN_PATTERN.match(text, pos)
+            if match is None or match.end() == pos:
+                if not lenient:
+                    return None
+                word = UNKNOWN_WORD.match(text, pos)
+                stripped = word.group().strip()
+                if stripped.strip('.,!;:') in LENIENT_BLOCKERS or '?' in stripped:
+                    return None
+                pos = word.end()
+                continue
+            pos = match.end()
+
+            groups = match.groupdict()
+            postfix = groups['sl_after'] or groups['tp_after']
+            if postfix is not None and tokens and tokens[-1][0] in ('dir', 'pair', 'market'):
+                # "SELL 4450 TP 4400": the number after the direction is the entry,
+                # the SL/TP word belongs to the price that follows
+                tokens.append(('num', float(postfix)))
+                pos = match.end('sl_after' if groups['sl_after'] is not None else 'tp_after')
+                continue
+            if groups['sep'] is not None or groups['filler'] is not None:
+                continue
+            if groups['pending'] is not None:
+                return None  # never executed as a market order, even leniently
+
+            if groups['close_all'] is not None:
+                tokens.append(('close_all', None))
+            elif groups['close_pct'] is not None:
+                tokens.append(('partial', float(groups['close_pct'])))
+            elif groups['close'] is not None:
+                tokens.append(('close', None))
+            elif groups['be'] is not None:
+                tokens.append(('be', None))
+            elif groups['dir'] is not None:
+                direction = groups['dir']
+                tokens.append(('dir', 'BUY' if direction in ('BUY', 'LONG') else 'SELL'))
+            elif groups['pair'] is not None:
+                pair = re.sub(r'[\s/]', '', groups['pair'])
+                tokens.append(('pair', PAIR_ALIASES.get(pair, pair)))
+            elif groups['market'] is not None:
+                tokens.append(('market', None))
+            elif groups['range_lo'] is not None:
+                tokens.append(('range', (float(groups['range_lo']), float(groups['range_hi']))))
+            elif groups['entry'] is not None:
+                tokens.append(('entry', float(groups['entry'])))
+            elif groups['sl'] is not None:
+                tokens.append(('sl', float(groups['sl'])))
+            elif groups['sl_after'] is not None:
+                tokens.append(('sl', float(groups['sl_after'])))
+            elif groups['tp'] is not None:
+                levels = [float(v) for v in re.findall(NUM, groups['tp'])]
+                tokens.append(('tp', levels))
+            elif groups['tp_after'] is not None:
+                tokens.append(('tp', [float(groups['tp_after'])]))
+            elif groups['num'] is not None:
+                tokens.append(('num', float(groups['num'])))
+            else:
+                for i, (_, percent) in enumerate(PARTIAL_PHRASES):
+                    if groups[f'partial{i}'] is not None:
+                        tokens.append(('partial', percent))
+                        break
+
+        return tokens
+
+    def _attach_bare_numbers(self, tokens: List[Tuple[str, Any]]) -> Optional[List[Tuple[str, Any]]]:
+        """
+        Resolve bare numbers by what precedes them
+
+        A number after a TP token extends the TP list ("TP 4450, 4470"); a number
+        right after a direction or pair token is the entry price.
+        Anything else is ambiguous.
+        """
+        resolved: List[Tuple[str, Any]] = []
+
+        for kind, value in tokens:
+            if kind != 'num':
+                resolved.append((kind, value))
+                continue
+
+            if not resolved:
+                return None
+
+            prev_kind, prev_value = resolved[-1]
+            if prev_kind == 'tp':
+                resolved[-1] = ('tp', prev_value + [value])
+            elif prev_kind in ('dir', 'pair'):
+                resolved.append(('entry', value))
+            else:
+                return None
+
+        return resolved
+
+    def _build_new_signal(self, tokens: List[Tuple[str, Any]]) -> Optional[NewSignal]:
+        """Build a NewSignal from direction/pair/entry/SL/TP tokens"""
+        kinds = [kind for kind, _ in tokens]
+
+        if kinds.count('dir') != 1 or kinds.count('pair') > 1 or kinds.count('sl') > 1:
+            return None
+        if sum(kinds.count(k) for k in ('market', 'range', 'entry')) > 1:
+            return None
+        if any(k in kinds for k in ('be', 'partial', 'close', 'close_all')):
+            return None
+
+        values = dict(tokens)
+        action = values['dir']
+        pair = values.get('pair', self.default_pair)
+
+        tp_levels: List[float] = []
+        for kind, value in tokens:
+            if kind == 'tp':
+                tp_levels.extend(value)
+
+        stop_loss = values.get('sl')
+        take_profit = tp_levels[0] if tp_levels else None
+
+        if 'range' in values:
+            # BUY uses the lower bound, SELL the upper bound
+            low, high = sorted(values['range'])
+            entry_price = low if action == 'BUY' else high
+            execution_type = 'pending'
+            layout = 'range'
+        elif 'entry' in values:
+            entry_price = values['entry']
+            execution_type = 'immediate'
+            layout = 'priced'
+        else:
+            entry_price = 0.0
+            execution_type = 'immediate'
+            layout = 'market'
+
+        # Reject levels that contradict the direction instead of guessing
+        if stop_loss is not None and take_profit is not None:
+            if action == 'BUY' and not stop_loss < take_profit:
+                return None
+            if action == 'SELL' and not stop_loss > take_profit:
+                return None
+        if entry_price > 0 and stop_loss is not None:
+            if (action == 'BUY') != (stop_loss < entry_price):
+                return None
+        if entry_price > 0 and any((action == 'BUY') != (level > entry_price) for level in tp_levels):
+            return None
+
+        return NewSignal(
+            pair=pair,
+            action=action,
+            entry_price=entry_price,
+            stop_loss=stop_loss,
+            take_profit=take_profit,
+            tp_levels=tp_levels if len(tp_levels) > 1 else None,
+            execution_type=execution_type,
+            confidence=self.confidence,
+            reasoning=f"Fast-path parse: {layout} {action} {pair}"
+        )
+
+    def _build_follow_up(self, tokens: List[Tuple[str, Any]],
+                         active_trades: List[Dict[str, Any]],
+                         last_trade_pair: Optional[str]) -> Optional[SignalResponse]:
+        """Build modify/close/multi-action signals for follow-up messages"""
+        kinds = [kind for kind, _ in tokens]
+        pairs = [value for kind, value in tokens if kind == 'pair']
+
+        if len(pairs) > 1 or any(k in kinds for k in ('market', 'range', 'entry')):
+            return None
+
+        reference = pairs[0] if pairs else last_trade_pair
+
+        if 'close_all' in kinds:
+            if len(kinds) != kinds.count('close_all'):
+                return None
+            actions = [
+                {
+                    'type': 'close',
+                    'details': {
+                        'action_type': 'close',
+                        'trade_reference': trade['pair'],
+                        'close_percent': 100.0
+                    }
+                }
+                for trade in active_trades
+            ]
+            return MultiActionSignal(
+                actions=actions,
+                reasoning="Fast-path parse: close all positions and pending orders",
+                confidence=self.confidence
+            )
+
+        if 'close' in kinds:
+            if set(kinds) - {'close', 'pair'} or kinds.count('close') > 1:
+                return None
+            return CloseSignal(
+                action_type='close',
+                trade_reference=reference,
+                close_percent=100.0,
+                confidence=self.confidence,
+                reasoning="Fast-path parse: full close"
+            )
+
+        sl_values = [value for kind, value in tokens if kind == 'sl']
+        tp_levels = [level for kind, value in tokens if kind == 'tp' for level in value]
+        if len(sl_values) > 1:
+            return None
+
+        actions: List[Dict[str, Any]] = []
+        for kind, value in tokens:
+            if kind == 'be':
+                if sl_values:
+                    return None
+                actions.append({
+                    'type': 'modify',
+                    'details': {
+                        'action_type': 'modify_sl',
+                        'trade_reference': reference,
+                        'new_stop_loss': None,
+                        'is_breakeven': True
+                    }
+                })
+            elif kind == 'partial':
+                if not 0 < value < 100:
+                    return None
+                actions.append({
+                    'type': 'close',
+                    'details': {
+                        'action_type': 'partial_close',
+                        'trade_reference': reference,
+                        'close_percent': value
+                    }
+                })
+
+        if sl_values or tp_levels:
+            if actions:
+                return None
+            if sl_values and tp_levels:
+                action_type = 'modify_both'
+            elif sl_values:
+                action_type = 'modify_sl'
+            else:
+                action_type = 'modify_tp'
+            return ModifySignal(
+                action_type=action_type,
+                trade_reference=reference,
+                new_stop_loss=sl_values[0] if sl_values else None,
+                new_take_profit=tp_levels[0] if tp_levels else None,
+                confidence=self.confidence,
+                reasoning="Fast-path parse: SL/TP follow-up"
+            )
+
+        if len(actions) == 1:
+            details = actions[0]['details']
+            if actions[0]['type'] == 'modify':
+                return ModifySignal(
+                    action_type='modify_sl',
+                    trade_reference=reference,
+                    is_breakeven=True,
+                    confidence=self.confidence,
+                    reasoning="Fast-path parse: move SL to breakeven"
+                )
+            return CloseSignal(
+                action_type='partial_close',
+                trade_reference=reference,
+                close_percent=details['close_percent'],
+                confidence=self.confidence,
+                reasoning=f"Fast-path parse: partial close {details['close_percent']:.0f}%"
+            )
+
+        if len(actions) > 1:
+            return MultiActionSignal(
+                actions=actions,
+                reasoning="Fast-path parse: " + " then ".join(
+                    'breakeven' if a['type'] == 'modify' else f"partial {a['details']['close_percent']:.0f}%"
+                    for a in actions
+                ),
+                confidence=self.confidence
+            )
+
+        return None
+
+    def parse(self,
+              message: str,
+              active_trades: Optional[List[Dict[str, Any]]] = None,
+              last_trade_pair: Optional[str] = None) -> Optional[SignalResponse]:
+        """
+        Try to interpret a message without the LLM
+
+        Args:
+            message: Raw message text
+            active_trades: Active trades (from TradeManager.get_context_for_llm)
+            last_trade_pair: Most recently executed trade pair
+
+        Returns:
+            SignalResponse if the message fully matches the grammar, else None
+        """
+        self.stats['attempts'] += 1
+        result = None
+
+        if message and len(message) <= self.max_length:
+            result = self._parse_tokens(self._tokenize(self._normalize(message)),
+                                        active_trades, last_trade_pair)
+
+        if result is None:
+            self.stats['misses'] += 1
+            return None
+
+        self.stats['hits'] += 1
+        by_type = self.stats['by_type']
+        by_type[result.signal_type] = by_type.get(result.signal_type, 0) + 1
+
+        self.logger.info(f"Fast-path hit ({result.signal_type}) - LLM call skipped, "
+                         f"hit rate {self.hit_rate:.0%} ({self.stats['hits']}/{self.stats['attempts']})")
+        return result
+
+    def _parse_tokens(self, tokens: Optional[List[Tuple[str, Any]]],
+                      active_trades: Optional[List[Dict[str, Any]]],
+                      last_trade_pair: Optional[str]) -> Optional[SignalResponse]:
+        """Build a signal from grammar tokens (None if they don't form one)"""
+        if tokens:
+            tokens = self._attach_bare_numbers(tokens)
+        if not tokens:
+            return None
+
+        if any(kind == 'dir' for kind, _ in tokens):
+            return self._build_new_signal(tokens)
+        return self._build_follow_up(tokens, active_trades or [], last_trade_pair)
+
+    def parse_lenient(self,
+                      message: str,
+                      active_trades: Optional[List[Dict[str, Any]]] = None,
+                      last_trade_pair: Optional[str] = None) -> Optional[SignalResponse]:
+        """
+        Best-effort interpretation used while the LLM is unavailable
+
+        Unknown words are skipped rather than rejected, unless the message
+        hedges or negates ("don't close yet", "might buy later"). New signals
+        additionally need an SL or TP. Results carry a reduced confidence and
+        do not count towards the fast-path hit rate.
+
+        Args:
+            message: Raw message text
+            active_trades: Active trades (from TradeManager.get_context_for_llm)
+            last_trade_pair: Most recently executed trade pair
+
+        Returns:
+            SignalResponse or None if the message is not clearly a signal
+        """
+        if not message or len(message) > 2 * self.max_length:
+            return None
+
+        tokens = self._tokenize(self._normalize(message), lenient=True)
+        if not tokens:
+            return None
+
+        kinds = {kind for kind, _ in tokens}
+        if 'dir' in kinds and not kinds & {'sl', 'sl_after', 'tp', 'tp_after'}:
+            return None
+
+        result = self._parse_tokens(tokens, active_trades, last_trade_pair)
+        if result is None:
+            return None
+
+        result.confidence = round(self.confidence * 0.8, 2)
+        result.reasoning = f"Fallback rule-based interpretation (LLM unavailable). {result.reasoning}"
+        self.logger.info(f"Fallback interpretation ({result.signal_type}) while LLM unavailable")
+        return result
+
+    def _parse_entry(self, message: str) -> Optional[NewSignal]:
+        """Strictly parse a message as a new signal (None if it is anything else)"""
+        if not message or len(message) > 2 * self.max_length:
+            return None
+        tokens = self._tokenize(self._normalize(message))
+        if tokens:
+            tokens = self._attach_bare_numbers(tokens)
+        if not tokens or not any(kind == 'dir' for kind, _ in tokens):
+            return None
+        return self._build_new_signal(tokens)
+
+    def parse_levels(self, message: str) -> Optional[Dict[str, Any]]:
+        """
+        Recognize a level-only fragment ("SL 4500", "TP 4550/4600")
+
+        Does not count towards the fast-path hit rate.
+
+        Args:
+            message: Raw message text
+
+        Returns:
+            Dictionary with stop_loss (or None) and tp_levels, or None if the
+            message is anything but SL/TP levels
+        """
+        if not message or len(message) > self.max_length:
+            return None
+        tokens = self._tokenize(self._normalize(message))
+        if tokens:
+            tokens = self._attach_bare_numbers(tokens)
+        if not tokens or any(kind not in ('sl', 'tp') for kind, _ in tokens):
+            return None
+
+        stop_losses = [value for kind, value in tokens if kind == 'sl']
+        if len(stop_losses) > 1:
+            return None
+        tp_levels = [level for kind, value in tokens if kind == 'tp' for level in value]
+        return {'stop_loss': stop_losses[0] if stop_losses else None, 'tp_levels': tp_levels}
+
+    def diff_levels(self, original: str, edited: str) -> Optional[Dict[str, Any]]:
+        """
+        Compare the levels of an edited signal message with the original
+
+        Both versions must fully match the grammar as the same signal (pair,
+        direction and order type); only added or changed SL/TP levels are
+        reported. Does not count towards the fast-path hit rate.
+
+        Args:
+            original: Message text the trade was opened from
+            edited: Edited message text
+
+        Returns:
+            Dictionary of changed fields (stop_loss, take_profit, tp_levels,
+            entry_price) with their new values - empty if no level changed -
+            or None if the edit is ambiguous and needs a full interpretation
+        """
+        before = self._parse_entry(original)
+        after = self._parse_entry(edited)
+        if before is None or after is None:
+            return None
+        if (before.pair, before.action, before.execution_type) != (after.pair, after.action, after.execution_type):
+            return None
+
+        changes: Dict[str, Any] = {}
+        for field_name in ('entry_price', 'stop_loss', 'take_profit', 'tp_levels'):
+            old_value, new_value = getattr(before, field_name), getattr(after, field_name)
+            if new_value == old_value:
+                continue
+            # A level that disappeared is not a modification we can apply
+            if new_value is None and field_name != 'tp_levels':
+                return None
+            changes[field_name] = new_value
+
+        self.logger.info(f"Edit diff for {after.action} {after.pair}: {changes or 'no level changes'}")
+        return changes
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of messages answered without the LLM"""
+        attempts = self.stats['attempts']
+        return self.stats['hits'] / attempts if attempts else 0.0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get hit-rate statistics
+
+        Returns:
+            Dictionary with attempts, hits, misses, hit_rate and per-type hits
+        """
+        return {
+            'attempts': self.stats['attempts'],
+            'hits': self.stats['hits'],
+            'misses': self.stats['misses'],
+            'hit_rate': self.hit_rate,
+            'by_type': dict(self.stats['by_type']),
+        }
@@ -2,11 +2,385 @@
 Telegram Client - Handles Telegram connection and message listening
 """
 
+import os
+import json
+import time
 import logging
 import asyncio
-from typing import Optional, List, Callable, Dict, Any
+import threading
+import functools
+from pathlib import Path
+from datetime import datetime
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, List, Callable, Dict, Any, Tuple, Union
 from telethon import TelegramClient as TelethonClient, events
-from telethon.tl.types import User, Chat, Channel
+from telethon.tl.types import User, Chat, Channel, ChannelParticipantsAdmins
+
+
+# Backpressure priorities - the lowest is dropped first when a chat queue is full
+PRIORITY_NOISE = 0
+PRIORITY_NORMAL = 1
+PRIORITY_CRITICAL = 2  # Close / modify follow-ups - never dropped
+
+
+class MessageQueue:
+    """
+    Bounded FIFO of one chat's messages with priority-aware backpressure
+    
+    When the queue is full an incoming noise message is dropped; otherwise the
+    oldest queued noise message, then the oldest ordinary message makes room.
+    Close/modify follow-ups are never dropped - if nothing else can go they
+    are admitted over the bound.
+    """
+    
+    def __init__(self, max_size: int = 100, wait_history: int = 500,
+                 on_drop: Optional[Callable[[Dict[str, Any]], None]] = None):
+        """
+        Initialize message queue
+        
+        Args:
+            max_size: Messages held before backpressure starts dropping
+            wait_history: Recent queue wait times kept for percentiles
+            on_drop: Called with each message dropped by backpressure
+        """
+        self.max_size = max_size
+        self.on_drop = on_drop
+        self._items: deque = deque()
+        self._available = asyncio.Event()
+        self._waits: deque = deque(maxlen=wait_history)
+        self.logger = logging.getLogger('TradingBot.Queue')
+        
+        self.stats = {
+            'enqueued': 0,
+            'processed': 0,
+            'dropped_noise': 0,
+            'dropped_normal': 0,
+            'overflow': 0,
+            'max_depth': 0,
+        }
+    
+    def __len__(self) -> int:
+        return len(self._items)
+    
+    def put(self, message_data: Dict[str, Any], priority: int = PRIORITY_NORMAL) -> bool:
+        """
+        Add a message, applying backpressure if the queue is full
+        
+        Args:
+            message_data: Message data dictionary
+            priority: PRIORITY_NOISE, PRIORITY_NORMAL or PRIORITY_CRITICAL
+            
+        Returns:
+            True if the message was queued, False if it was dropped
+        """
+        if len(self._items) >= self.max_size and not self._make_room(message_data, priority):
+            return False
+        
+        self._items.append((time.monotonic(), priority, message_data))
+        self.stats['enqueued'] += 1
+        self.stats['max_depth'] = max(self.stats['max_depth'], len(self._items))
+        self._available.set()
+        return True
+    
+    def _make_room(self, message_data: Dict[str, Any], priority: int) -> bool:
+        """
+        Drop a queued message to admit a new one
+        
+        Args:
+            message_data: Incoming message
+            priority: Incoming message priority
+            
+        Returns:
+            True if the incoming message may be queued
+        """
+        if priority > PRIORITY_NOISE:
+            for victim_priority in (PRIORITY_NOISE, PRIORITY_NORMAL):
+                if victim_priority > priority:
+                    break
+                for index, (_, queued_priority, queued) in enumerate(self._items):
+                    if queued_priority == victim_priority:
+                        del self._items[index]
+                        self._record_drop(queued, victim_priority)
+                        return True
+            
+            if priority == PRIORITY_CRITICAL:
+                self.stats['overflow'] += 1
+                self.logger.warning(f"Queue full of follow-ups - admitting message {message_data.get('message_id')} "
+                                    f"over the limit ({len(self._items) + 1}/{self.max_size})")
+                return True
+        
+        self._record_drop(message_data, priority)
+        return False
+    
+    def _record_drop(self, message_data: Dict[str, Any], priority: int):
+        """Count and log a message dropped by backpressure"""
+        self.stats['dropped_noise' if priority == PRIORITY_NOISE else 'dropped_normal'] += 1
+        self.logger.warning(f"Queue full - dropped message {message_data.get('message_id')}: "
+                            f"{(message_data.get('text') or '')[:60]!r}")
+        if self.on_drop:
+            self.on_drop(message_data)
+    
+    async def get(self) -> Tuple[Dict[str, Any], float]:
+        """
+        Wait for the next message
+        
+        Returns:
+            Tuple of (message data, seconds it waited in the queue)
+        """
+        while not self._items:
+            self._available.clear()
+            await self._available.wait()
+        
+        enqueued_at, _, message_data = self._items.popleft()
+        wait = time.monotonic() - enqueued_at
+        self._waits.append(wait)
+        return message_data, wait
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get queue statistics
+        
+        Returns:
+            Dictionary with depth, counters and wait-time percentiles (ms)
+        """
+        waits = sorted(self._waits)
+        
+        def wait_percentile(pct: float) -> float:
+            if not waits:
+                return 0.0
+            return 1000 * waits[min(len(waits) - 1, max(0, int(round(pct / 100 * len(waits))) - 1))]
+        
+        stats = dict(self.stats)
+        stats.update({
+            'depth': len(self._items),
+            'max_size': self.max_size,
+            'wait_p50_ms': wait_percentile(50),
+            'wait_p95_ms': wait_percentile(95),
+            'wait_max_ms': 1000 * waits[-1] if waits else 0.0,
+        })
+        return stats
+
+
+class SenderCache:
+    """
+    LRU cache of sender ID -> (display name, username)
+    
+    Signals are posted by a handful of admins, so resolving the sender
+    entity of every message is almost always a repeat lookup.
+    """
+    
+    def __init__(self, max_size: int = 500):
+        """
+        Initialize sender cache
+        
+        Args:
+            max_size: Senders kept before the least recently used is evicted
+        """
+        self.max_size = max_size
+        self._entries: OrderedDict = OrderedDict()
+        self.stats = {'hits': 0, 'misses': 0, 'prewarmed': 0}
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    @staticmethod
+    def describe(entity: Any) -> Tuple[str, Optional[str]]:
+        """
+        Display name and username of a user or channel entity
+        
+        Args:
+            entity: Telethon User / Channel / Chat
+            
+        Returns:
+            Tuple of (name, username)
+        """
+        name = getattr(entity, 'first_name', None) or getattr(entity, 'title', None) or 'Unknown'
+        return name, getattr(entity, 'username', None)
+    
+    def get(self, sender_id: Optional[int]) -> Optional[Tuple[str, Optional[str]]]:
+        """
+        Look up a sender
+        
+        Args:
+            sender_id: Sender ID (None for anonymous posts)
+            
+        Returns:
+            Tuple of (name, username) or None if not cached
+        """
+        entry = self._entries.get(sender_id)
+        if entry is None:
+            self.stats['misses'] += 1
+            return None
+        
+        self._entries.move_to_end(sender_id)
+        self.stats['hits'] += 1
+        return entry
+    
+    def put(self, sender_id: int, entity: Any) -> Tuple[str, Optional[str]]:
+        """
+        Cache a sender entity
+        
+        Args:
+            sender_id: Sender ID
+            entity: Telethon entity of the sender
+            
+        Returns:
+            Tuple of (name, username) that was cached
+        """
+        entry = self._entries[sender_id] = self.describe(entity)
+        self._entries.move_to_end(sender_id)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+        return entry
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics
+        
+        Returns:
+            Dictionary with size, hits, misses, hit rate and pre-warmed entries
+        """
+        lookups = self.stats['hits'] + self.stats['misses']
+        stats = dict(self.stats)
+        stats.update({
+            'size': len(self._entries),
+            'max_size': self.max_size,
+            'hit_rate': self.stats['hits'] / lookups if lookups else 0.0,
+        })
+        return stats
+
+
+class MessageWatermarks:
+    """
+    Durable per-chat ID of the last message that was fully processed
+    
+    Every message of a chat up to its watermark was handled, so after a
+    restart or reconnect only messages above it have to be fetched. Messages
+    still in flight hold the watermark back, so an out-of-order completion
+    never skips one. While the connection is down the watermarks are frozen
+    until the gap has been caught up. Writes are throttled: a busy chat does
+    not rewrite the file on every message, and a crash at worst re-fetches
+    the last few messages (the execution guard skips repeats).
+    """
+    
+    def __init__(self, path: str = "data/watermarks.json", flush_interval: float = 1.0):
+        """
+        Initialize watermark store
+        
+        Args:
+            path: JSON file the watermarks are persisted to
+            flush_interval: Minimum seconds between writes
+        """
+        self.path = Path(path)
+        self.flush_interval = flush_interval
+        
+        self.watermarks: Dict[int, int] = {}
+        self._pending: Dict[int, set] = {}
+        self._highest: Dict[int, int] = {}
+        self._held = False
+        self._dirty = False
+        self._last_flush = 0.0
+        self._lock = threading.Lock()
+        self.logger = logging.getLogger('TradingBot.Watermarks')
+        
+        self.load()
+    
+    def load(self):
+        """Load watermarks from the JSON file"""
+        if not self.path.exists():
+            return
+        
+        try:
+            with open(self.path, 'r') as f:
+                self.watermarks = {int(chat_id): int(message_id) for chat_id, message_id in json.load(f).items()}
+            self._highest = dict(self.watermarks)
+        except Exception as e:
+            self.logger.warning(f"Could not load watermarks from {self.path}: {e}")
+            self.watermarks = {}
+    
+    def get(self, chat_id: int) -> int:
+        """Get a chat's watermark (0 = nothing processed yet)"""
+        return self.watermarks.get(chat_id, 0)
+    
+    def snapshot(self) -> Dict[int, int]:
+        """Get a copy of all watermarks"""
+        with self._lock:
+            return dict(self.watermarks)
+    
+    def start(self, chat_id: int, message_id: int):
+        """
+        Record a message entering the pipeline (holds the watermark below it)
+        
+        Args:
+            chat_id: Chat the message belongs to
+            message_id: Telegram message ID
+        """
+        with self._lock:
+            self._pending.setdefault(chat_id, set()).add(message_id)
+    
+    def finish(self, chat_id: int, message_id: int):
+        """
+        Record a message as handled (processed, skipped or dropped)
+        
+        Args:
+            chat_id: Chat the message belongs to
+            message_id: Telegram message ID
+        """
+        with self._lock:
+            self._pending.get(chat_id, set()).discard(message_id)
+            self._highest[chat_id] = max(self._highest.get(chat_id, 0), message_id)
+            self._advance(chat_id)
+        self.flush()
+    
+    def hold(self):
+        """Freeze all watermarks (connection lost - a gap is opening)"""
+        with self._lock:
+            self._held = True
+    
+    def release(self):
+        """Unfreeze the watermarks (the gap has been caught up)"""
+        with self._lock:
+            self._held = False
+            for chat_id in list(self._highest):
+                self._advance(chat_id)
+        self.flush()
+    
+    def _advance(self, chat_id: int):
+        """Move a chat's watermark up to its highest gap-free handled message (lock held)"""
+        if self._held:
+            return
+        candidate = self._highest.get(chat_id, 0)
+        pending = self._pending.get(chat_id)
+        if pending:
+            candidate = min(candidate, min(pending) - 1)
+        if candidate > self.watermarks.get(chat_id, 0):
+            self.watermarks[chat_id] = candidate
+            self._dirty = True
+    
+    def flush(self, force: bool = False):
+        """
+        Persist the watermarks if they changed
+        
+        Args:
+            force: Write now even if the last write was less than flush_interval ago
+        """
+        with self._lock:
+            if not self._dirty or (not force and time.monotonic() - self._last_flush < self.flush_interval):
+                return
+            data = {str(chat_id): message_id for chat_id, message_id in self.watermarks.items()}
+            self._dirty = False
+            self._last_flush = time.monotonic()
+            
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                temp_path = self.path.with_suffix('.tmp')
+                with open(temp_path, 'w') as f:
+                    json.dump(data, f)
+                os.replace(temp_path, self.path)  # never leave a half-written file
+            except Exception as e:
+                self._dirty = True
+                self.logger.warning(f"Could not save watermarks to {self.path}: {e}")
 
 
 class TelegramListener:
@@ -15,7 +389,8 @@ class TelegramListener:
     """
     
     def __init__(self, api_id: int, api_hash: str, phone: str, 
-                 session_name: str = "trading_bot_session"):
+                 session_name: str = "trading_bot_session", queue_size: int = 100,
+                 sender_cache_size: int = 500, watermark_file: str = "data/watermarks.json"):
         """
         Initialize Telegram listener
         
@@ -24,6 +399,9 @@ class TelegramListener:
             api_hash: Telegram API hash
             phone: Phone number for authentication
             session_name: Session file name
+            queue_size: Messages queued per chat before backpressure drops some
+            sender_cache_size: Sender names kept in memory
+            watermark_file: JSON file with the last processed message ID per chat
         """
         self.api_id = api_id
         self.api_hash = api_hash
@@ -34,7 +412,33 @@ class TelegramListener:
         self.is_connected = False
         self.is_listening = False
         self.selected_chat_id: Optional[int] = None
+        self.selected_chat_ids: List[int] = []
         self.message_callback: Optional[Callable] = None
+        self.reconnect_callback: Optional[Callable] = None
+        self.priority_classifier: Optional[Callable[[Dict[str, Any]], int]] = None
+        
+        # One bounded queue and consumer per chat (messages are handled in order)
+        self.queue_size = queue_size
+        self.max_concurrent = 1
+        self.queues: Dict[int, MessageQueue] = {}
+        self._consumers: Dict[int, asyncio.Task] = {}
+        self._executors: Dict[int, ThreadPoolExecutor] = {}
+        self._callback_tasks: set = set()
+        # Cleared while a reconnect catch-up runs: live messages wait behind the gap
+        self._live_gate: Optional[asyncio.Event] = None
+        
+        # (chat_id, message_id) -> text of messages already delivered live
+        # (catch-up skips them, edits are compared against the text)
+        self.seen_message_ids: OrderedDict = OrderedDict()
+        self.max_seen_ids = 2000
+        self._watch_task: Optional[asyncio.Task] = None
+        
+        # Sender names: cached, and resolved after dispatch when not cached
+        self.sender_cache = SenderCache(max_size=sender_cache_size)
+        self._sender_lookups: Dict[int, asyncio.Task] = {}
+        
+        # Last processed message per chat - where a catch-up after a gap starts
+        self.watermarks = MessageWatermarks(watermark_file)
         
         self.logger = logging.getLogger('TradingBot.Telegram')
     
@@ -83,6 +487,14 @@ class TelegramListener:
     
     async def disconnect(self):
         """Disconnect from Telegram"""
+        for consumer in self._consumers.values():
+            consumer.cancel()
+        self._consumers.clear()
+        for executor in self._executors.values():
+            executor.shutdown(wait=False)
+        self._executors.clear()
+        self.watermarks.flush(force=True)
+        
         if self.client and self.is_connected:
             try:
                 await self.client.disconnect()
@@ -133,21 +545,254 @@ class TelegramListener:
             self.logger.error(f"Failed to get dialogs: {e}")
             return []
     
-    def set_message_callback(self, callback: Callable[[Dict[str, Any]], None]):
+    def set_message_callback(self, callback: Callable[[Dict[str, Any]], None], max_concurrent: int = 1):
         """
-        Set callback function for new messages
+        Set callback function for new and edited messages
         
         Args:
-            callback: Function to call with message data
+            callback: Function to call with message data (edits carry
+                edited=True and previous_text, None if not seen live)
+            max_concurrent: Messages of one chat handled at the same time (started
+                in arrival order; 1 = strictly one after the other)
         """
         self.message_callback = callback
+        self.max_concurrent = max(1, max_concurrent)
     
-    async def start_listening(self, chat_id: int) -> bool:
+    def set_priority_classifier(self, classifier: Callable[[Dict[str, Any]], int]):
         """
-        Start listening to messages from a specific chat
+        Set function ranking messages for backpressure
         
         Args:
-            chat_id: Chat/group ID to listen to
+            classifier: Function returning PRIORITY_NOISE, PRIORITY_NORMAL or
+                PRIORITY_CRITICAL for message data (must be cheap - runs on the event loop)
+        """
+        self.priority_classifier = classifier
+    
+    def set_reconnect_callback(self, callback: Callable[[Dict[int, int]], None]):
+        """
+        Set callback function called after the connection was lost and restored
+        
+        Args:
+            callback: Synchronous function called (in an executor) with the last
+                processed message ID per chat before the connection dropped;
+                the watermarks stay frozen until it returns
+        """
+        self.reconnect_callback = callback
+    
+    async def _build_message_data(self, message: Any, wait_for_sender: bool = True) -> Dict[str, Any]:
+        """
+        Extract message data from a Telethon message
+        
+        Args:
+            message: Telethon Message (live event message or history)
+            wait_for_sender: Resolve an uncached sender before returning; if
+                False the lookup runs in the background and fills in
+                sender_name / sender_username when it completes
+            
+        Returns:
+            Message data dictionary passed to the message callback
+        """
+        message_data = {
+            'message_id': message.id,
+            'text': message.message,
+            'date': message.date,
+            'sender_id': message.sender_id,
+            'chat_id': message.chat_id,
+            'is_reply': message.reply_to is not None,
+            'reply_to_msg_id': getattr(message.reply_to, 'reply_to_msg_id', None),
+        }
+        
+        # Get sender info: cache, then the entity shipped with the update, then the network
+        sender_id = message.sender_id
+        if sender_id is None:
+            return message_data
+        
+        sender = self.sender_cache.get(sender_id)
+        if sender is None and message.sender is not None:
+            sender = self.sender_cache.put(sender_id, message.sender)
+        
+        if sender is not None:
+            self._fill_sender(message_data, sender)
+        elif wait_for_sender:
+            sender = await self._lookup_sender(message)
+            if sender is not None:
+                self._fill_sender(message_data, sender)
+        else:
+            self._lookup_sender_later(message, message_data)
+        
+        return message_data
+    
+    @staticmethod
+    def _fill_sender(message_data: Dict[str, Any], sender: Tuple[str, Optional[str]]):
+        """Set the sender fields of a message"""
+        message_data['sender_name'], message_data['sender_username'] = sender
+    
+    async def _lookup_sender(self, message: Any) -> Optional[Tuple[str, Optional[str]]]:
+        """
+        Fetch a message's sender entity and cache it
+        
+        Args:
+            message: Telethon Message
+            
+        Returns:
+            Tuple of (name, username) or None if the sender is unavailable
+        """
+        try:
+            sender = await message.get_sender()
+        except Exception as e:
+            self.logger.debug(f"Sender lookup failed for message {message.id}: {e}")
+            return None
+        if sender is None:
+            return None
+        return self.sender_cache.put(message.sender_id, sender)
+    
+    def _lookup_sender_later(self, message: Any, message_data: Dict[str, Any]):
+        """
+        Resolve a sender in the background and fill in the message's sender fields
+        
+        Messages from the same uncached sender share one lookup.
+        
+        Args:
+            message: Telethon Message
+            message_data: Message data to update (already handed to the pipeline)
+        """
+        sender_id = message.sender_id
+        task = self._sender_lookups.get(sender_id)
+        if task is None:
+            task = self._sender_lookups[sender_id] = asyncio.ensure_future(self._lookup_sender(message))
+            task.add_done_callback(lambda _: self._sender_lookups.pop(sender_id, None))
+        
+        def fill(done: asyncio.Task):
+            if not done.cancelled() and done.result() is not None:
+                self._fill_sender(message_data, done.result())
+        
+        task.add_done_callback(fill)
+    
+    async def _prewarm_sender_cache(self, chat_id: int):
+        """
+        Cache the chat itself (channel posts) and its admins (who post the signals)
+        
+        Args:
+            chat_id: Chat/group ID
+        """
+        before = len(self.sender_cache)
+        try:
+            chat = await self.client.get_entity(chat_id)
+            self.sender_cache.put(chat_id, chat)
+            
+            async for user in self.client.iter_participants(chat_id, filter=ChannelParticipantsAdmins,
+                                                            limit=self.sender_cache.max_size):
+                self.sender_cache.put(user.id, user)
+        except Exception as e:
+            # Listing admins needs admin rights in channels - senders are then cached as they post
+            self.logger.debug(f"Could not list admins of chat {chat_id}: {e}")
+        
+        warmed = len(self.sender_cache) - before
+        self.sender_cache.stats['prewarmed'] += warmed
+        self.logger.info(f"Sender cache pre-warmed with {warmed} entries for chat {chat_id}")
+    
+    def _mark_seen(self, chat_id: int, message_id: int, text: Optional[str] = None):
+        """Remember a delivered message ID (and its current text)"""
+        self.seen_message_ids[(chat_id, message_id)] = text
+        while len(self.seen_message_ids) > self.max_seen_ids:
+            self.seen_message_ids.popitem(last=False)
+    
+    async def get_messages_since(self, chat_id: int, min_id: int = 0, limit: Optional[int] = 200,
+                                 since: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """
+        Fetch messages of a chat that were not delivered live
+        
+        History is fetched newest first in pages of 100 messages.
+        
+        Args:
+            chat_id: Chat/group ID
+            min_id: Only messages with a higher ID (0 = the latest `limit` messages)
+            limit: Maximum number of messages to fetch (None = all after min_id)
+            since: Stop at messages sent before this time (timezone-aware)
+            
+        Returns:
+            Message data dictionaries, oldest first
+        """
+        if not self.is_connected:
+            self.logger.error("Not connected to Telegram")
+            return []
+        
+        try:
+            messages = []
+            async for message in self.client.iter_messages(chat_id, limit=limit, min_id=min_id):
+                # Older pages would only be skipped as stale
+                if since is not None and message.date is not None and message.date < since:
+                    break
+                if not message.message or (message.chat_id, message.id) in self.seen_message_ids:
+                    continue
+                messages.append(await self._build_message_data(message))
+            
+            messages.reverse()
+            self.logger.info(f"Fetched {len(messages)} missed messages from chat {chat_id} (after ID {min_id})")
+            return messages
+            
+        except Exception as e:
+            self.logger.error(f"Failed to fetch messages: {e}")
+            return []
+    
+    async def _watch_connection(self, interval: float = 5.0):
+        """
+        Detect a dropped-and-restored connection and report it
+        
+        Args:
+            interval: Seconds between connection checks
+        """
+        was_connected = True
+        while self.is_connected:
+            await asyncio.sleep(interval)
+            connected = self.client.is_connected()
+            
+            if connected and not was_connected:
+                self.logger.info(f"Telegram connection restored (watermarks {self.watermarks.snapshot()})")
+                asyncio.ensure_future(self._catch_up_gap())
+            elif not connected and was_connected:
+                self.logger.warning("Telegram connection lost")
+                self.watermarks.hold()
+            
+            # Throttled writes can leave the last advance unsaved on a quiet chat
+            self.watermarks.flush()
+            was_connected = connected
+    
+    def _get_live_gate(self) -> asyncio.Event:
+        """Create the live-message gate lazily so it binds to the running loop"""
+        if self._live_gate is None:
+            self._live_gate = asyncio.Event()
+            self._live_gate.set()
+        return self._live_gate
+    
+    async def _catch_up_gap(self):
+        """
+        Report a restored connection, releasing the watermarks once the gap is handled
+        
+        Live messages that arrive meanwhile are newer than the gap: the consumers
+        hold them until the catch-up is done, so every chat stays in order.
+        """
+        gate = self._get_live_gate()
+        gate.clear()
+        try:
+            # Messages delivered before the connection dropped finish first
+            if self._callback_tasks:
+                await asyncio.wait(set(self._callback_tasks))
+            if self.reconnect_callback:
+                loop = asyncio.get_event_loop()
+                await loop.run_in_executor(None, self.reconnect_callback, self.watermarks.snapshot())
+        except Exception as e:
+            self.logger.error(f"Reconnect callback failed: {e}")
+        finally:
+            self.watermarks.release()
+            gate.set()
+    
+    async def start_listening(self, chat_ids: Union[int, List[int]]) -> bool:
+        """
+        Start listening to messages from one or more chats
+        
+        Args:
+            chat_ids: Chat/group ID, or list of IDs, to listen to
             
         Returns:
             True if started successfully
@@ -160,68 +805,175 @@ class TelegramListener:
             self.logger.warning("Already listening to messages")
             return True
         
-        self.selected_chat_id = chat_id
+        if isinstance(chat_ids, int):
+            chat_ids = [chat_ids]
+        self.selected_chat_ids = list(chat_ids)
+        self.selected_chat_id = self.selected_chat_ids[0]
+        
+        # Known senders never cost a lookup on the message path
+        for chat_id in self.selected_chat_ids:
+            await self._prewarm_sender_cache(chat_id)
         
         # Register event handler for new messages
-        @self.client.on(events.NewMessage(chats=chat_id))
+        @self.client.on(events.NewMessage(chats=self.selected_chat_ids))
         async def message_handler(event):
             """Handle incoming messages"""
             if not self.is_listening:
                 return
             
             try:
-                # Extract message data
-                message_data = {
-                    'message_id': event.id,
-                    'text': event.message.message,
-                    'date': event.message.date,
-                    'sender_id': event.sender_id,
-                    'chat_id': event.chat_id,
-                    'is_reply': event.message.reply_to is not None,
-                }
-                
-                # Get sender info if available
-                try:
-                    sender = await event.get_sender()
-                    if sender:
-                        message_data['sender_name'] = getattr(sender, 'first_name', 'Unknown')
-                        message_data['sender_username'] = getattr(sender, 'username', None)
-                except:
-                    pass
+                # Extract message data (an uncached sender is resolved after dispatch)
+                message_data = await self._build_message_data(event.message, wait_for_sender=False)
+                self._mark_seen(event.chat_id, event.id, message_data['text'])
                 
                 self.logger.info(f"New message: {message_data['text'][:50]}...")
                 
-                # Call callback if set
+                # Queue for the chat's consumer (bounded, handled in arrival order)
                 if self.message_callback:
-                    # Run callback in a way that doesn't block the event loop
-                    asyncio.create_task(self._async_callback_wrapper(message_data))
+                    self._enqueue(message_data)
                 
             except Exception as e:
                 self.logger.error(f"Error handling message: {e}")
         
+        # Providers edit signals to add or fix SL/TP - edits are queued like messages
+        @self.client.on(events.MessageEdited(chats=self.selected_chat_ids))
+        async def edit_handler(event):
+            """Handle edited messages"""
+            if not self.is_listening:
+                return
+            
+            try:
+                message_data = await self._build_message_data(event.message, wait_for_sender=False)
+                key = (event.chat_id, event.id)
+                previous_text = self.seen_message_ids.get(key)
+                
+                # Reactions, view counts and link previews also arrive as edits
+                if not message_data['text'] or message_data['text'] == previous_text:
+                    return
+                
+                message_data['edited'] = True
+                message_data['previous_text'] = previous_text
+                self._mark_seen(event.chat_id, event.id, message_data['text'])
+                
+                self.logger.info(f"Edited message {event.id}: {message_data['text'][:50]}...")
+                
+                if self.message_callback:
+                    self._enqueue(message_data)
+                
+            except Exception as e:
+                self.logger.error(f"Error handling edited message: {e}")
+        
         self.is_listening = True
-        self.logger.info(f"Started listening to chat ID: {chat_id}")
+        self.logger.info(f"Started listening to chat IDs: {', '.join(map(str, self.selected_chat_ids))}")
+        
+        # Runs once the client loop is running (run_until_disconnected)
+        if self._watch_task is None:
+            self._watch_task = asyncio.ensure_future(self._watch_connection())
         
         return True
     
-    async def _async_callback_wrapper(self, message_data: Dict[str, Any]):
+    def _enqueue(self, message_data: Dict[str, Any]):
+        """
+        Put a message on its chat's queue, starting the chat's consumer if needed
+        
+        Args:
+            message_data: Message data dictionary
+        """
+        priority = PRIORITY_NORMAL
+        if self.priority_classifier:
+            try:
+                priority = self.priority_classifier(message_data)
+            except Exception as e:
+                self.logger.warning(f"Priority classifier failed: {e}")
+        
+        chat_id = message_data['chat_id']
+        queue = self.queues.get(chat_id)
+        if queue is None:
+            queue = self.queues[chat_id] = MessageQueue(max_size=self.queue_size,
+                                                        on_drop=functools.partial(self._handled, chat_id))
+        if chat_id not in self._consumers:
+            self._consumers[chat_id] = asyncio.ensure_future(self._consume(chat_id, queue))
+        
+        # Edits belong to messages the watermark already passed
+        if not message_data.get('edited'):
+            self.watermarks.start(chat_id, message_data['message_id'])
+        queue.put(message_data, priority)
+    
+    def _handled(self, chat_id: int, message_data: Dict[str, Any]):
+        """Advance the chat's watermark past a processed or dropped message"""
+        if not message_data.get('edited'):
+            self.watermarks.finish(chat_id, message_data['message_id'])
+    
+    async def _consume(self, chat_id: int, queue: MessageQueue):
+        """
+        Hand a chat's queued messages to the callback, in arrival order
+        
+        Args:
+            chat_id: Chat the queue belongs to
+            queue: The chat's message queue
+        """
+        slots = asyncio.Semaphore(self.max_concurrent)
+        gate = self._get_live_gate()
+        
+        def finished(message_data, task):
+            self._callback_tasks.discard(task)
+            queue.stats['processed'] += 1
+            slots.release()
+            self._handled(chat_id, message_data)
+        
+        while True:
+            message_data, wait = await queue.get()
+            if wait > 5.0:
+                self.logger.warning(f"Message {message_data['message_id']} waited {wait:.1f}s in the queue "
+                                    f"({len(queue)} still queued)")
+            
+            await slots.acquire()
+            await gate.wait()
+            task = asyncio.ensure_future(self._async_callback_wrapper(message_data, chat_id))
+            self._callback_tasks.add(task)
+            task.add_done_callback(functools.partial(finished, message_data))
+    
+    async def _async_callback_wrapper(self, message_data: Dict[str, Any], chat_id: Optional[int] = None):
         """
         Wrapper to handle callback execution
         
         Args:
             message_data: Message data dictionary
+            chat_id: Chat whose dedicated worker threads run a synchronous callback
         """
         try:
             # If callback is a coroutine
             if asyncio.iscoroutinefunction(self.message_callback):
                 await self.message_callback(message_data)
             else:
-                # Run synchronous callback in executor to avoid blocking
+                # Run synchronous callback on the chat's worker threads to avoid blocking
+                executor = self._executors.get(chat_id)
+                if executor is None:
+                    executor = self._executors[chat_id] = ThreadPoolExecutor(
+                        max_workers=self.max_concurrent, thread_name_prefix=f'chat-{chat_id}')
                 loop = asyncio.get_event_loop()
-                await loop.run_in_executor(None, self.message_callback, message_data)
+                await loop.run_in_executor(executor, self.message_callback, message_data)
         except Exception as e:
             self.logger.error(f"Error in message callback: {e}")
     
+    def get_queue_stats(self) -> Dict[int, Dict[str, Any]]:
+        """
+        Get per-chat queue statistics
+        
+        Returns:
+            Dictionary of chat ID -> MessageQueue statistics
+        """
+        return {chat_id: queue.get_stats() for chat_id, queue in self.queues.items()}
+    
+    def get_sender_cache_stats(self) -> Dict[str, Any]:
+        """
+        Get sender cache statistics
+        
+        Returns:
+            SenderCache statistics
+        """
+        return self.sender_cache.get_stats()
+    
     def stop_listening(self):
         """Stop listening to messages"""
         self.is_listening = False
@@ -268,7 +1020,8 @@ class TelegramClient:
     Synchronous wrapper around TelegramListener for easier use
     """
     
-    def __init__(self, api_id: int, api_hash: str, phone: str):
+    def __init__(self, api_id: int, api_hash: str, phone: str, queue_size: int = 100,
+                 sender_cache_size: int = 500, watermark_file: str = "data/watermarks.json"):
         """
         Initialize Telegram client
         
@@ -276,13 +1029,17 @@ class TelegramClient:
             api_id: Telegram API ID
             api_hash: Telegram API hash
             phone: Phone number
+            queue_size: Messages queued per chat before backpressure drops some
+            sender_cache_size: Sender names kept in memory
+            watermark_file: JSON file with the last processed message ID per chat
         """
         # Convert to integers/strings if needed
         self.api_id = int(api_id) if not isinstance(api_id, int) else api_id
         self.api_hash = str(api_hash)
         self.phone = str(phone)
         
-        self.listener = TelegramListener(self.api_id, self.api_hash, self.phone)
+        self.listener = TelegramListener(self.api_id, self.api_hash, self.phone, queue_size=queue_size,
+                                         sender_cache_size=sender_cache_size, watermark_file=watermark_file)
         self.loop: Optional[asyncio.AbstractEventLoop] = None
         self.logger = logging.getLogger('TradingBot.TelegramClient')
     
@@ -342,13 +1099,57 @@ class TelegramClient:
         """Get list of chats/groups"""
         return self._run_async(self.listener.get_dialogs())
     
-    def set_message_callback(self, callback: Callable):
+    def set_message_callback(self, callback: Callable, max_concurrent: int = 1):
         """Set message callback function"""
-        self.listener.set_message_callback(callback)
+        self.listener.set_message_callback(callback, max_concurrent)
+    
+    def set_priority_classifier(self, classifier: Callable):
+        """Set backpressure priority classifier"""
+        self.listener.set_priority_classifier(classifier)
+    
+    def get_queue_stats(self) -> Dict[int, Dict[str, Any]]:
+        """Get per-chat queue statistics"""
+        return self.listener.get_queue_stats()
+    
+    def get_sender_cache_stats(self) -> Dict[str, Any]:
+        """Get sender cache statistics"""
+        return self.listener.get_sender_cache_stats()
+    
+    def set_reconnect_callback(self, callback: Callable):
+        """Set reconnect callback function"""
+        self.listener.set_reconnect_callback(callback)
+    
+    def get_watermarks(self) -> Dict[int, int]:
+        """Get the last processed message ID per chat"""
+        return self.listener.watermarks.snapshot()
+    
+    def mark_pending(self, chat_id: int, message_id: int):
+        """Hold a chat's watermark below a message fetched outside the live queue until it is handled"""
+        self.listener.watermarks.start(chat_id, message_id)
+    
+    def mark_processed(self, chat_id: int, message_id: int):
+        """Advance a chat's watermark past a message handled outside the live queue"""
+        self.listener.watermarks.finish(chat_id, message_id)
+    
+    def get_messages_since(self, chat_id: int, min_id: int = 0, limit: Optional[int] = 200,
+                           since: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """Fetch messages that were not delivered live (oldest first)"""
+        coro = self.listener.get_messages_since(chat_id, min_id, limit, since)
+        
+        # Called from another thread while the client loop is running
+        if self.loop and self.loop.is_running():
+            future = asyncio.run_coroutine_threadsafe(coro, self.loop)
+            try:
+                return future.result(timeout=60.0)
+            except Exception as e:
+                self.logger.error(f"Failed to fetch messages: {e}")
+                return []
+        
+        return self._run_async(coro)
     
-    def start_listening(self, chat_id: int) -> bool:
-        """Start listening to messages"""
-        return self._run_async(self.listener.start_listening(chat_id))
+    def start_listening(self, chat_ids: Union[int, List[int]]) -> bool:
+        """Start listening to messages of one or more chats"""
+        return self._run_async(self.listener.start_listening(chat_ids))
     
     def stop_listening(self):
         """Stop listening to messages"""
@@ -365,7 +1166,6 @@ class TelegramClient:
 
 # Example usage and testing
 if __name__ == "__main__":
-    import os
     from dotenv import load_dotenv
     
     # Setup logging
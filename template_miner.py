@@ -0,0 +1,474 @@
+"""
+Template Miner - Compiles a provider's recurring message layouts into extractors
+
+Offline, the miner reads interpreted messages from the message log
+(llm.noise_filter.training_log, which stores every LLM interpretation) and
+the original_message of trades in trades.json. It reduces every message to a
+skeleton - words kept literally, prices replaced by numbered slots, pair
+names by a pair slot:
+
+    "XAUUSD SELL RANGE: 4435-4450, SL 4500, TP: 4400"
+        -> "{PAIR} SELL RANGE {N} {N} SL {N} TP {N}"
+
+Messages sharing a skeleton form a template. For every output field the miner
+learns a small program (take slot i, take the pair, or a constant) that
+reproduces the LLM's interpretation, then re-extracts every message of the
+template to measure agreement with the LLM. Templates with enough support and
+agreement are written to a JSON file that the live bot loads at startup
+(TemplateLibrary) and tries before calling the LLM:
+
+    python template_miner.py --log data/message_log.jsonl --trades data/trades.json
+"""
+
+import re
+import json
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Tuple
+
+from llm import NewSignal, ModifySignal, CloseSignal, NoSignal, SignalResponse
+from signal_parser import CURRENCIES, PAIR_ALIASES
+
+
+# ============================================================================
+# Skeletons
+# ============================================================================
+
+_pair_codes = '|'.join(CURRENCIES)
+
+SKELETON_TOKEN = re.compile(
+    rf'(?P<pair>(?:{_pair_codes})\s?/?\s?(?:{_pair_codes})|GOLD|SILVER|XAU|XAG)(?![A-Z])'
+    rf'|(?P<num>\d+(?:\.\d+)?)'
+    rf'|(?P<word>[A-Z]+(?:\'[A-Z]+)?)'
+    rf'|(?P<other>[^A-Z\d]+)'
+)
+
+# Interpretations produced locally are not evidence of what the LLM would say
+LOCAL_REASONING_PREFIXES = ('Fast-path', 'Template', 'Fallback')
+
+# Fields that describe the interpretation rather than the signal
+IGNORED_FIELDS = {'confidence', 'reasoning'}
+
+SIGNAL_MODELS = {
+    'new_signal': NewSignal,
+    'modify': ModifySignal,
+    'close': CloseSignal,
+    'none': NoSignal,
+}
+
+
+def skeletonize(message: str) -> Tuple[str, List[float], Optional[str]]:
+    """
+    Reduce a message to its layout
+
+    Args:
+        message: Raw message text
+
+    Returns:
+        Tuple of (skeleton key, numbers in order, first pair mentioned or None)
+    """
+    parts = []
+    numbers: List[float] = []
+    pair = None
+
+    for match in SKELETON_TOKEN.finditer(message.upper()):
+        kind = match.lastgroup
+        if kind == 'pair':
+            code = re.sub(r'[\s/]', '', match.group())
+            if pair is None:
+                pair = PAIR_ALIASES.get(code, code)
+            parts.append('{PAIR}')
+        elif kind == 'num':
+            numbers.append(float(match.group()))
+            parts.append('{N}')
+        elif kind == 'word':
+            parts.append(match.group())
+        # Punctuation, emojis and whitespace don't define the layout
+
+    return ' '.join(parts), numbers, pair
+
+
+def _same(a: Any, b: Any) -> bool:
+    """Compare interpretation values (numbers with tolerance, strings case-insensitively)"""
+    if a in (None, []) and b in (None, []):
+        return True
+    if isinstance(a, bool) or isinstance(b, bool):
+        return a == b
+    if isinstance(a, (int, float)) and isinstance(b, (int, float)):
+        return abs(a - b) < 1e-9
+    if isinstance(a, list) and isinstance(b, list):
+        return len(a) == len(b) and all(_same(x, y) for x, y in zip(a, b))
+    if isinstance(a, str) and isinstance(b, str):
+        return a.upper() == b.upper()
+    return a == b
+
+
+def _run_program(program: Dict[str, Any], numbers: List[float], pair: Optional[str]) -> Any:
+    """Evaluate one field program against a message's slots"""
+    if 'slot' in program:
+        return numbers[program['slot']] if program['slot'] < len(numbers) else None
+    if 'slots' in program:
+        return [numbers[i] for i in program['slots'] if i < len(numbers)]
+    if 'pair' in program:
+        return pair
+    return program.get('const')
+
+
+# ============================================================================
+# Live extraction
+# ============================================================================
+
+class TemplateLibrary:
+    """
+    Mined templates loaded by the live bot and tried before the LLM
+    """
+
+    def __init__(self, path: str, max_confidence: float = 0.95):
+        """
+        Initialize template library
+
+        Args:
+            path: JSON file written by `python template_miner.py`
+            max_confidence: Cap on the confidence reported for template matches
+        """
+        self.logger = logging.getLogger('TradingBot.Templates')
+        self.max_confidence = max_confidence
+        self.templates: Dict[str, Dict[str, Any]] = {}
+
+        self.stats: Dict[str, Any] = {
+            'attempts': 0,
+            'hits': 0,
+            'by_template': {},
+        }
+
+        self.load(path)
+
+    def load(self, path: str) -> int:
+        """
+        Load templates, keyed by skeleton
+
+        Args:
+            path: Template file
+
+        Returns:
+            Number of templates loaded (0 if the file is missing/invalid)
+        """
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.templates = {t['skeleton']: t for t in data['templates']}
+            self.logger.info(f"Loaded {len(self.templates)} message templates from {path}")
+        except FileNotFoundError:
+            self.logger.info(f"No template file at {path} - run template_miner.py to create one")
+        except Exception as e:
+            self.logger.error(f"Failed to load templates from {path}: {e}")
+        return len(self.templates)
+
+    def extract(self,
+                message: str,
+                active_trades: Optional[List[Dict[str, Any]]] = None,
+                last_trade_pair: Optional[str] = None) -> Optional[SignalResponse]:
+        """
+        Interpret a message with a mined template
+
+        Args:
+            message: Raw message text
+            active_trades: Unused (templates are context-free); kept for a uniform interface
+            last_trade_pair: Unused
+
+        Returns:
+            SignalResponse if the message's layout is a known template, else None
+        """
+        if not self.templates or not message:
+            return None
+
+        self.stats['attempts'] += 1
+        skeleton, numbers, pair = skeletonize(message)
+        template = self.templates.get(skeleton)
+        if template is None:
+            return None
+
+        fields = {name: _run_program(program, numbers, pair)
+                  for name, program in template['fields'].items()}
+        signal_type = fields.pop('signal_type', template['signal_type'])
+        model = SIGNAL_MODELS.get(signal_type)
+        if model is None:
+            return None
+
+        fields = {name: value for name, value in fields.items() if value is not None}
+        try:
+            result = model(
+                **fields,
+                signal_type=signal_type,
+                confidence=min(self.max_confidence, template['agreement']),
+                reasoning=(f"Template {template['id']}: {template['skeleton']} "
+                           f"(support {template['support']}, agreement {template['agreement']:.0%})")
+            )
+        except Exception as e:
+            self.logger.warning(f"Template {template['id']} produced an invalid signal: {e}")
+            return None
+
+        self.stats['hits'] += 1
+        by_template = self.stats['by_template']
+        by_template[template['id']] = by_template.get(template['id'], 0) + 1
+        self.logger.info(f"Template hit {template['id']} ({signal_type}) - LLM call skipped")
+        return result
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get template hit statistics
+
+        Returns:
+            Dictionary with template count, attempts, hits, hit rate and per-template hits
+        """
+        attempts = self.stats['attempts']
+        return {
+            'templates': len(self.templates),
+            'attempts': attempts,
+            'hits': self.stats['hits'],
+            'hit_rate': self.stats['hits'] / attempts if attempts else 0.0,
+            'by_template': dict(self.stats['by_template']),
+        }
+
+
+# ============================================================================
+# Offline mining
+# ============================================================================
+
+class TemplateMiner:
+    """
+    Clusters interpreted messages by skeleton and learns field programs
+    """
+
+    def __init__(self, min_support: int = 3, min_agreement: float = 0.95):
+        """
+        Initialize miner
+
+        Args:
+            min_support: Messages a template needs before it is emitted
+            min_agreement: Fraction of a template's messages it must reproduce exactly
+        """
+        self.min_support = min_support
+        self.min_agreement = min_agreement
+        self.logger = logging.getLogger('TradingBot.TemplateMiner')
+        self.examples: List[Tuple[str, Dict[str, Any]]] = []
+
+    def load_message_log(self, path: str) -> int:
+        """
+        Add LLM interpretations from the message log
+
+        Args:
+            path: JSONL file written by NoiseFilter.record()
+
+        Returns:
+            Number of examples added
+        """
+        added = 0
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                entry = json.loads(line)
+                interpretation = entry.get('interpretation')
+                if not entry.get('text') or not interpretation:
+                    continue
+                if str(interpretation.get('reasoning', '')).startswith(LOCAL_REASONING_PREFIXES):
+                    continue
+                if interpretation.get('signal_type') not in SIGNAL_MODELS:
+                    continue
+                self.examples.append((entry['text'], interpretation))
+                added += 1
+        return added
+
+    def load_trades(self, path: str) -> int:
+        """
+        Add new-signal interpretations reconstructed from trades.json
+
+        Only fields that are stored unmodified are used; trades whose SL/TP
+        were changed afterwards contribute pair/action/entry only.
+
+        Args:
+            path: trades.json written by TradeManager
+
+        Returns:
+            Number of examples added
+        """
+        known = {text for text, _ in self.examples}
+        with open(path, 'r') as f:
+            trades = json.load(f)
+
+        added = 0
+        for trade in trades.values():
+            message = trade.get('original_message')
+            if not message or message in known:
+                continue
+
+            interpretation = {
+                'signal_type': 'new_signal',
+                'pair': trade['pair'],
+                'action': trade['action'],
+                'entry_price': trade['entry_price'],
+                'execution_type': 'pending' if trade.get('signal_entry') is not None else 'immediate',
+            }
+            if not trade.get('modifications'):
+                interpretation['stop_loss'] = trade['stop_loss']
+                if trade.get('tp_levels'):
+                    interpretation['tp_levels'] = trade['tp_levels']
+                else:
+                    interpretation['take_profit'] = trade['take_profit']
+
+            self.examples.append((message, interpretation))
+            known.add(message)
+            added += 1
+        return added
+
+    def _learn_program(self, field: str,
+                       samples: List[Tuple[Any, List[float], Optional[str]]]) -> Dict[str, Any]:
+        """
+        Pick the field program that reproduces the most samples
+
+        Args:
+            field: Field name
+            samples: (LLM value, numbers, pair) for each message that has the field
+
+        Returns:
+            Program dictionary (slot / slots / pair / const)
+        """
+        candidates: List[Dict[str, Any]] = []
+        first_value, first_numbers, _ = samples[0]
+
+        # Slots are preferred over constants - they generalize to new prices
+        if isinstance(first_value, list) and first_value:
+            positions = []
+            for element in first_value:
+                positions.append([i for i, n in enumerate(first_numbers) if _same(element, n)])
+            if all(positions):
+                candidates.append({'slots': [p[0] for p in positions]})
+        elif isinstance(first_value, (int, float)) and not isinstance(first_value, bool):
+            candidates.extend({'slot': i} for i, n in enumerate(first_numbers) if _same(first_value, n))
+        if isinstance(first_value, str):
+            candidates.append({'pair': True})
+        candidates.append({'const': first_value})
+
+        best, best_hits = candidates[-1], -1
+        for program in candidates:
+            hits = sum(1 for value, numbers, pair in samples
+                       if _same(_run_program(program, numbers, pair), value))
+            if hits > best_hits:
+                best, best_hits = program, hits
+        return best
+
+    def mine(self) -> List[Dict[str, Any]]:
+        """
+        Cluster examples into templates and score them
+
+        Returns:
+            All templates (accepted or not), largest first, with support,
+            coverage, agreement and an 'accepted' flag
+        """
+        clusters: Dict[str, List[Tuple[List[float], Optional[str], Dict[str, Any]]]] = {}
+        for message, interpretation in self.examples:
+            skeleton, numbers, pair = skeletonize(message)
+            if skeleton:
+                clusters.setdefault(skeleton, []).append((numbers, pair, interpretation))
+
+        total = len(self.examples)
+        templates = []
+        for skeleton, members in sorted(clusters.items(), key=lambda c: -len(c[1])):
+            fields = sorted({name for _, _, interp in members for name in interp} - IGNORED_FIELDS)
+
+            programs = {}
+            for field in fields:
+                samples = [(interp[field], numbers, pair)
+                           for numbers, pair, interp in members if field in interp]
+                programs[field] = self._learn_program(field, samples)
+
+            # Agreement: re-extract every member and compare every field the LLM gave
+            agreeing = sum(
+                1 for numbers, pair, interp in members
+                if all(_same(_run_program(programs[name], numbers, pair), value)
+                       for name, value in interp.items() if name not in IGNORED_FIELDS)
+            )
+            signal_types = {interp.get('signal_type') for _, _, interp in members}
+            signal_type = next(iter(signal_types)) if len(signal_types) == 1 else 'mixed'
+            support = len(members)
+            agreement = agreeing / support
+
+            templates.append({
+                'skeleton': skeleton,
+                'signal_type': signal_type,
+                'fields': programs,
+                'support': support,
+                'coverage': support / total if total else 0.0,
+                'agreement': round(agreement, 4),
+                'accepted': (support >= self.min_support and agreement >= self.min_agreement
+                             and signal_type != 'mixed'),
+            })
+
+        for i, template in enumerate(templates, 1):
+            template['id'] = f"T{i:03d}"
+        return templates
+
+    def save(self, templates: List[Dict[str, Any]], path: str) -> int:
+        """
+        Write accepted templates for the live bot
+
+        Args:
+            templates: Output of mine()
+            path: Output JSON file
+
+        Returns:
+            Number of templates written
+        """
+        accepted = [{k: v for k, v in t.items() if k != 'accepted'} for t in templates if t['accepted']]
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'version': 1,
+                'generated_at': datetime.now().isoformat(),
+                'examples': len(self.examples),
+                'min_support': self.min_support,
+                'min_agreement': self.min_agreement,
+                'templates': accepted,
+            }, f, indent=2)
+        return len(accepted)
+
+
+# Offline mining
+if __name__ == "__main__":
+    import argparse
+
+    logging.basicConfig(level=logging.INFO)
+
+    parser = argparse.ArgumentParser(description="Mine provider message templates")
+    parser.add_argument('--log', default='data/message_log.jsonl', help="Message log with interpretations")
+    parser.add_argument('--trades', default='data/trades.json', help="Trade history")
+    parser.add_argument('--output', default='data/templates.json')
+    parser.add_argument('--min-support', type=int, default=3)
+    parser.add_argument('--min-agreement', type=float, default=0.95)
+    args = parser.parse_args()
+
+    miner = TemplateMiner(min_support=args.min_support, min_agreement=args.min_agreement)
+    for label, loader, path in (("message log", miner.load_message_log, args.log),
+                                ("trades", miner.load_trades, args.trades)):
+        if Path(path).exists():
+            print(f"Loaded {loader(path)} interpreted messages from {label} ({path})")
+        else:
+            print(f"⚠ {label} not found: {path}")
+
+    templates = miner.mine()
+    written = miner.save(templates, args.output)
+
+    print(f"\n{'ID':<6}{'Type':<12}{'Support':>8}{'Coverage':>10}{'Agreement':>11}  Skeleton")
+    for t in templates:
+        if t['support'] < 2:
+            continue
+        mark = '✓' if t['accepted'] else ' '
+        print(f"{t['id']:<6}{t['signal_type']:<12}{t['support']:>8}{t['coverage']:>10.1%}"
+              f"{t['agreement']:>11.0%}  {mark} {t['skeleton'][:60]}")
+
+    covered = sum(t['coverage'] for t in templates if t['accepted'])
+    print(f"\n✓ {written} templates written to {args.output} "
+          f"(cover {covered:.1%} of {len(miner.examples)} messages)")
@@ -0,0 +1,43 @@
+"""
+Pytest configuration - makes the top-level bot modules importable from tests/
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+
+@pytest.fixture
+def bot(tmp_path, monkeypatch):
+    """TradingBot on a paper MT5 client, with its files under tmp_path (needs MetaTrader5)"""
+    pytest.importorskip("MetaTrader5")
+    monkeypatch.chdir(tmp_path)
+
+    from main import TradingBot
+    from trade_manager import TradeManager, ExecutionGuard
+    from llm_replay import PaperMT5Client
+
+    bot = TradingBot(str(ROOT / "config.yaml"))
+    bot.trade_manager = TradeManager(storage_file=str(tmp_path / "trades.json"))
+    bot.execution_guard = ExecutionGuard()
+    bot.mt5_client = PaperMT5Client()
+    bot.mt5_client.prices.update({'XAUUSD': 4450.0, 'EURUSD': 1.08})
+    bot.is_running = True
+    return bot
+
+
+@pytest.fixture
+def open_trade(bot):
+    """Open a paper position and record its trade, as the entry handler does"""
+    def open_trade(message_id, text, action="BUY", pair="XAUUSD", stop_loss=4440.0, take_profit=4470.0):
+        _, ticket, _ = bot.mt5_client.place_market_order(pair, action, 0.1, stop_loss, take_profit)
+        return bot.trade_manager.add_trade({
+            'pair': pair, 'action': action, 'entry_price': bot.mt5_client.prices[pair],
+            'stop_loss': stop_loss, 'take_profit': take_profit, 'lot_size': 0.1,
+            'mt5_ticket': ticket, 'original_message': text, 'telegram_msg_id': message_id,
+        })
+    return open_trade
@@ -0,0 +1,81 @@
+"""
+Tests for the SL/TP burst coalescer
+"""
+
+import threading
+
+import pytest
+
+from coalescer import BurstCoalescer
+
+
+@pytest.fixture
+def flushed():
+    return []
+
+
+def make_coalescer(flushed, window=0.05, max_wait=10.0):
+    done = threading.Event()
+
+    def on_flush(burst):
+        flushed.append(burst)
+        done.set()
+
+    coalescer = BurstCoalescer(on_flush, window_seconds=window, max_wait_seconds=max_wait)
+    coalescer.done = done
+    return coalescer
+
+
+def test_fragments_merge_into_one_burst(flushed):
+    coalescer = make_coalescer(flushed)
+    coalescer.add("p", {'stop_loss': 4500.0}, 1, "SL 4500", context="trade")
+    coalescer.add("p", {'tp_levels': [4550.0, 4600.0]}, 2, "TP 4550/4600")
+    coalescer.add("p", {'stop_loss': 4490.0, 'tp_levels': [4550.0]}, 3, "SL 4490 TP 4550")
+
+    assert coalescer.done.wait(2)
+    assert len(flushed) == 1
+    burst = flushed[0]
+    assert burst.context == "trade"
+    assert burst.stop_loss == 4490.0
+    assert burst.tp_levels == [4550.0, 4600.0]
+    assert burst.message_ids == [1, 2, 3]
+    assert coalescer.get_stats()['modifications_saved'] == 2
+
+
+def test_early_flush_applies_immediately(flushed):
+    coalescer = make_coalescer(flushed, window=60)
+    coalescer.add("p", {'stop_loss': 4500.0}, 1, "SL 4500")
+    assert coalescer.pending("p")
+
+    assert coalescer.flush("p")
+    assert not coalescer.pending("p")
+    assert [burst.stop_loss for burst in flushed] == [4500.0]
+    assert not coalescer.flush("p")
+    assert coalescer.get_stats()['early_flushes'] == 1
+
+
+def test_keys_are_independent(flushed):
+    coalescer = make_coalescer(flushed, window=60)
+    coalescer.add("a", {'stop_loss': 4500.0}, 1, "SL 4500")
+    coalescer.add("b", {'stop_loss': 1.05}, 2, "SL 1.05")
+    coalescer.flush("a")
+    assert coalescer.pending("b")
+    coalescer.flush_all()
+    assert sorted(burst.key for burst in flushed) == ["a", "b"]
+
+
+def test_max_wait_caps_a_busy_burst(flushed):
+    coalescer = make_coalescer(flushed, window=60, max_wait=0.05)
+    coalescer.add("p", {'stop_loss': 4500.0}, 1, "SL 4500")
+    assert coalescer.done.wait(2)
+    assert len(flushed) == 1
+
+
+def test_flush_callback_errors_are_contained():
+    def on_flush(burst):
+        raise RuntimeError("MT5 down")
+
+    coalescer = BurstCoalescer(on_flush, window_seconds=60)
+    coalescer.add("p", {'stop_loss': 4500.0}, 1, "SL 4500")
+    assert coalescer.flush("p")
+    assert not coalescer.pending("p")
@@ -0,0 +1,53 @@
+"""
+Tests for the token-budgeted LLM context
+"""
+
+from context_builder import ContextBuilder, estimate_tokens
+
+
+def make_trade(trade_id, entry=4440.0):
+    return {'trade_id': trade_id, 'action': 'BUY', 'pair': 'XAUUSD', 'entry_price': entry,
+            'stop_loss': 4420.0, 'take_profit': 4480.0, 'lot_size': 0.1,
+            'original_message': 'BUY GOLD NOW SL 4420 TP 4480'}
+
+
+def test_context_carries_no_signal_previews():
+    text, _ = ContextBuilder().build([make_trade('a')], [], None)
+    assert text == "Active trades:\n1. BUY XAUUSD @ 4440.0 (SL: 4420.0, TP: 4480.0, Lot: 0.1)"
+
+
+def test_budget_drops_oldest_conversation_first():
+    messages = [f"message number {i} with some filler words to take up space" for i in range(10)]
+    unlimited, unlimited_tokens = ContextBuilder().build([make_trade('a')], messages, "XAUUSD")
+    text, tokens = ContextBuilder(token_budget=100).build([make_trade('a')], messages, "XAUUSD")
+
+    assert tokens <= 100 < unlimited_tokens
+    assert "message number 9" in text
+    assert "message number 0" not in text
+    assert "BUY XAUUSD" in text
+    assert "MOST RECENT TRADE: XAUUSD" in text
+
+
+def test_changed_trade_is_rendered_again():
+    builder = ContextBuilder()
+    builder.build([make_trade('a')], [], None)
+    text, _ = builder.build([make_trade('a', entry=4450.0)], [], None)
+    assert "@ 4450.0" in text
+    assert builder.get_stats()['lines_rendered'] == 2
+
+
+def test_estimate_tokens():
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("abcd") == 1
+    assert estimate_tokens("abcde") == 2
+
+
+def test_forked_builders_keep_their_own_trades():
+    first = ContextBuilder()
+    second = first.fork()
+    for _ in range(2):
+        first.build([make_trade('a')], [], None)
+        second.build([make_trade('b')], [], None)
+    stats = first.get_stats()
+    assert stats['lines_rendered'] == 2
+    assert stats['calls'] == 4
@@ -0,0 +1,53 @@
+"""
+Tests for the duplicate-execution guard
+"""
+
+import time
+
+from providers import Provider
+from trade_manager import ExecutionGuard
+
+
+def test_second_claim_is_blocked():
+    guard = ExecutionGuard(window_seconds=60)
+    assert guard.claim("buy gold now sl 4440")
+    assert not guard.claim("buy gold now sl 4440")
+    assert guard.blocked == 1
+
+
+def test_different_content_is_independent():
+    guard = ExecutionGuard(window_seconds=60)
+    assert guard.claim("buy gold now")
+    assert guard.claim("sell gold now")
+
+
+def test_claim_expires_after_window():
+    guard = ExecutionGuard(window_seconds=0.05)
+    assert guard.claim("buy gold now")
+    time.sleep(0.1)
+    assert guard.claim("buy gold now")
+
+
+def test_oldest_claims_forgotten_beyond_capacity():
+    guard = ExecutionGuard(window_seconds=60, max_entries=2)
+    for content in ("a", "b", "c"):
+        assert guard.claim(content)
+    assert not guard.claim("c")
+    assert guard.claim("a")
+
+
+def test_message_keys_let_repeated_instructions_through():
+    guard = ExecutionGuard(window_seconds=60)
+    assert guard.claim("message|100|1|take partials")
+    assert guard.claim("message|100|2|take partials")
+    # The same message delivered again is still a duplicate
+    assert not guard.claim("message|100|1|take partials")
+
+
+def test_provider_scoped_content():
+    guard = ExecutionGuard(window_seconds=60)
+    first = Provider(chat_id=100, name="first")
+    second = Provider(chat_id=200, name="second")
+    assert guard.claim(first.guard_key("buy gold now"))
+    assert guard.claim(second.guard_key("buy gold now"))
+    assert not guard.claim(first.guard_key("buy gold now"))
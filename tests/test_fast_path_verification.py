@@ -0,0 +1,97 @@
+"""
+Tests for reconciling fast-path entries with the LLM's interpretation
+"""
+
+import threading
+
+from llm import NewSignal, NoSignal
+
+
+TEXT = "BUY GOLD @4450 SL 4440 TP 4470"
+
+
+def signal(action="BUY", pair="XAUUSD", stop_loss=4440.0, take_profit=4470.0, tp_levels=None, reasoning="llm"):
+    return NewSignal(pair=pair, action=action, entry_price=4450.0, stop_loss=stop_loss,
+                     take_profit=take_profit, tp_levels=tp_levels, confidence=0.9, reasoning=reasoning)
+
+
+def test_agreeing_signals_have_no_divergences(bot):
+    assert bot._signal_divergences(signal(), signal()) == {}
+
+
+def test_gold_alias_matches_xauusd(bot):
+    assert bot._signal_divergences(signal(pair="GOLD"), signal(pair="XAUUSD")) == {}
+
+
+def test_level_and_direction_divergences(bot):
+    assert bot._signal_divergences(signal(), signal(stop_loss=4435.0)) == {'stop_loss': [4440.0, 4435.0]}
+    assert bot._signal_divergences(signal(), signal(take_profit=4480.0)) == {'take_profit': [4470.0, 4480.0]}
+    assert 'action' in bot._signal_divergences(signal(), signal(action="SELL", stop_loss=4460.0, take_profit=4430.0))
+
+
+def test_llm_missing_level_is_not_a_divergence(bot):
+    assert bot._signal_divergences(signal(), signal(stop_loss=None)) == {}
+
+
+def test_non_entry_llm_reading_diverges_on_type(bot):
+    llm_signal = NoSignal(confidence=0.9, reasoning="commentary")
+    assert bot._signal_divergences(signal(), llm_signal) == {'signal_type': ['new_signal', 'none']}
+
+
+def test_level_divergence_modifies_the_position(bot, open_trade):
+    trade = open_trade(7, TEXT)
+
+    bot._reconcile_fast_signal(signal(), signal(stop_loss=4435.0), None, TEXT, 7)
+
+    assert bot.mt5_client.positions[trade.mt5_ticket]['sl'] == 4435.0
+    assert bot.mt5_client.positions[trade.mt5_ticket]['tp'] == 4470.0
+    assert trade.stop_loss == 4435.0 and trade.take_profit == 4470.0
+    assert bot.verification_stats['corrected'] == 1
+
+
+def test_levels_changed_since_execution_are_not_overwritten(bot, open_trade):
+    trade = open_trade(7, TEXT)
+    trade.update_stop_loss(4450.0)
+    bot.mt5_client.modify_order(trade.mt5_ticket, 4450.0, 4470.0)
+
+    bot._reconcile_fast_signal(signal(), signal(stop_loss=4435.0), None, TEXT, 7)
+
+    assert bot.mt5_client.positions[trade.mt5_ticket]['sl'] == 4450.0
+    assert trade.stop_loss == 4450.0
+    assert bot.verification_stats['corrected'] == 0
+
+
+def test_direction_divergence_unwinds_and_follows_the_llm(bot, open_trade):
+    trade = open_trade(7, TEXT)
+    llm_signal = signal(action="SELL", stop_loss=4460.0, take_profit=4430.0)
+
+    bot._reconcile_fast_signal(signal(), llm_signal, None, TEXT, 7)
+
+    assert trade.status == 'closed'
+    assert trade.mt5_ticket not in bot.mt5_client.positions
+    assert [p['type'] for p in bot.mt5_client.positions.values()] == ['SELL']
+    assert bot.verification_stats['unwound'] == 1
+
+
+def test_no_signal_unwinds_without_a_new_trade(bot, open_trade):
+    trade = open_trade(7, TEXT)
+
+    bot._reconcile_fast_signal(signal(), NoSignal(confidence=0.9, reasoning="commentary"), None, TEXT, 7)
+
+    assert trade.status == 'closed'
+    assert bot.mt5_client.positions == {}
+
+
+def test_correction_waits_for_the_execution_lock(bot, open_trade):
+    trade = open_trade(7, TEXT)
+    worker = threading.Thread(target=bot._reconcile_fast_signal,
+                              args=(signal(), signal(stop_loss=4435.0), None, TEXT, 7))
+
+    with bot._execution_lock:
+        worker.start()
+        worker.join(timeout=0.2)
+        assert worker.is_alive()
+        assert bot.mt5_client.positions[trade.mt5_ticket]['sl'] == 4440.0
+    worker.join(timeout=5)
+
+    assert bot.mt5_client.positions[trade.mt5_ticket]['sl'] == 4435.0
@@ -0,0 +1,52 @@
+"""
+Tests for batched backlog interpretation
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from llm import LLMInterpreter, InterpretationCache
+from signal_parser import FastSignalParser
+
+
+def tool_call(ref, name="report_new_signal", **fields):
+    tool_input = dict(pair="XAUUSD", action="SELL", entry_price=0.0, confidence=0.9,
+                      reasoning="test", message_ref=ref)
+    tool_input.update(fields)
+    return SimpleNamespace(type="tool_use", name=name, input=tool_input)
+
+
+@pytest.fixture
+def interpreter():
+    interpreter = LLMInterpreter(api_key="test", fast_parser=FastSignalParser(),
+                                 result_cache=InterpretationCache())
+    interpreter.requests = []
+
+    def create(request):
+        interpreter.requests.append(request)
+        usage = SimpleNamespace(input_tokens=100, output_tokens=20)
+        return SimpleNamespace(content=[tool_call(1), tool_call(2)], usage=usage)
+
+    interpreter._create = create
+    return interpreter
+
+
+def test_local_answers_returned_without_llm(interpreter):
+    results = interpreter.interpret_batch([(1, "BUY GOLD @4450 SL 4440 TP 4470")])
+    assert results[1].action == "BUY"
+    assert interpreter.requests == []
+    assert interpreter.fast_parser.get_stats()['attempts'] == 1
+
+
+def test_batch_combines_local_and_llm_answers(interpreter):
+    results = interpreter.interpret_batch([
+        (1, "BUY GOLD @4450 SL 4440 TP 4470"),
+        (2, "gold looks heavy here, I'm selling"),
+        (3, "going short on gold now"),
+    ])
+    assert set(results) == {1, 2, 3}
+    assert len(interpreter.requests) == 1
+    totals = interpreter.metrics.get_stats()['totals']
+    assert totals['calls'] == 1
+    assert totals['messages'] == 2
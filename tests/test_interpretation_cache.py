@@ -0,0 +1,99 @@
+"""
+Tests for the interpretation result cache
+"""
+
+import asyncio
+
+from llm import InterpretationCache, SingleFlight, NewSignal
+
+
+def make_signal(action="BUY"):
+    return NewSignal(pair="XAUUSD", action=action, entry_price=0.0, stop_loss=4440.0,
+                     take_profit=4470.0, confidence=0.9, reasoning="test")
+
+
+def trade(trade_id="t1", action="BUY", stop_loss=4440.0, take_profit=4470.0):
+    return {'trade_id': trade_id, 'pair': 'XAUUSD', 'action': action,
+            'stop_loss': stop_loss, 'take_profit': take_profit}
+
+
+def test_hit_on_reposted_message():
+    cache = InterpretationCache()
+    cache.put("BUY GOLD NOW 🚀", [], None, make_signal())
+    assert cache.get("buy gold now", [], None).action == "BUY"
+    assert cache.get_stats()['hits'] == 1
+
+
+def test_hit_returns_a_copy():
+    cache = InterpretationCache()
+    cache.put("BUY GOLD NOW", [], None, make_signal())
+    cache.get("BUY GOLD NOW", [], None).entry_price = 4450.0
+    assert cache.get("BUY GOLD NOW", [], None).entry_price == 0.0
+
+
+def test_replaced_trade_with_same_pair_and_direction_invalidates():
+    cache = InterpretationCache()
+    cache.put("close it", [trade("t1")], None, make_signal())
+    assert cache.get("close it", [trade("t2")], None) is None
+    assert cache.get_stats()['invalidations'] == 1
+
+
+def test_changed_levels_invalidate():
+    cache = InterpretationCache()
+    cache.put("SET BE", [trade(stop_loss=4440.0)], None, make_signal())
+    assert cache.get("SET BE", [trade(stop_loss=4450.0)], None) is None
+
+
+def test_last_trade_pair_invalidates():
+    cache = InterpretationCache()
+    cache.put("TP 4470", [], "XAUUSD", make_signal())
+    assert cache.get("TP 4470", [], "EURUSD") is None
+
+
+def test_system_prompt_is_part_of_the_key():
+    cache = InterpretationCache()
+    cache.put("BUY NOW", [], None, make_signal(), system_prompt="provider A")
+    assert cache.get("BUY NOW", [], None, system_prompt="provider B") is None
+    assert cache.get("BUY NOW", [], None) is None
+    assert cache.get("BUY NOW", [], None, system_prompt="provider A") is not None
+
+
+def test_ttl_expiry():
+    cache = InterpretationCache(ttl_seconds=0)
+    cache.put("BUY GOLD NOW", [], None, make_signal())
+    assert cache.get("BUY GOLD NOW", [], None) is None
+    assert cache.get_stats()['expirations'] == 1
+
+
+def test_lru_eviction():
+    cache = InterpretationCache(max_size=2)
+    for message in ("one", "two", "three"):
+        cache.put(message, [], None, make_signal())
+    assert cache.get("one", [], None) is None
+    assert cache.get_stats()['evictions'] == 1
+
+
+def test_single_flight_key_follows_cache_key():
+    assert SingleFlight.key("BUY NOW!", [trade()], None) == SingleFlight.key("buy now", [trade()], None)
+    assert SingleFlight.key("BUY NOW", [], None, "A") != SingleFlight.key("BUY NOW", [], None, "B")
+
+
+def test_single_flight_survives_cancelled_leader():
+    flight = SingleFlight()
+    calls = []
+
+    async def request():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return len(calls)
+
+    async def scenario():
+        leader = asyncio.ensure_future(flight.do_async(("k",), request))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(flight.do_async(("k",), request))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        return await follower
+
+    assert asyncio.run(scenario()) == 2
+    assert flight.get_stats()['in_flight'] == 0
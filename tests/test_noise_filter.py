@@ -0,0 +1,29 @@
+"""
+Tests for the local noise pre-filter (built-in weights)
+"""
+
+import pytest
+
+from noise_filter import NoiseFilter
+
+
+@pytest.fixture
+def noise_filter():
+    return NoiseFilter(threshold=0.2)
+
+
+@pytest.mark.parametrize("message", [
+    "cut it",
+    "Cut it now guys",
+    "BE",
+    "set break even",
+    "cancel the pending",
+    "secure profits",
+    "close half",
+])
+def test_trade_management_is_never_dropped(noise_filter, message):
+    assert not noise_filter.is_noise(message)
+
+
+def test_chatter_is_dropped(noise_filter):
+    assert noise_filter.is_noise("good morning everyone, have a great week")
@@ -0,0 +1,27 @@
+"""
+Tests for per-provider interpreter views
+"""
+
+import asyncio
+
+from context_builder import ContextBuilder
+from llm import LLMInterpreter, AsyncLLMInterpreter
+
+
+def test_views_have_own_context_builder():
+    interpreter = LLMInterpreter(api_key="test", context_builder=ContextBuilder(token_budget=500))
+    first = interpreter.for_provider("XAUUSD")
+    second = interpreter.for_provider("EURUSD")
+    assert first.context_builder is not second.context_builder
+    assert first.context_builder.token_budget == 500
+
+
+def test_async_views_share_one_in_flight_limit():
+    interpreter = AsyncLLMInterpreter(api_key="test", max_in_flight=2)
+    views = [interpreter.for_provider("XAUUSD"), interpreter.for_provider("EURUSD")]
+
+    async def semaphores():
+        return [view._get_semaphore() for view in views] + [interpreter._get_semaphore()]
+
+    first, second, own = asyncio.run(semaphores())
+    assert first is second is own
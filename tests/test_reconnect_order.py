@@ -0,0 +1,47 @@
+"""
+Tests for message order across a reconnect catch-up
+"""
+
+import asyncio
+import time
+
+from telegram import TelegramListener
+
+
+def message(message_id, text, chat_id=100):
+    return {'chat_id': chat_id, 'message_id': message_id, 'text': text}
+
+
+def test_live_message_waits_for_gap(tmp_path):
+    listener = TelegramListener(api_id=1, api_hash="test", phone="test",
+                                watermark_file=str(tmp_path / "watermarks.json"))
+    handled = []
+
+    def on_message(message_data):
+        handled.append(message_data['text'])
+
+    def on_reconnect(watermarks):
+        # The gap's entry takes a while to interpret and execute
+        time.sleep(0.1)
+        handled.append("BUY NOW")
+        listener.watermarks.finish(100, 11)
+
+    listener.set_message_callback(on_message)
+    listener.set_reconnect_callback(on_reconnect)
+
+    async def scenario():
+        catch_up = asyncio.ensure_future(listener._catch_up_gap())
+        await asyncio.sleep(0)
+        # Posted after the reconnect, but refers to the gap's entry
+        listener._enqueue(message(12, "SL 4450"))
+        await catch_up
+        for _ in range(100):
+            if len(handled) == 2:
+                break
+            await asyncio.sleep(0.01)
+        for consumer in listener._consumers.values():
+            consumer.cancel()
+
+    asyncio.run(scenario())
+    assert handled == ["BUY NOW", "SL 4450"]
+    assert listener.watermarks.get(100) == 12
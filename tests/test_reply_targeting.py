@@ -0,0 +1,79 @@
+"""
+Tests for targeting the trade of a replied-to signal message
+"""
+
+from llm import ModifySignal
+from trade_manager import TradeManager
+
+
+def trade_data(message_id, pair="XAUUSD", provider=None):
+    return {'pair': pair, 'action': 'BUY', 'entry_price': 4450.0, 'stop_loss': 4440.0,
+            'take_profit': 4470.0, 'lot_size': 0.1, 'mt5_ticket': message_id,
+            'telegram_msg_id': message_id, 'signal_provider': provider}
+
+
+def test_message_index_finds_trades_of_a_message(tmp_path):
+    manager = TradeManager(storage_file=str(tmp_path / "trades.json"))
+    first = manager.add_trade(trade_data(1))
+    second = manager.add_trade(trade_data(1))
+    other = manager.add_trade(trade_data(2, provider="vip"))
+
+    assert manager.get_trades_by_message(1) == [first, second]
+    assert manager.get_trades_by_message(2, "vip") == [other]
+    assert manager.get_trades_by_message(2, "free") == []
+    assert manager.get_trades_by_message(3) == []
+
+
+def test_message_index_follows_updates_deletes_and_reloads(tmp_path):
+    storage = str(tmp_path / "trades.json")
+    manager = TradeManager(storage_file=storage)
+    trade = manager.add_trade(trade_data(1))
+    manager.add_trade(trade_data(2))
+
+    manager.update_trade(trade.trade_id, {'telegram_msg_id': 5})
+    assert manager.get_trades_by_message(1) == []
+    assert manager.get_trades_by_message(5) == [trade]
+
+    manager.delete_trade(trade.trade_id)
+    assert manager.get_trades_by_message(5) == []
+    assert 5 not in manager.message_index
+
+    reloaded = TradeManager(storage_file=storage)
+    assert [t.telegram_msg_id for t in reloaded.get_trades_by_message(2)] == [2]
+
+
+def test_reply_targets_its_own_trade(bot, open_trade):
+    trades = [open_trade(message_id, f"BUY GOLD #{message_id}") for message_id in (1, 2, 3)]
+    bot._reply_to_msg_id = 2
+
+    assert bot._find_trade_by_reference("GOLD") is trades[1]
+    assert bot._find_trade_by_reference(None) is trades[1]
+
+
+def test_reply_naming_another_open_pair_targets_that_pair(bot, open_trade):
+    open_trade(1, "BUY GOLD")
+    eurusd = open_trade(2, "BUY EURUSD", pair="EURUSD", stop_loss=1.07, take_profit=1.1)
+    bot._reply_to_msg_id = 1
+
+    assert bot._find_trade_by_reference("EURUSD") is eurusd
+
+
+def test_reply_to_closed_trade_falls_back_to_normal_lookup(bot, open_trade):
+    first = open_trade(1, "BUY GOLD")
+    replied = open_trade(2, "BUY GOLD")
+    bot.trade_manager.close_trade(replied.trade_id, 4460.0)
+    bot._reply_to_msg_id = 2
+
+    assert bot._find_trade_by_reference("GOLD") is first
+
+
+def test_reply_modifies_only_the_replied_trade(bot, open_trade):
+    trades = [open_trade(message_id, f"BUY GOLD #{message_id}") for message_id in (1, 2, 3)]
+    signal = ModifySignal(action_type="modify_sl", trade_reference="GOLD", new_stop_loss=4445.0,
+                          confidence=0.9, reasoning="move SL")
+
+    bot._dispatch_signal(signal, "SL 4445", 10, reply_to=2)
+
+    assert [trade.stop_loss for trade in trades] == [4440.0, 4445.0, 4440.0]
+    assert bot.mt5_client.positions[trades[1].mt5_ticket]['sl'] == 4445.0
+    assert bot._reply_to_msg_id is None
@@ -0,0 +1,93 @@
+"""
+Tests for applying a provider's edits of earlier signal messages
+"""
+
+import pytest
+
+from llm import NewSignal
+from signal_parser import FastSignalParser
+
+
+ORIGINAL = "BUY GOLD @4450 SL 4440 TP 4470"
+
+
+class ScriptedInterpreter:
+    """Fast parser plus an LLM that answers with a fixed signal"""
+
+    def __init__(self, signal=None):
+        self.fast_parser = FastSignalParser()
+        self.signal = signal
+        self.calls = 0
+
+    def interpret_message(self, message_text, **kwargs):
+        self.calls += 1
+        return self.signal
+
+
+@pytest.fixture
+def modify_calls(bot, monkeypatch):
+    calls = []
+    paper_modify = bot.mt5_client.modify_order
+
+    def modify_order(ticket, stop_loss, take_profit):
+        calls.append((ticket, stop_loss, take_profit))
+        return paper_modify(ticket, stop_loss, take_profit)
+
+    monkeypatch.setattr(bot.mt5_client, 'modify_order', modify_order)
+    return calls
+
+
+def edit(bot, text, message_id=7):
+    bot.process_message({'text': text, 'message_id': message_id, 'edited': True, 'sender_name': 'Provider'})
+
+
+def test_stop_loss_edit_is_one_modification(bot, open_trade, modify_calls):
+    bot.llm_interpreter = ScriptedInterpreter()
+    trade = open_trade(7, ORIGINAL)
+
+    edit(bot, "BUY GOLD @4450 SL 4435 TP 4470")
+
+    assert modify_calls == [(trade.mt5_ticket, 4435.0, 4470.0)]
+    assert bot.mt5_client.positions[trade.mt5_ticket]['sl'] == 4435.0
+    assert trade.stop_loss == 4435.0 and trade.take_profit == 4470.0
+    assert bot.llm_interpreter.calls == 0
+
+
+def test_direction_change_leaves_trade_untouched(bot, open_trade, modify_calls):
+    bot.llm_interpreter = ScriptedInterpreter(NewSignal(
+        pair="XAUUSD", action="SELL", entry_price=4450.0, stop_loss=4460.0, take_profit=4430.0,
+        confidence=0.9, reasoning="llm"))
+    trade = open_trade(7, ORIGINAL)
+
+    edit(bot, "SELL GOLD @4450 SL 4460 TP 4430")
+
+    assert bot.llm_interpreter.calls == 1
+    assert modify_calls == []
+    assert (trade.action, trade.stop_loss, trade.take_profit) == ("BUY", 4440.0, 4470.0)
+    assert trade.original_message == ORIGINAL
+    assert [p['type'] for p in bot.mt5_client.positions.values()] == ['BUY']
+
+
+def test_edit_without_trade_is_processed_as_new_message(bot, monkeypatch):
+    bot.llm_interpreter = ScriptedInterpreter()
+    processed = []
+    monkeypatch.setattr(bot, 'process_message', lambda message_data, replay=False: processed.append(message_data))
+
+    bot._handle_edited_message({'text': ORIGINAL, 'message_id': 8, 'edited': True, 'sender_name': 'Provider'})
+
+    assert len(processed) == 1
+    assert processed[0]['text'] == ORIGINAL and processed[0]['message_id'] == 8
+    assert not processed[0]['edited']
+
+
+def test_second_edit_is_diffed_against_the_first(bot, open_trade, modify_calls):
+    bot.llm_interpreter = ScriptedInterpreter()
+    trade = open_trade(7, ORIGINAL)
+
+    edit(bot, "BUY GOLD @4450 SL 4435 TP 4470")
+    edit(bot, "BUY GOLD @4450 SL 4435 TP 4480")
+
+    assert trade.original_message == "BUY GOLD @4450 SL 4435 TP 4480"
+    assert modify_calls[-1] == (trade.mt5_ticket, 4435.0, 4480.0)
+    edits = [mod['details'] for mod in trade.modifications if mod['type'] == 'signal_edit']
+    assert edits == [{'stop_loss': 4435.0}, {'take_profit': 4480.0}]
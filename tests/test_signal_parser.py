@@ -0,0 +1,116 @@
+"""
+Tests for the fast-path signal parser
+"""
+
+import pytest
+
+from llm import NewSignal, ModifySignal, CloseSignal
+from signal_parser import FastSignalParser
+
+
+@pytest.fixture
+def parser():
+    return FastSignalParser(default_pair="XAUUSD")
+
+
+@pytest.mark.parametrize("message", [
+    "BUY STOP 4450",
+    "SELL STOP 4450 TP 4400",
+    "Buy stop @ 4450",
+    "BUY LIMIT 4450",
+    "SELL LIMIT 4450 SL 4460 TP 4400",
+])
+def test_pending_orders_are_left_to_llm(parser, message):
+    assert parser.parse(message) is None
+
+
+@pytest.mark.parametrize("message", [
+    "BUY STOP 4450 SL 4440 TP 4470",
+    "SELL LIMIT 4450 SL 4460 TP 4400 guys",
+])
+def test_pending_orders_rejected_leniently(parser, message):
+    assert parser.parse_lenient(message) is None
+
+
+def test_bare_stop_is_not_a_stop_loss(parser):
+    assert parser.parse("move stop to 4440") is None
+    assert parser.parse("BUY NOW 4450 STOP") is None
+
+
+def test_stop_loss_spellings(parser):
+    for message in ("SL 4440", "S/L 4440", "STOP LOSS 4440", "STOPLOSS: 4440"):
+        signal = parser.parse(message)
+        assert isinstance(signal, ModifySignal), message
+        assert signal.new_stop_loss == 4440.0
+
+
+def test_market_entry_with_levels(parser):
+    signal = parser.parse("BUY GOLD NOW SL 4440 TP 4470")
+    assert isinstance(signal, NewSignal)
+    assert signal.pair == "XAUUSD"
+    assert signal.action == "BUY"
+    assert signal.execution_type == "immediate"
+    assert signal.stop_loss == 4440.0
+    assert signal.take_profit == 4470.0
+
+
+@pytest.mark.parametrize("message", ["TP1 4470", "TP 1: 4470", "TP 10 4470", "TP12: 4470"])
+def test_tp_level_index_is_not_the_price(parser, message):
+    signal = parser.parse(message)
+    assert isinstance(signal, ModifySignal)
+    assert signal.new_take_profit == 4470.0
+
+
+def test_multiple_take_profits(parser):
+    signal = parser.parse("SELL GOLD NOW SL 4470 TP1 4440 TP2 4420")
+    assert isinstance(signal, NewSignal)
+    assert signal.tp_levels == [4440.0, 4420.0]
+    assert signal.take_profit == 4440.0
+
+
+@pytest.mark.parametrize("message, entry, take_profit", [
+    ("SELL 4450 TP 4400", 4450.0, 4400.0),
+    ("BUY GOLD 4450 TP 4470", 4450.0, 4470.0),
+])
+def test_price_after_direction_is_the_entry(parser, message, entry, take_profit):
+    signal = parser.parse(message)
+    assert isinstance(signal, NewSignal)
+    assert signal.entry_price == entry
+    assert signal.take_profit == take_profit
+    assert signal.tp_levels is None
+
+
+@pytest.mark.parametrize("message", [
+    "SELL GOLD NOW 4450 TP 4400",
+    "BUY NOW 4470 TP",
+    "BUY GOLD 4450 TP 4430",
+    "SELL 4450 TP 4470",
+])
+def test_ambiguous_or_contradictory_take_profit_left_to_llm(parser, message):
+    assert parser.parse(message) is None
+
+
+def test_close_and_breakeven(parser):
+    trades = [{'pair': 'XAUUSD'}]
+    assert isinstance(parser.parse("close it", active_trades=trades), CloseSignal)
+    breakeven = parser.parse("SET BE", active_trades=trades)
+    assert isinstance(breakeven, ModifySignal)
+    assert breakeven.is_breakeven
+
+
+def test_unknown_words_fall_back_to_llm(parser):
+    assert parser.parse("might buy gold later if it dips") is None
+    assert parser.parse("BUY GOLD NOW SL 4440 careful with size") is None
+
+
+def test_parse_levels(parser):
+    assert parser.parse_levels("SL 4440 TP 4470/4490") == {'stop_loss': 4440.0, 'tp_levels': [4470.0, 4490.0]}
+    assert parser.parse_levels("TP 10 4470") == {'stop_loss': None, 'tp_levels': [4470.0]}
+    assert parser.parse_levels("good morning") is None
+    assert parser.parse_levels("BUY NOW SL 4440") is None
+
+
+def test_diff_levels(parser):
+    assert parser.diff_levels("BUY GOLD NOW", "BUY GOLD NOW SL 4440") == {'stop_loss': 4440.0}
+    assert parser.diff_levels("BUY GOLD NOW SL 4440", "BUY GOLD NOW SL 4440") == {}
+    assert parser.diff_levels("BUY GOLD NOW", "SELL GOLD NOW SL 4460") is None
@@ -0,0 +1,42 @@
+"""
+Tests for decoding tool calls into signals
+"""
+
+import pytest
+from pydantic import ValidationError
+
+from llm import decode_tool_call, MultiActionSignal, NewSignal, ModifySignal, CloseSignal
+
+
+def test_signal_type_follows_the_tool():
+    result = decode_tool_call("report_close_signal", {
+        "signal_type": "modify", "action_type": "close", "confidence": 0.9, "reasoning": "test"})
+    assert isinstance(result, CloseSignal)
+    assert result.signal_type == "close"
+
+
+def test_unknown_tool():
+    assert decode_tool_call("report_weather", {}) is None
+
+
+def test_multi_action_steps_decode_into_signals():
+    result = decode_tool_call("report_multiple_actions", {
+        "actions": [
+            {"type": "modify", "details": {"trade_reference": "XAUUSD", "is_breakeven": True}},
+            {"type": "close", "details": {"trade_reference": "XAUUSD", "close_percent": 50.0}},
+            {"type": "new_trade", "details": {"pair": "XAUUSD", "action": "BUY"}},
+        ],
+        "confidence": 0.9, "reasoning": "BE, partials and re-entry",
+    })
+    modify, close, entry = result.actions
+    assert isinstance(modify, ModifySignal) and modify.action_type == "modify_sl"
+    assert isinstance(close, CloseSignal) and close.action_type == "partial_close"
+    assert isinstance(entry, NewSignal) and entry.entry_price == 0.0
+    assert {step.confidence for step in result.actions} == {0.9}
+    assert MultiActionSignal.model_validate(result.model_dump()) == result
+
+
+def test_unknown_step_type_is_rejected():
+    with pytest.raises(ValidationError):
+        decode_tool_call("report_multiple_actions", {
+            "actions": [{"type": "hedge", "details": {}}], "confidence": 0.9, "reasoning": "test"})
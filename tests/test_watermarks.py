@@ -0,0 +1,68 @@
+"""
+Tests for the durable per-chat message watermarks
+"""
+
+import json
+
+import pytest
+
+from telegram import MessageWatermarks
+
+
+@pytest.fixture
+def path(tmp_path):
+    return tmp_path / "watermarks.json"
+
+
+def test_advances_over_handled_messages(path):
+    marks = MessageWatermarks(str(path))
+    for message_id in (1, 2, 3):
+        marks.start(100, message_id)
+        marks.finish(100, message_id)
+    assert marks.get(100) == 3
+
+
+def test_in_flight_message_holds_watermark(path):
+    marks = MessageWatermarks(str(path))
+    for message_id in (1, 2, 3):
+        marks.start(100, message_id)
+    marks.finish(100, 1)
+    marks.finish(100, 3)
+    assert marks.get(100) == 1
+    marks.finish(100, 2)
+    assert marks.get(100) == 3
+
+
+def test_frozen_while_held(path):
+    marks = MessageWatermarks(str(path))
+    marks.finish(100, 5)
+    marks.hold()
+    marks.finish(100, 9)
+    assert marks.get(100) == 5
+    marks.release()
+    assert marks.get(100) == 9
+
+
+def test_unprocessed_gap_survives_release(path):
+    marks = MessageWatermarks(str(path))
+    marks.finish(100, 10)
+    marks.hold()
+    # Catch-up fetched 11-14 but stopped (paused) after 12
+    for message_id in (11, 12, 13, 14):
+        marks.start(100, message_id)
+    marks.finish(100, 11)
+    marks.finish(100, 12)
+    # Live messages keep arriving
+    marks.start(100, 20)
+    marks.finish(100, 20)
+    marks.release()
+    assert marks.get(100) == 12
+
+
+def test_persisted_and_reloaded(path):
+    marks = MessageWatermarks(str(path), flush_interval=60)
+    marks.finish(100, 7)
+    marks.finish(200, 3)
+    marks.flush(force=True)
+    assert json.loads(path.read_text()) == {"100": 7, "200": 3}
+    assert MessageWatermarks(str(path)).snapshot() == {100: 7, 200: 3}
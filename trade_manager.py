@@ -4,6 +4,9 @@ Trade Manager - Handles trade state tracking and persistence
 
 import json
 import uuid
+import hashlib
+import threading
+import time
 from pathlib import Path
 from typing import Optional, List, Dict, Any
 from datetime import datetime
@@ -20,6 +23,10 @@ class TradeStatus(Enum):
     CANCELLED = "cancelled"
 
 
+# % of the position closed at TP1..TP4 - the final 10% runs
+DEFAULT_PARTIAL_SCHEDULE = [30, 20, 20, 20]
+
+
 class TradeAction(Enum):
     """Trade action enumeration"""
     BUY = "BUY"
@@ -56,6 +63,7 @@ class Trade:
     tp_levels: List[float] = field(default_factory=list)  # Multiple TP levels
     partials_taken: int = 0  # Counter for partial closes (0-4)
     partial_history: List[Dict[str, Any]] = field(default_factory=list)  # Track each partial
+    partial_schedule: List[int] = field(default_factory=list)  # Provider's schedule (empty = default)
     
     # Timestamps
     created_at: str = field(default_factory=lambda: datetime.now().isoformat())
@@ -134,12 +142,12 @@ class Trade:
         Get the percentage for the next partial close
         
         Returns:
-            Percentage to close (30, 20, 20, 20) or None if all taken
+            Percentage to close (30, 20, 20, 20 by default) or None if all taken
         """
-        partial_percentages = [30, 20, 20, 20]  # First 4 partials, final 10% runs
+        partial_percentages = self.partial_schedule or DEFAULT_PARTIAL_SCHEDULE
         
-        if self.partials_taken >= 4:
-            return None  # All 4 partials taken, final 10% running
+        if self.partials_taken >= len(partial_percentages):
+            return None  # All partials taken, the rest keeps running
         
         return partial_percentages[self.partials_taken]
     
@@ -201,6 +209,63 @@ class Trade:
                 f"[SL: {self.stop_loss}, TP: {self.take_profit}] - {self.status}")
 
 
+class ExecutionGuard:
+    """
+    Ensures one logical signal is acted on at most once
+    
+    Keyed on a hash of whatever identifies the signal - the delivering
+    message, or the normalized content of an entry - so copies that arrive
+    within the window can never place a second order.
+    """
+    
+    def __init__(self, window_seconds: float = 60.0, max_entries: int = 1024):
+        """
+        Initialize execution guard
+        
+        Args:
+            window_seconds: How long a claim is held
+            max_entries: Maximum remembered signals (oldest are forgotten first)
+        """
+        self.window_seconds = window_seconds
+        self.max_entries = max_entries
+        self._claimed: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self.blocked = 0
+    
+    @staticmethod
+    def content_hash(content: str) -> str:
+        """SHA-256 of the signal content"""
+        return hashlib.sha256(content.encode('utf-8')).hexdigest()
+    
+    def claim(self, content: str) -> bool:
+        """
+        Claim the right to execute a signal
+        
+        Args:
+            content: Signal identity (message key or normalized entry content)
+            
+        Returns:
+            True if this is the first claim within the window, False for a duplicate
+        """
+        key = self.content_hash(content)
+        now = time.time()
+        
+        with self._lock:
+            # Forget expired claims (dict keeps insertion order = claim order)
+            while self._claimed:
+                oldest_key, claimed_at = next(iter(self._claimed.items()))
+                if now - claimed_at <= self.window_seconds and len(self._claimed) < self.max_entries:
+                    break
+                del self._claimed[oldest_key]
+            
+            if key in self._claimed:
+                self.blocked += 1
+                return False
+            
+            self._claimed[key] = now
+            return True
+
+
 class TradeManager:
     """
     Manages trade state, persistence, and retrieval
@@ -216,6 +281,9 @@ class TradeManager:
         self.storage_file = Path(storage_file)
         self.trades: Dict[str, Trade] = {}
         
+        # Telegram message ID -> IDs of the trades opened from it (reply targeting)
+        self.message_index: Dict[int, List[str]] = {}
+        
         # Ensure data directory exists
         self.storage_file.parent.mkdir(parents=True, exist_ok=True)
         
@@ -245,12 +313,31 @@ class TradeManager:
         
         # Store trade
         self.trades[trade.trade_id] = trade
+        self._index_trade(trade)
         
         # Persist to disk
         self.save_trades()
         
         return trade
     
+    def _index_trade(self, trade: Trade):
+        """Add a trade to the message index"""
+        if trade.telegram_msg_id is None:
+            return
+        trade_ids = self.message_index.setdefault(trade.telegram_msg_id, [])
+        if trade.trade_id not in trade_ids:
+            trade_ids.append(trade.trade_id)
+    
+    def _unindex_trade(self, trade: Trade):
+        """Remove a trade from the message index"""
+        trade_ids = self.message_index.get(trade.telegram_msg_id)
+        if trade_ids is None:
+            return
+        if trade.trade_id in trade_ids:
+            trade_ids.remove(trade.trade_id)
+        if not trade_ids:
+            del self.message_index[trade.telegram_msg_id]
+    
     def get_trade(self, trade_id: str) -> Optional[Trade]:
         """
         Get trade by ID
@@ -278,16 +365,37 @@ class TradeManager:
                 return trade
         return None
     
-    def get_active_trades(self) -> List[Trade]:
+    def get_trades_by_message(self, telegram_msg_id: int, provider: Optional[str] = None) -> List[Trade]:
+        """
+        Get the trades opened from a Telegram message (any status)
+        
+        Args:
+            telegram_msg_id: Telegram message ID of the signal
+            provider: Only trades of this signal provider (None = all)
+            
+        Returns:
+            List of Trade objects opened from the message (oldest first)
+        """
+        trades = (self.trades.get(trade_id) for trade_id in self.message_index.get(telegram_msg_id, ()))
+        return [
+            trade for trade in trades
+            if trade is not None and (provider is None or trade.signal_provider == provider)
+        ]
+    
+    def get_active_trades(self, provider: Optional[str] = None) -> List[Trade]:
         """
         Get all active trades
         
+        Args:
+            provider: Only trades opened for this signal provider (None = all)
+        
         Returns:
             List of active Trade objects
         """
         return [
             trade for trade in self.trades.values()
             if trade.status == TradeStatus.ACTIVE.value
+            and (provider is None or trade.signal_provider == provider)
         ]
     
     def get_trades_by_pair(self, pair: str) -> List[Trade]:
@@ -353,9 +461,14 @@ class TradeManager:
             return False
         
         # Update fields
+        reindex = 'telegram_msg_id' in updates
+        if reindex:
+            self._unindex_trade(trade)
         for key, value in updates.items():
             if hasattr(trade, key):
                 setattr(trade, key, value)
+        if reindex:
+            self._index_trade(trade)
         
         # Update timestamp
         trade.updated_at = datetime.now().isoformat()
@@ -397,7 +510,7 @@ class TradeManager:
             True if deleted, False if not found
         """
         if trade_id in self.trades:
-            del self.trades[trade_id]
+            self._unindex_trade(self.trades.pop(trade_id))
             self.save_trades()
             return True
         return False
@@ -439,14 +552,25 @@ class TradeManager:
             'win_rate': (len(winning_trades) / len(closed_trades) * 100) if closed_trades else 0,
         }
     
-    def get_context_for_llm(self) -> List[Dict[str, Any]]:
+    def get_context_for_llm(self, provider: Optional[str] = None,
+                            telegram_msg_id: Optional[int] = None) -> List[Dict[str, Any]]:
         """
         Get trade context formatted for LLM consumption
         
+        Args:
+            provider: Only trades opened for this signal provider (None = all)
+            telegram_msg_id: Only trades opened from this message (None = all)
+        
         Returns:
             List of active trades in simplified format for LLM
         """
-        active_trades = self.get_active_trades()
+        if telegram_msg_id is None:
+            active_trades = self.get_active_trades(provider)
+        else:
+            active_trades = [
+                trade for trade in self.get_trades_by_message(telegram_msg_id, provider)
+                if trade.status == TradeStatus.ACTIVE.value
+            ]
         
         context = []
         for trade in active_trades:
@@ -490,10 +614,15 @@ class TradeManager:
         except Exception as e:
             print(f"Warning: Could not load trades from {self.storage_file}: {e}")
             self.trades = {}
+        
+        self.message_index = {}
+        for trade in self.trades.values():
+            self._index_trade(trade)
     
     def clear_all_trades(self):
         """Clear all trades (use with caution - mainly for testing)"""
         self.trades = {}
+        self.message_index = {}
         self.save_trades()
 
 